@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""Client benchmarks against a local stand-in Maestro server.
+
+Run from the repository root:
+
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --save-baseline
+
+Each benchmark reports its throughput and the p50/p95/p99 latency of one
+operation. Results are compared with benchmarks/baseline.json, the command
+fails if a throughput dropped by more than --tolerance.
+"""
+
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+import click
+from redis import Redis
+
+from maestro_python_client.Cache.Cache import Cache
+from maestro_python_client.Cache.InMemoryCache import InMemoryCache
+from maestro_python_client.Cache.RedisCache import RedisCache
+from maestro_python_client.CachedClient import CachedClient
+from maestro_python_client.Client import Client
+from maestro_python_client.Emulator.EmulatorServer import EmulatorServer
+from maestro_python_client.Emulator.MaestroEmulator import MaestroEmulator
+from maestro_python_client.maestro_task_handler.MaestroTaskHandler import (
+    MaestroTaskHandler,
+    TaskWorker,
+)
+
+BASELINE = Path(__file__).parent / "baseline.json"
+BATCH_SIZES = (10, 100, 1000)
+
+logger = logging.getLogger("benchmarks")
+logger.addHandler(logging.NullHandler())
+logger.propagate = False
+
+
+class Result:
+    def __init__(self, operations: int, elapsed: float, latencies: list[float]):
+        self.operations = operations
+        self.elapsed = elapsed
+        self.latencies = sorted(latencies)
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "ops_per_second": round(self.operations / self.elapsed, 1),
+            "p50_ms": self.__percentile(50),
+            "p95_ms": self.__percentile(95),
+            "p99_ms": self.__percentile(99),
+        }
+
+    def __percentile(self, q: float) -> float:
+        if not self.latencies:
+            return 0.0
+        index = min(len(self.latencies) - 1, int(q / 100 * len(self.latencies)))
+        return round(self.latencies[index] * 1000, 3)
+
+
+class EchoWorker(TaskWorker):
+    def on_task(self, task_payload: str) -> str:
+        return task_payload
+
+
+def timed(operations: int, operation: Callable[[int], None]) -> Result:
+    latencies = []
+    started_at = time.perf_counter()
+    for i in range(operations):
+        operation_started_at = time.perf_counter()
+        operation(i)
+        latencies.append(time.perf_counter() - operation_started_at)
+    return Result(operations, time.perf_counter() - started_at, latencies)
+
+
+def bench_launch_task(client: Client, queue: str, operations: int) -> Result:
+    return timed(
+        operations, lambda _: client.launch_task("owner", queue, "x", start_timeout=60)
+    )
+
+
+def bench_launch_task_list(
+    client: Client, queue: str, operations: int, batch_size: int
+) -> Result:
+    batch = [("owner", queue, "x")] * batch_size
+    requests = max(1, operations // batch_size)
+    result = timed(
+        requests, lambda _: client.launch_task_list(list(batch), start_timeout=60)
+    )
+    return Result(requests * batch_size, result.elapsed, result.latencies)
+
+
+def bench_next_complete(client: Client, queue: str, operations: int) -> Result:
+    client.launch_task_list([("owner", queue, "x")] * operations, start_timeout=60)
+
+    def next_complete(_: int) -> None:
+        task = client.next(queue)
+        assert task
+        client.complete_task(task.task_id, task.payload)
+
+    return timed(operations, next_complete)
+
+
+def bench_handler(
+    client: Client, emulator: MaestroEmulator, queue: str, operations: int
+) -> Result:
+    client.launch_task_list([("owner", queue, "x")] * operations, start_timeout=60)
+
+    started_at = time.perf_counter()
+    handlers = [
+        MaestroTaskHandler(client, queue, EchoWorker(), logger) for _ in range(4)
+    ]
+    for handler in handlers:
+        handler.daemon = True
+        handler.start()
+
+    try:
+        while True:
+            _, stats = emulator.handle("POST", "/api/queue/stats", {"queue": queue})
+            if len(stats["completed"]) == operations:
+                return Result(operations, time.perf_counter() - started_at, [])
+            time.sleep(0.005)
+    finally:
+        for handler in handlers:
+            handler.stop()
+        for handler in handlers:
+            handler.stop(timeout=5)
+
+
+def run(
+    server: EmulatorServer, cache: Cache, operations: int
+) -> dict[str, dict[str, float]]:
+    client = Client(server.url)
+    cached_client = CachedClient(server.url, cache, ["cached"])
+
+    benchmarks: dict[str, Callable[[], Result]] = {
+        "launch_task": lambda: bench_launch_task(client, "launch", operations),
+        **{
+            f"launch_task_list[{size}]": lambda size=size: bench_launch_task_list(
+                client, f"list-{size}", operations * 10, size
+            )
+            for size in BATCH_SIZES
+        },
+        "next_complete": lambda: bench_next_complete(client, "next", operations),
+        "cached_launch_task": lambda: bench_launch_task(
+            cached_client, "cached", operations
+        ),
+        "cached_next_complete": lambda: bench_next_complete(
+            cached_client, "cached", operations
+        ),
+        "handler": lambda: bench_handler(
+            client, server.emulator, "handler", operations
+        ),
+    }
+
+    results = {}
+    for name, benchmark in benchmarks.items():
+        results[name] = benchmark().to_dict()
+        click.echo(
+            f"{name:28} " + " ".join(f"{k}={v}" for k, v in results[name].items())
+        )
+    return results
+
+
+def regressions(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    found = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        expected = baseline[name]["ops_per_second"]
+        if result["ops_per_second"] < expected * (1 - tolerance):
+            found.append(
+                f"{name}: {result['ops_per_second']} ops/s, baseline is {expected} ops/s"
+            )
+    return found
+
+
+@click.command(context_settings=dict(help_option_names=["-h", "--help"]))
+@click.option(
+    "--operations", default=500, show_default=True, help="Operations per benchmark"
+)
+@click.option(
+    "--latency",
+    default=0.0,
+    show_default=True,
+    help="Latency in seconds injected in every request of the stand-in server",
+)
+@click.option(
+    "--redis_url", default=None, help="Benchmark CachedClient over this Redis"
+)
+@click.option(
+    "--tolerance",
+    default=0.2,
+    show_default=True,
+    help="Allowed throughput drop compared to the baseline",
+)
+@click.option(
+    "--save-baseline", is_flag=True, help="Store the results as the new baseline"
+)
+def main(
+    operations: int,
+    latency: float,
+    redis_url: str | None,
+    tolerance: float,
+    save_baseline: bool,
+):
+    cache = RedisCache(Redis.from_url(redis_url)) if redis_url else InMemoryCache()
+    with EmulatorServer(MaestroEmulator(latency)) as server:
+        results = run(server, cache, operations)
+
+    if save_baseline:
+        BASELINE.write_text(json.dumps(results, indent=4, sort_keys=True) + "\n")
+        return
+
+    if not BASELINE.exists():
+        click.echo("No baseline to compare with, use --save-baseline")
+        return
+
+    found = regressions(results, json.loads(BASELINE.read_text()), tolerance)
+    for regression in found:
+        click.echo(f"REGRESSION {regression}")
+    if found:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
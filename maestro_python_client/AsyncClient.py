@@ -0,0 +1,120 @@
+from typing import Any, Union
+
+from maestro_python_client.Client import MaestroError, Task, serialize_task
+from maestro_python_client.Metrics.MetricsSink import MetricsSink
+from maestro_python_client.Metrics.RequestMetrics import RequestMetrics
+from maestro_python_client.Transport.AsyncHttpTransport import AsyncHttpTransport
+from maestro_python_client.Transport.Transport import AsyncTransport, Response
+
+
+class AsyncClient:
+    """Asyncio flavor of Client, for the calls made by task handlers.
+
+    Payloads are stored in maestro as is, there is no cached flavor.
+    """
+
+    def __init__(
+        self,
+        maestro_endpoint: str = "",
+        metrics: MetricsSink | None = None,
+        transport: AsyncTransport | None = None,
+    ) -> None:
+        """
+        Args:
+            maestro_endpoint: address of maestro.
+            metrics: if set, receives the same metrics as Client, labelled by
+                endpoint.
+            transport: how requests are sent, AsyncHttpTransport over
+                maestro_endpoint by default.
+        """
+        self.__transport = transport or AsyncHttpTransport(maestro_endpoint)
+        self.__metrics = RequestMetrics(metrics) if metrics is not None else None
+
+    async def close(self) -> None:
+        """Releases the connections of the transport."""
+        await self.__transport.close()
+
+    async def launch_task(
+        self,
+        owner: str,
+        queue: str,
+        task_payload: str,
+        retries: int = 0,
+        timeout: int = 900,
+        executes_in: int = 0,
+        start_timeout: int = 0,
+        callback_url: str = "",
+        parent_task_id: str = "",
+    ) -> str:
+        """Launches a task, see Client.launch_task."""
+        resp = await self.__post(
+            "/api/task/create",
+            serialize_task(
+                owner,
+                queue,
+                task_payload,
+                retries,
+                timeout,
+                executes_in,
+                start_timeout,
+                callback_url,
+                parent_task_id,
+            ),
+        )
+        return resp.json()["task_id"]
+
+    async def task_state(self, task_id: str) -> Task:
+        """Return the state of a task given its id, see Client.task_state."""
+        resp = await self.__post("/api/task/get", {"task_id": task_id}, True)
+        return Task.from_dict(resp.json()["task"])
+
+    async def next(self, queue: str) -> Union[Task, None]:
+        """Get the following pending task, see Client.next."""
+        resp = await self.__post("/api/queue/next", {"queue": queue})
+        return Task.from_dict(resp.json()["task"]) if resp.json() != {} else None
+
+    async def consume(self, queue: str) -> Union[Task, None]:
+        """Consume the next result of a queue, see Client.consume."""
+        resp = await self.__post("/api/queue/results/consume", {"queue": queue})
+        return Task.from_dict(resp.json()["task"]) if resp.json() != {} else None
+
+    async def complete_task(self, task_id: str, result: str) -> None:
+        """Complete a task in maestro, see Client.complete_task."""
+        await self.__post(
+            "/api/task/complete", {"task_id": task_id, "result": result}, True
+        )
+
+    async def fail_task(self, task_id: str) -> None:
+        """Fail a task in maestro, see Client.fail_task."""
+        await self.__post("/api/task/fail", {"task_id": task_id}, True)
+
+    async def cancel_task(self, task_id: str) -> None:
+        """Cancel a task in maestro, see Client.cancel_task."""
+        await self.__post("/api/task/cancel", {"task_id": task_id}, True)
+
+    async def __post(
+        self, endpoint: str, payload: dict[str, Any], not_found: bool = False
+    ) -> Response:
+        resp = (
+            await self.__transport.request("POST", endpoint, payload)
+            if self.__metrics is None
+            else await self.__measure(endpoint, payload)
+        )
+
+        if not_found and resp.status_code == 404:
+            raise FileNotFoundError("Could not find this task")
+        elif resp.status_code > 400 or "error" in resp.json():
+            raise MaestroError(endpoint, resp.status_code, resp.content)
+
+        return resp
+
+    async def __measure(self, endpoint: str, payload: dict[str, Any]) -> Response:
+        assert self.__metrics is not None
+        started_at = self.__metrics.start(endpoint, payload)
+        try:
+            resp = await self.__transport.request("POST", endpoint, payload)
+        except Exception:
+            self.__metrics.finish(endpoint, started_at, None)
+            raise
+        self.__metrics.finish(endpoint, started_at, resp)
+        return resp
@@ -0,0 +1,34 @@
+import asyncio
+
+from pytest import raises
+
+from maestro_python_client.AsyncClient import AsyncClient
+from maestro_python_client.Metrics.InMemoryMetricsSink import InMemoryMetricsSink
+from maestro_python_client.Transport.InProcessTransport import AsyncInProcessTransport
+
+
+def test_metrics(subtests):
+    metrics = InMemoryMetricsSink()
+    client = AsyncClient(metrics=metrics, transport=AsyncInProcessTransport())
+
+    with subtests.test("Success"):
+        asyncio.run(client.launch_task("owner", "queue", "payload"))
+
+        labels = {"endpoint": "/api/task/create"}
+        assert metrics.counter(
+            "maestro_client_responses_total", {**labels, "status": "200"}
+        )
+        latency = metrics.histogram("maestro_client_request_seconds", labels)
+        assert latency and latency.count == 1
+        assert metrics.histogram("maestro_client_request_bytes", labels)
+        assert metrics.histogram("maestro_client_response_bytes", labels)
+        assert metrics.gauge("maestro_client_requests_in_flight", labels) == 0
+
+    with subtests.test("Not found"):
+        with raises(FileNotFoundError):
+            asyncio.run(client.task_state("unknown"))
+
+        assert metrics.counter(
+            "maestro_client_responses_total",
+            {"endpoint": "/api/task/get", "status": "404"},
+        )
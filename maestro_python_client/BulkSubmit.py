@@ -0,0 +1,189 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Tuple
+
+from maestro_python_client.Client import Client, LaunchTaskListError
+
+TASK_OPTIONS = (
+    "retries",
+    "timeout",
+    "executes_in",
+    "start_timeout",
+    "callback_url",
+    "parent_task_id",
+)
+
+# Smallest value of the integer options, the other ones are strings
+_MINIMUMS = {"retries": 0, "timeout": 1, "executes_in": 0, "start_timeout": 0}
+
+_Options = Tuple[Tuple[str, Any], ...]
+
+
+class BulkSubmitError(ValueError):
+    """A line of the input is not a valid task."""
+
+    def __init__(self, line_number: int, msg: str) -> None:
+        super().__init__(f"Line {line_number}: {msg}")
+        self.line_number = line_number
+
+
+def submit_bulk(
+    client: Client,
+    lines: Iterable[str],
+    defaults: dict[str, Any] | None = None,
+    batch_size: int = 1000,
+    max_in_flight: int = 4,
+    on_error: Callable[[LaunchTaskListError], None] | None = None,
+) -> Iterator[str | None]:
+    """Launches tasks read from JSON lines, as they are read.
+
+    Each line is an object with the owner, queue and payload of a task, and
+    optionally any of TASK_OPTIONS, overriding defaults. Blank lines are
+    skipped.
+
+        {"owner": "me", "queue": "queue", "payload": "...", "retries": 2}
+
+    Lines are read by windows of batch_size * max_in_flight tasks. Within a
+    window, tasks are grouped by options, as launch_task_list sends the same
+    options for all its tasks, and each group is launched by batches of
+    batch_size, max_in_flight requests at once.
+
+    Args:
+        client: the client launching the tasks.
+        lines: the JSON lines, any iterable, e.g. a file.
+        defaults: options of the tasks not setting them.
+        batch_size: maximum number of tasks sent per request.
+        max_in_flight: maximum number of requests sent concurrently.
+        on_error: called with the error of a window some tasks of which
+            could not be launched. Without it, the error is raised.
+
+    Returns:
+        An iterator of the ids of the tasks in the order of lines, None for
+        the tasks that could not be launched.
+
+    Raises:
+        BulkSubmitError: A line is not a valid task, the tasks of the
+            previous lines are launched.
+        LaunchTaskListError: Some tasks could not be launched, without
+            on_error.
+    """
+    if batch_size <= 0 or max_in_flight <= 0:
+        raise ValueError("Batch size and max in flight must be > 0")
+
+    window_size = batch_size * max_in_flight
+    window: list[Tuple[Tuple[str, str, str], _Options]] = []
+
+    def launch() -> list[str | None]:
+        try:
+            return _launch_window(client, window, batch_size, max_in_flight)
+        except LaunchTaskListError as e:
+            if on_error is None:
+                raise
+            on_error(e)
+            return e.task_ids
+
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+
+        try:
+            window.append(_parse(line_number, line, defaults or {}))
+        except BulkSubmitError:
+            if window:
+                yield from launch()
+            raise
+
+        if len(window) >= window_size:
+            yield from launch()
+            window = []
+
+    if window:
+        yield from launch()
+
+
+def _launch_window(
+    client: Client,
+    window: list[Tuple[Tuple[str, str, str], _Options]],
+    batch_size: int,
+    max_in_flight: int,
+) -> list[str | None]:
+    groups: dict[_Options, list[int]] = {}
+    for position, (_, options) in enumerate(window):
+        groups.setdefault(options, []).append(position)
+    batches: list[Tuple[_Options, list[int]]] = []
+    for options, positions in groups.items():
+        for start in range(0, len(positions), batch_size):
+            end = start + batch_size
+            batches.append((options, positions[start:end]))
+
+    task_ids: list[str | None] = [None] * len(window)
+    launched: list[list[str] | int] = [len(positions) for _, positions in batches]
+    errors: dict[int, Exception] = {}
+
+    def send(index: int) -> None:
+        options, positions = batches[index]
+        try:
+            ids = client.launch_task_list(
+                [window[position][0] for position in positions],
+                **dict(options),
+                batch_size=batch_size,
+                max_in_flight=1,
+            )
+        except Exception as e:
+            errors[index] = e
+            return
+        launched[index] = ids
+        for position, task_id in zip(positions, ids):
+            task_ids[position] = task_id
+
+    if max_in_flight == 1 or len(batches) == 1:
+        for index in range(len(batches)):
+            send(index)
+    else:
+        with ThreadPoolExecutor(min(max_in_flight, len(batches))) as executor:
+            list(executor.map(send, range(len(batches))))
+
+    if errors:
+        error = LaunchTaskListError(launched, errors)
+        # In the order of the lines, not of the batches
+        error.task_ids = task_ids
+        raise error from errors[min(errors)]
+
+    return task_ids
+
+
+def _parse(
+    line_number: int, line: str, defaults: dict[str, Any]
+) -> Tuple[Tuple[str, str, str], _Options]:
+    try:
+        fields = json.loads(line)
+    except ValueError as e:
+        raise BulkSubmitError(line_number, f"invalid JSON, {e}")
+    if not isinstance(fields, dict):
+        raise BulkSubmitError(line_number, "expected a JSON object")
+
+    unknown = set(fields) - {"owner", "queue", "payload", *TASK_OPTIONS}
+    if unknown:
+        raise BulkSubmitError(line_number, f"unknown fields {sorted(unknown)}")
+    for name in ("owner", "queue", "payload"):
+        if not isinstance(fields.get(name), str):
+            raise BulkSubmitError(line_number, f"{name} must be a string")
+    for name in TASK_OPTIONS:
+        if name in fields:
+            _check_option(line_number, name, fields[name])
+
+    options = {**defaults, **{k: v for k, v in fields.items() if k in TASK_OPTIONS}}
+    return (fields["owner"], fields["queue"], fields["payload"]), tuple(
+        sorted(options.items())
+    )
+
+
+def _check_option(line_number: int, name: str, value: Any) -> None:
+    if name not in _MINIMUMS:
+        if not isinstance(value, str):
+            raise BulkSubmitError(line_number, f"{name} must be a string")
+        return
+
+    minimum = _MINIMUMS[name]
+    if not isinstance(value, int) or isinstance(value, bool) or value < minimum:
+        raise BulkSubmitError(line_number, f"{name} must be an integer >= {minimum}")
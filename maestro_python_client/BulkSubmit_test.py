@@ -0,0 +1,104 @@
+import json
+
+from pytest import raises
+
+from maestro_python_client.BulkSubmit import BulkSubmitError, submit_bulk
+from maestro_python_client.Client import Client, LaunchTaskListError
+from maestro_python_client.Transport.InProcessTransport import InProcessTransport
+
+
+class RecordingClient(Client):
+    def __init__(self) -> None:
+        super().__init__("", transport=InProcessTransport())
+        self.windows: list[tuple[int, dict]] = []
+
+    def launch_task_list(self, tasks, **options) -> list[str]:
+        tasks = list(tasks)
+        self.windows.append((len(tasks), options))
+        if any(payload == "fail" for _, _, payload in tasks):
+            raise LaunchTaskListError([len(tasks)], {0: ValueError("down")})
+        return super().launch_task_list(tasks, **options)
+
+
+def line(payload: str, **options) -> str:
+    return json.dumps(
+        {"owner": "owner", "queue": "queue", "payload": payload, **options}
+    )
+
+
+def test_submit_bulk(subtests):
+    with subtests.test("Tasks are launched by batches, in order"):
+        client = RecordingClient()
+        lines = [line(str(i)) for i in range(5)] + [""] + [line("5", retries=3)]
+
+        task_ids = list(
+            submit_bulk(client, lines, {"timeout": 60}, batch_size=2, max_in_flight=2)
+        )
+
+        assert [client.task_state(task_id).payload for task_id in task_ids] == [
+            str(i) for i in range(6)
+        ]
+        assert sorted(
+            (size, opts.get("retries") or 0) for size, opts in client.windows
+        ) == [(1, 0), (1, 3), (2, 0), (2, 0)]
+        assert client.windows[0][1]["timeout"] == 60
+        assert client.task_state(task_ids[-1]).max_retries == 3
+
+    with subtests.test("Tasks are grouped by options"):
+        client = RecordingClient()
+        lines = [line(str(i), retries=i % 2) for i in range(8)]
+
+        task_ids = list(submit_bulk(client, lines, batch_size=4, max_in_flight=2))
+
+        assert [client.task_state(task_id).payload for task_id in task_ids] == [
+            str(i) for i in range(8)
+        ]
+        assert sorted((size, opts["retries"]) for size, opts in client.windows) == [
+            (4, 0),
+            (4, 1),
+        ]
+
+    with subtests.test("Invalid line"):
+        client = RecordingClient()
+        lines = [line("a"), line("b"), '{"owner": "owner"}', line("c")]
+
+        task_ids = []
+        with raises(BulkSubmitError) as error:
+            task_ids.extend(submit_bulk(client, lines))
+
+        assert error.value.line_number == 3
+        assert len(task_ids) == 2
+
+        with raises(BulkSubmitError):
+            list(submit_bulk(client, [line("a", priority=1)]))
+
+    with subtests.test("Invalid options"):
+        client = RecordingClient()
+        invalid = [
+            {"retries": [1]},
+            {"retries": -1},
+            {"timeout": 0},
+            {"executes_in": "10"},
+            {"start_timeout": True},
+            {"callback_url": {"url": "http://callback"}},
+            {"parent_task_id": 1},
+        ]
+
+        for options in invalid:
+            with raises(BulkSubmitError):
+                list(submit_bulk(client, [line("a", **options)]))
+        assert client.windows == []
+
+    with subtests.test("Failed window"):
+        client = RecordingClient()
+        lines = [line("a"), line("fail", retries=1), line("b", retries=2)]
+        errors = []
+
+        task_ids = list(submit_bulk(client, lines, on_error=errors.append))
+
+        assert task_ids[0] and task_ids[2]
+        assert task_ids[1] is None
+        assert len(errors) == 1
+
+        with raises(LaunchTaskListError):
+            list(submit_bulk(client, lines))
@@ -17,3 +17,17 @@ class Cache(ABC):
     @abstractmethod
     def set_ttl(self, key: str, ttl: int):
         ...
+
+    def get_many(self, keys: list[str]) -> dict[str, str]:
+        """Returns the cached values of keys, missing keys are left out."""
+        values = {}
+        for key in keys:
+            try:
+                values[key] = self.get(key)
+            except ValueError:
+                continue
+        return values
+
+    def delete_many(self, keys: list[str]):
+        for key in keys:
+            self.delete(key)
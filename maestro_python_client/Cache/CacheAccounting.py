@@ -0,0 +1,125 @@
+import heapq
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+
+
+class BudgetPolicy(str, Enum):
+    REJECT = "reject"
+    INLINE = "inline"
+    COMPRESS = "compress"
+
+
+@dataclass(frozen=True)
+class QueueBudget:
+    """Byte budget of a cached queue.
+
+    Once the live bytes of the queue would exceed max_bytes, new payloads are
+    either rejected with a ValueError, sent inline to Maestro instead of being
+    cached, or compressed before being cached (and rejected if they still
+    don't fit).
+    """
+
+    max_bytes: int
+    policy: BudgetPolicy = BudgetPolicy.REJECT
+
+
+@dataclass(frozen=True)
+class QueueCacheStats:
+    bytes_written: int = 0
+    live_bytes: int = 0
+    live_entries: int = 0
+    rejected: int = 0
+    inlined: int = 0
+    compressed: int = 0
+
+
+class CacheAccounting:
+    """Estimates the bytes each queue holds in the cache.
+
+    Only writes made through this process are seen, and entries are assumed
+    to live until their TTL expires unless they are deleted, so live bytes
+    are an estimate of what the cache actually holds.
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__entries: dict[str, tuple[str, int, float]] = {}
+        self.__expirations: dict[str, list[tuple[float, str]]] = {}
+        self.__live_bytes: dict[str, int] = {}
+        self.__live_entries: dict[str, int] = {}
+        self.__counters: dict[str, dict[str, int]] = {}
+
+    def record_put(self, queue: str, key: str, size: int, ttl: int | None) -> None:
+        with self.__lock:
+            self.__expire(queue)
+            self.__remove(key)
+            self.__add(queue, key, size, self.__expires_at(ttl))
+            self.__increment(queue, "bytes_written", size)
+
+    def record_set_ttl(self, key: str, ttl: int) -> None:
+        with self.__lock:
+            if key not in self.__entries:
+                return
+
+            queue, size, _ = self.__entries[key]
+            self.__remove(key)
+            self.__add(queue, key, size, self.__expires_at(ttl))
+
+    def record_delete(self, key: str) -> None:
+        with self.__lock:
+            self.__remove(key)
+
+    def record(self, queue: str, counter: str) -> None:
+        with self.__lock:
+            self.__increment(queue, counter, 1)
+
+    def live_bytes(self, queue: str) -> int:
+        with self.__lock:
+            self.__expire(queue)
+            return self.__live_bytes.get(queue, 0)
+
+    def stats(self, queue: str) -> QueueCacheStats:
+        with self.__lock:
+            self.__expire(queue)
+            counters = self.__counters.get(queue, {})
+            return QueueCacheStats(
+                bytes_written=counters.get("bytes_written", 0),
+                live_bytes=self.__live_bytes.get(queue, 0),
+                live_entries=self.__live_entries.get(queue, 0),
+                rejected=counters.get("rejected", 0),
+                inlined=counters.get("inlined", 0),
+                compressed=counters.get("compressed", 0),
+            )
+
+    def __add(self, queue: str, key: str, size: int, expires_at: float) -> None:
+        self.__entries[key] = (queue, size, expires_at)
+        self.__live_bytes[queue] = self.__live_bytes.get(queue, 0) + size
+        self.__live_entries[queue] = self.__live_entries.get(queue, 0) + 1
+        if expires_at != float("inf"):
+            heapq.heappush(self.__expirations.setdefault(queue, []), (expires_at, key))
+
+    def __remove(self, key: str) -> None:
+        entry = self.__entries.pop(key, None)
+        if entry:
+            queue, size, _ = entry
+            self.__live_bytes[queue] -= size
+            self.__live_entries[queue] -= 1
+
+    def __expire(self, queue: str) -> None:
+        expirations = self.__expirations.get(queue, [])
+        now = time.monotonic()
+        while expirations and expirations[0][0] <= now:
+            expires_at, key = heapq.heappop(expirations)
+            entry = self.__entries.get(key)
+            if entry and entry[2] == expires_at:
+                self.__remove(key)
+
+    def __increment(self, queue: str, counter: str, value: int) -> None:
+        counters = self.__counters.setdefault(queue, {})
+        counters[counter] = counters.get(counter, 0) + value
+
+    @staticmethod
+    def __expires_at(ttl: int | None) -> float:
+        return time.monotonic() + ttl if ttl and ttl > 0 else float("inf")
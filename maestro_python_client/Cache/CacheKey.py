@@ -0,0 +1,54 @@
+from uuid import UUID, uuid4
+
+CACHE_KEY_PREFIX = "maestro-cache-"
+_UUID_LENGTH = 36
+
+
+def new_cache_key(queue: str) -> str:
+    return f"{CACHE_KEY_PREFIX}{queue}-{str(uuid4())}"
+
+
+def is_cache_key(key: str, queue: str | None = None) -> bool:
+    """Tells if a string is a key produced by new_cache_key.
+
+    Args:
+        key: the string to check.
+        queue: if set, the key must also belong to this queue.
+    """
+    found_queue = queue_from_cache_key(key)
+    if found_queue is None:
+        return False
+
+    return queue is None or found_queue == queue
+
+
+def queue_from_cache_key(key: str) -> str | None:
+    """Returns the queue a cache key belongs to, or None if it isn't a cache key.
+
+    The queue is everything between the prefix and the trailing uuid, so queue
+    names containing dashes are handled.
+    """
+    if not key.startswith(CACHE_KEY_PREFIX):
+        return None
+
+    body = key.removeprefix(CACHE_KEY_PREFIX)
+    split = len(body) - _UUID_LENGTH - 1
+    if split <= 0 or body[split] != "-":
+        return None
+
+    try:
+        UUID(body[-_UUID_LENGTH:])
+    except ValueError:
+        return None
+
+    return body[:split]
+
+
+def cache_key_pattern(queue: str) -> str:
+    """Returns a Redis glob pattern matching every cache key of a queue.
+
+    The pattern may also match keys of queues sharing the same prefix (e.g.
+    "a" and "a-b"), so results must be filtered with is_cache_key.
+    """
+    escaped = "".join(f"\\{c}" if c in "*?[]\\" else c for c in queue)
+    return f"{CACHE_KEY_PREFIX}{escaped}-*"
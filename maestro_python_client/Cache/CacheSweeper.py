@@ -0,0 +1,173 @@
+import itertools
+import time
+from dataclasses import dataclass
+from typing import Iterable
+
+from redis import Redis
+
+from maestro_python_client.Cache.CacheKey import cache_key_pattern, is_cache_key
+from maestro_python_client.CachedClient import CachedClient
+from maestro_python_client.Client import Client
+
+
+@dataclass
+class SweepReport:
+    """Keys of a queue seen by a sweep.
+
+    orphaned counts the keys found orphaned, deleted the ones actually
+    deleted, none with dry_run.
+    """
+
+    queue: str
+    scanned: int = 0
+    referenced: int = 0
+    recent: int = 0
+    orphaned: int = 0
+    deleted: int = 0
+
+
+class CacheSweeper:
+    """Reclaims cache entries no Maestro task references anymore.
+
+    Entries are orphaned when a task is deleted server-side or when a producer
+    crashes between caching a payload and launching its task. They would
+    otherwise stay in Redis until their TTL expires.
+
+    Keys are walked with SCAN, at most max_keys_per_second, and reclaimed with
+    UNLINK so the sweep never blocks Redis. Keys used less than min_idle_time
+    seconds ago are kept: they may belong to a task being launched right now.
+
+    Only the pending, planned and running tasks are looked up, one request
+    each. The keys of finished tasks expire after the completed_task_ttl of
+    CachedClient: keep min_idle_time above it, so that results not consumed
+    yet are not reclaimed.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        client: Client,
+        scan_count: int = 100,
+        max_keys_per_second: int = 1000,
+        min_idle_time: int = 3600,
+        dry_run: bool = False,
+    ) -> None:
+        """
+        Args:
+            redis: the Redis instance backing the cache.
+            client: a Maestro client. Must not be a CachedClient, the
+                sweeper needs the cache keys, not the cached payloads.
+            scan_count: COUNT hint given to each SCAN call.
+            max_keys_per_second: upper bound on the scan rate.
+            min_idle_time: keys accessed less than this number of seconds
+                ago are never reclaimed.
+            dry_run: count orphaned keys without deleting them.
+        """
+        if isinstance(client, CachedClient):
+            raise ValueError("The sweeper needs a Client, not a CachedClient")
+        if scan_count <= 0 or max_keys_per_second <= 0:
+            raise ValueError("Scan count and rate must be > 0")
+
+        self.__redis = redis
+        self.__client = client
+        self.__scan_count = scan_count
+        self.__max_keys_per_second = max_keys_per_second
+        self.__min_idle_time = min_idle_time
+        self.__dry_run = dry_run
+
+    def sweep(self, queues: Iterable[str]) -> list[SweepReport]:
+        return [self.sweep_queue(queue) for queue in queues]
+
+    def sweep_queue(self, queue: str) -> SweepReport:
+        """Reclaims the orphaned cache entries of a queue.
+
+        Args:
+            queue: a cached queue.
+
+        Returns:
+            A SweepReport counting scanned, referenced, recent, orphaned and
+            deleted keys.
+
+        Raises:
+            ValueError: Error in communication with maestro
+        """
+        report = SweepReport(queue)
+        referenced = self.__referenced_keys(queue)
+
+        cursor, calls = 0, 0
+        started_at = time.monotonic()
+        while True:
+            cursor, keys = self.__redis.scan(
+                cursor, match=cache_key_pattern(queue), count=self.__scan_count
+            )
+            calls += 1
+            report.scanned += len(keys)
+            self.__reclaim(
+                queue, [self.__decode(key) for key in keys], referenced, report
+            )
+
+            if cursor == 0:
+                return report
+
+            self.__throttle(started_at, calls * self.__scan_count)
+
+    def __referenced_keys(self, queue: str) -> set[str]:
+        stats = self.__client.get_compact_queue_stats(queue)
+        task_ids = itertools.chain(stats.pending, stats.planned, stats.running)
+
+        referenced = set()
+        for _, task in self.__client.iter_task_states(task_ids):
+            if task is None:
+                continue
+
+            referenced.update(
+                key
+                for key in (task.payload, task.result)
+                if key and is_cache_key(key, queue)
+            )
+
+        return referenced
+
+    def __reclaim(
+        self, queue: str, keys: list[str], referenced: set[str], report: SweepReport
+    ) -> None:
+        candidates = []
+        for key in keys:
+            if not is_cache_key(key, queue):
+                continue
+            if key in referenced:
+                report.referenced += 1
+                continue
+            candidates.append(key)
+
+        if not candidates:
+            return
+
+        pipeline = self.__redis.pipeline(transaction=False)
+        for key in candidates:
+            pipeline.object("idletime", key)
+        idle_times = pipeline.execute()
+
+        orphans = []
+        for key, idle_time in zip(candidates, idle_times):
+            if idle_time is None:
+                continue
+            if idle_time < self.__min_idle_time:
+                report.recent += 1
+                continue
+            orphans.append(key)
+
+        report.orphaned += len(orphans)
+        if orphans and not self.__dry_run:
+            self.__redis.unlink(*orphans)
+            report.deleted += len(orphans)
+
+    def __throttle(self, started_at: float, examined: int) -> None:
+        min_elapsed = examined / self.__max_keys_per_second
+        elapsed = time.monotonic() - started_at
+        if elapsed < min_elapsed:
+            time.sleep(min_elapsed - elapsed)
+
+    @staticmethod
+    def __decode(key: bytes | str) -> str:
+        return key.decode("utf-8") if isinstance(key, bytes) else key
@@ -0,0 +1,39 @@
+import threading
+import time
+
+from maestro_python_client.Cache.Cache import Cache
+
+
+class InMemoryCache(Cache):
+    """Process local cache, for tests, benchmarks and single process pipelines."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.__lock = threading.Lock()
+        self.__values: dict[str, tuple[str, float]] = {}
+
+    def get(self, key: str) -> str:
+        with self.__lock:
+            value, expires_at = self.__values.get(key, ("", 0.0))
+            if expires_at <= time.monotonic():
+                self.__values.pop(key, None)
+                raise ValueError(f"Key {key} is not cached")
+
+        return value
+
+    def put(self, key: str, value: str, ttl: int | None = None):
+        with self.__lock:
+            self.__values[key] = (value, self.__expires_at(ttl))
+
+    def delete(self, key: str):
+        with self.__lock:
+            self.__values.pop(key, None)
+
+    def set_ttl(self, key: str, ttl: int):
+        with self.__lock:
+            if key in self.__values:
+                self.__values[key] = (self.__values[key][0], self.__expires_at(ttl))
+
+    @staticmethod
+    def __expires_at(ttl: int | None) -> float:
+        return time.monotonic() + ttl if ttl else float("inf")
@@ -0,0 +1,113 @@
+import time
+
+from maestro_python_client.Cache.Cache import Cache
+from maestro_python_client.Cache.CacheKey import queue_from_cache_key
+from maestro_python_client.Metrics.InMemoryMetricsSink import InMemoryMetricsSink
+from maestro_python_client.Metrics.MetricsSink import MetricsSink
+
+
+class InstrumentedCache(Cache):
+    """Wraps any Cache and reports its activity to a MetricsSink.
+
+    Reported metrics:
+        maestro_cache_operation_seconds{operation}: latency of each operation.
+        maestro_cache_hits_total{queue} / maestro_cache_misses_total{queue}
+        maestro_cache_errors_total{operation}: failures other than misses.
+        maestro_cache_payload_bytes{queue, operation}: size of read and
+            written values, approximated by their length.
+
+    A get raising ValueError is a miss, as for RedisCache.
+    """
+
+    def __init__(self, cache: Cache, metrics: MetricsSink | None = None) -> None:
+        super().__init__()
+        self.__cache = cache
+        self.__metrics = metrics or InMemoryMetricsSink()
+
+    @property
+    def metrics(self) -> MetricsSink:
+        return self.__metrics
+
+    def get(self, key: str) -> str:
+        queue = self.__queue(key)
+        started_at = time.perf_counter()
+        try:
+            value = self.__cache.get(key)
+        except ValueError:
+            self.__metrics.increment("maestro_cache_misses_total", labels=queue)
+            raise
+        except Exception:
+            self.__metrics.increment(
+                "maestro_cache_errors_total", labels={"operation": "get"}
+            )
+            raise
+        finally:
+            self.__observe_latency("get", started_at)
+
+        self.__metrics.increment("maestro_cache_hits_total", labels=queue)
+        self.__observe_size("get", queue, value)
+        return value
+
+    def get_many(self, keys: list[str]) -> dict[str, str]:
+        started_at = time.perf_counter()
+        try:
+            values = self.__cache.get_many(keys)
+        except Exception:
+            self.__metrics.increment(
+                "maestro_cache_errors_total", labels={"operation": "get_many"}
+            )
+            raise
+        finally:
+            self.__observe_latency("get_many", started_at)
+
+        for key in keys:
+            queue = self.__queue(key)
+            if key in values:
+                self.__metrics.increment("maestro_cache_hits_total", labels=queue)
+                self.__observe_size("get", queue, values[key])
+            else:
+                self.__metrics.increment("maestro_cache_misses_total", labels=queue)
+        return values
+
+    def put(self, key: str, value: str, ttl: int | None = None):
+        self.__call("put", self.__cache.put, key, value, ttl)
+        self.__observe_size("put", self.__queue(key), value)
+
+    def delete(self, key: str):
+        self.__call("delete", self.__cache.delete, key)
+
+    def delete_many(self, keys: list[str]):
+        self.__call("delete_many", self.__cache.delete_many, keys)
+
+    def set_ttl(self, key: str, ttl: int):
+        self.__call("set_ttl", self.__cache.set_ttl, key, ttl)
+
+    def __call(self, operation: str, method, *args) -> None:
+        started_at = time.perf_counter()
+        try:
+            method(*args)
+        except Exception:
+            self.__metrics.increment(
+                "maestro_cache_errors_total", labels={"operation": operation}
+            )
+            raise
+        finally:
+            self.__observe_latency(operation, started_at)
+
+    def __observe_latency(self, operation: str, started_at: float) -> None:
+        self.__metrics.observe(
+            "maestro_cache_operation_seconds",
+            time.perf_counter() - started_at,
+            {"operation": operation},
+        )
+
+    def __observe_size(self, operation: str, queue: dict[str, str], value: str):
+        self.__metrics.observe(
+            "maestro_cache_payload_bytes",
+            len(value),
+            {**queue, "operation": operation},
+        )
+
+    @staticmethod
+    def __queue(key: str) -> dict[str, str]:
+        return {"queue": queue_from_cache_key(key) or ""}
@@ -16,6 +16,16 @@ class RedisCache(Cache):
 
         return payload.decode("utf-8")
 
+    def get_many(self, keys: list[str]) -> dict[str, str]:
+        if not keys:
+            return {}
+
+        return {
+            key: payload.decode("utf-8")
+            for key, payload in zip(keys, self.__redis.mget(keys))
+            if payload
+        }
+
     def put(self, key: str, value: str, ttl: int | None = None):
         if not self.__redis.set(key, value.encode("utf-8"), ex=ttl):
             raise ValueError(f"Could not add {key} to cache")
@@ -23,5 +33,11 @@ class RedisCache(Cache):
     def delete(self, key: str):
         self.__redis.delete(key)
 
+    def delete_many(self, keys: list[str]):
+        pipeline = self.__redis.pipeline(transaction=False)
+        for key in keys:
+            pipeline.delete(key)
+        pipeline.execute()
+
     def set_ttl(self, key: str, ttl: int):
         self.__redis.expire(key, ttl)
@@ -0,0 +1,97 @@
+from unittest.mock import MagicMock
+
+from maestro_python_client.Cache.CacheKey import new_cache_key
+from maestro_python_client.Cache.CacheSweeper import CacheSweeper
+from maestro_python_client.Client import CompactQueueStats, Task, TaskIdView
+from test_utils.Redis import new_test_redis
+from test_utils.String import unique_str
+
+
+def task_with(payload: str, result: str | None = None) -> Task:
+    task = Task()
+    task.task_id = unique_str()
+    task.payload = payload
+    task.result = result
+    return task
+
+
+def client_with(tasks: list[Task], completed: list[Task] = []) -> MagicMock:
+    client = MagicMock()
+    client.get_compact_queue_stats.return_value = CompactQueueStats(
+        pending=TaskIdView(task.task_id for task in tasks),
+        completed=TaskIdView(task.task_id for task in completed),
+    )
+    by_id = {task.task_id: task for task in [*tasks, *completed]}
+    client.looked_up = []
+
+    def iter_task_states(task_ids):
+        for task_id in task_ids:
+            client.looked_up.append(task_id)
+            yield task_id, by_id.get(task_id)
+
+    client.iter_task_states.side_effect = iter_task_states
+    return client
+
+
+def test_sweep_queue(subtests):
+    redis = new_test_redis()
+
+    with subtests.test("orphans are deleted"):
+        queue = unique_str()
+        payload, result, orphan = (new_cache_key(queue) for _ in range(3))
+        for key in (payload, result, orphan):
+            redis.set(key, "value")
+
+        sweeper = CacheSweeper(
+            redis, client_with([task_with(payload, result)]), min_idle_time=0
+        )
+        report = sweeper.sweep_queue(queue)
+
+        assert report.referenced == 2
+        assert report.deleted == 1
+        assert redis.exists(payload, result) == 2
+        assert not redis.exists(orphan)
+
+    with subtests.test("recent keys are kept"):
+        queue = unique_str()
+        orphan = new_cache_key(queue)
+        redis.set(orphan, "value")
+
+        report = CacheSweeper(redis, client_with([])).sweep_queue(queue)
+
+        assert report.recent == 1
+        assert report.deleted == 0
+        assert redis.exists(orphan)
+
+    with subtests.test("dry run"):
+        queue = unique_str()
+        orphan = new_cache_key(queue)
+        redis.set(orphan, "value")
+
+        sweeper = CacheSweeper(redis, client_with([]), min_idle_time=0, dry_run=True)
+        report = sweeper.sweep_queue(queue)
+
+        assert report.orphaned == 1
+        assert report.deleted == 0
+        assert redis.exists(orphan)
+
+    with subtests.test("other queues sharing the prefix are ignored"):
+        queue = unique_str()
+        other = new_cache_key(f"{queue}-other")
+        redis.set(other, "value")
+
+        report = CacheSweeper(redis, client_with([]), min_idle_time=0).sweep_queue(
+            queue
+        )
+
+        assert report.deleted == 0
+        assert redis.exists(other)
+
+    with subtests.test("only unfinished tasks are looked up"):
+        queue = unique_str()
+        pending = task_with(new_cache_key(queue))
+        client = client_with([pending], completed=[task_with(new_cache_key(queue))])
+
+        CacheSweeper(redis, client, min_idle_time=0).sweep_queue(queue)
+
+        assert client.looked_up == [pending.task_id]
@@ -0,0 +1,70 @@
+from unittest.mock import MagicMock
+
+from pytest import raises
+
+from maestro_python_client.Cache.CacheKey import new_cache_key
+from maestro_python_client.Cache.InstrumentedCache import InstrumentedCache
+from maestro_python_client.Metrics.InMemoryMetricsSink import InMemoryMetricsSink
+
+
+def test_instrumented_cache(subtests):
+    with subtests.test("hits and sizes"):
+        backend = MagicMock()
+        backend.get.return_value = "value"
+        cache = InstrumentedCache(backend)
+        key = new_cache_key("queue")
+
+        cache.put(key, "value", 10)
+        assert cache.get(key) == "value"
+
+        metrics = cache.metrics
+        assert isinstance(metrics, InMemoryMetricsSink)
+        assert metrics.counter("maestro_cache_hits_total", {"queue": "queue"}) == 1
+        size = metrics.histogram(
+            "maestro_cache_payload_bytes", {"queue": "queue", "operation": "put"}
+        )
+        assert size and size.sum == len("value")
+        latency = metrics.histogram(
+            "maestro_cache_operation_seconds", {"operation": "get"}
+        )
+        assert latency and latency.count == 1
+        backend.put.assert_called_once_with(key, "value", 10)
+
+    with subtests.test("misses"):
+        backend = MagicMock()
+        backend.get.side_effect = ValueError()
+        metrics = InMemoryMetricsSink()
+        cache = InstrumentedCache(backend, metrics)
+
+        with raises(ValueError):
+            cache.get(new_cache_key("queue"))
+
+        assert metrics.counter("maestro_cache_misses_total", {"queue": "queue"}) == 1
+        assert metrics.counter("maestro_cache_hits_total", {"queue": "queue"}) == 0
+
+    with subtests.test("errors"):
+        backend = MagicMock()
+        backend.set_ttl.side_effect = ConnectionError()
+        metrics = InMemoryMetricsSink()
+        cache = InstrumentedCache(backend, metrics)
+
+        with raises(ConnectionError):
+            cache.set_ttl(new_cache_key("queue"), 10)
+
+        assert metrics.counter("maestro_cache_errors_total", {"operation": "set_ttl"})
+
+    with subtests.test("get many"):
+        hit, miss = new_cache_key("queue"), new_cache_key("queue")
+        backend = MagicMock()
+        backend.get_many.return_value = {hit: "value"}
+        metrics = InMemoryMetricsSink()
+        cache = InstrumentedCache(backend, metrics)
+
+        assert cache.get_many([hit, miss]) == {hit: "value"}
+
+        assert metrics.counter("maestro_cache_hits_total", {"queue": "queue"}) == 1
+        assert metrics.counter("maestro_cache_misses_total", {"queue": "queue"}) == 1
+        latency = metrics.histogram(
+            "maestro_cache_operation_seconds", {"operation": "get_many"}
+        )
+        assert latency and latency.count == 1
@@ -54,6 +54,22 @@ def test_delete(subtests):
             cache.get(key)
 
 
+def test_delete_many(subtests):
+    cache = RedisCache(new_test_redis())
+
+    with subtests.test("delete keys"):
+        keys = [unique_str() for _ in range(3)]
+        for key in keys:
+            cache.put(key, "value")
+
+        cache.delete_many([keys[0], keys[2], unique_str()])
+
+        assert cache.get_many(keys) == {keys[1]: "value"}
+
+    with subtests.test("no keys"):
+        cache.delete_many([])
+
+
 def test_set_ttl(subtests):
     redis = new_test_redis()
     cache = RedisCache(redis)
@@ -64,3 +80,16 @@ def test_set_ttl(subtests):
         cache.set_ttl(key, 42)
 
         assert redis.ttl(key) == 42
+
+
+def test_get_many(subtests):
+    cache = RedisCache(new_test_redis())
+
+    with subtests.test("missing keys are left out"):
+        keys = [unique_str(), unique_str()]
+        cache.put(keys[0], "value")
+
+        assert cache.get_many(keys) == {keys[0]: "value"}
+
+    with subtests.test("no key"):
+        assert cache.get_many([]) == {}
@@ -1,8 +1,22 @@
-from typing import List, Tuple
-from uuid import uuid4
+import base64
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 
 from maestro_python_client.Cache.Cache import Cache
-from maestro_python_client.Client import Client, Task
+from maestro_python_client.Cache.CacheAccounting import (
+    BudgetPolicy,
+    CacheAccounting,
+    QueueBudget,
+    QueueCacheStats,
+)
+from maestro_python_client.Cache.CacheKey import CACHE_KEY_PREFIX, new_cache_key
+from maestro_python_client.Client import Client, LaunchTaskListError, Task
+
+# Raw values are cached as is, as by clients without compression. Only the
+# raw values starting with a marker are escaped with RAW_PREFIX.
+RAW_PREFIX = "\x00raw:"
+COMPRESSED_PREFIX = "\x00zlib:"
+DELETE_BATCH_SIZE = 500
 
 
 class CachedClient(Client):
@@ -12,12 +26,35 @@ class CachedClient(Client):
         cache: Cache,
         cached_queues: list[str] = [],
         completed_task_ttl: int = 900,
+        budgets: dict[str, QueueBudget] | None = None,
         **kwargs,
     ) -> None:
+        """
+        Args:
+            maestro_endpoint: address of maestro.
+            cache: where the payloads and results of cached queues are stored.
+            cached_queues: queues whose payloads and results are cached.
+            completed_task_ttl: time to keep the cache entries of finished tasks.
+            budgets: optional byte budget of cached queues, see QueueBudget.
+        """
         super().__init__(maestro_endpoint, **kwargs)
         self.__cached_queues: set[str] = set(cached_queues)
         self.__cache = cache
         self.__completed_task_ttl = completed_task_ttl
+        self.__budgets = dict(budgets or {})
+        self.__accounting = CacheAccounting()
+
+        for queue in self.__budgets:
+            if queue not in self.__cached_queues:
+                raise ValueError(f"Queue {queue} has a budget but is not cached")
+
+    def cache_stats(self) -> dict[str, QueueCacheStats]:
+        """Returns the bytes written and the estimated live bytes per cached queue.
+
+        Only the entries written by this client are accounted. Entries are
+        considered live until their TTL expires or they are deleted.
+        """
+        return {queue: self.__accounting.stats(queue) for queue in self.__cached_queues}
 
     def launch_task(
         self,
@@ -50,7 +87,7 @@ class CachedClient(Client):
             A string representing the Maestro task id
 
         Raises:
-            ValueError: Problem in the communication with maestro or invalid start_time.
+            ValueError: Problem in the communication with maestro, invalid start_time or exceeded cache budget.
         """
 
         if queue in self.__cached_queues and start_timeout <= 0:
@@ -86,6 +123,41 @@ class CachedClient(Client):
         task = super().consume(queue)
         return self.__task_from_cache(task)
 
+    def fetch_unresolved(self, queue: str) -> Task | None:
+        return super().next(queue)
+
+    def consume_unresolved(self, queue: str) -> Task | None:
+        return super().consume(queue)
+
+    def resolve_task(self, task: Task) -> Task:
+        return self.__task_from_cache(task)  # type: ignore
+
+    def resolve_tasks(
+        self, tasks: List[Task], errors: Dict[str, Exception] | None = None
+    ) -> List[Task]:
+        keys = [
+            key
+            for task in tasks
+            if task.task_queue in self.__cached_queues
+            for key in (task.payload, task.result)
+            if key and not self.__is_inlined(key)
+        ]
+        values = self.__cache.get_many(keys)
+
+        resolved = []
+        for task in tasks:
+            try:
+                if task.task_queue in self.__cached_queues:
+                    self.__resolve_from(values, task)
+            except Exception as e:
+                if errors is None:
+                    raise
+                errors[task.task_id] = e
+                continue
+            resolved.append(task)
+
+        return resolved
+
     def task_state(self, task_id: str) -> Task:
         task = super().task_state(task_id)
         return self.__task_from_cache(task)  # type: ignore
@@ -120,23 +192,64 @@ class CachedClient(Client):
 
         super().delete_task(task_id, consume=consume)
 
+    def delete_owners_history(self, owner_ids: List[str]) -> Dict[str, Any]:
+        """Delete history for all tasks associated to a list of owners.
+
+        The cached payloads and results of their tasks are deleted once
+        maestro deleted the tasks, by batches of DELETE_BATCH_SIZE keys: if
+        maestro fails, the tasks keep their payloads.
+
+        Args:
+            owner_ids: a list of owner ids
+
+        Raises:
+            ValueError: Error in communication with maestro
+        """
+        task_ids = [
+            task.task_id
+            for task in self.get_owners_history(owner_ids)
+            if task.task_queue in self.__cached_queues
+        ]
+        keys = [
+            key
+            for _, task in self.iter_task_states(task_ids, resolve=False)
+            if task
+            for key in (task.payload, task.result)
+            if key and not self.__is_inlined(key)
+        ]
+        deleted = super().delete_owners_history(owner_ids)
+
+        for start in range(0, len(keys), DELETE_BATCH_SIZE):
+            end = start + DELETE_BATCH_SIZE
+            batch = keys[start:end]
+            self.__cache.delete_many(batch)
+            for key in batch:
+                self.__accounting.record_delete(key)
+
+        return deleted
+
     def launch_task_list(
         self,
-        tasks: List[Tuple[str, str, str]],
+        tasks: Iterable[Tuple[str, str, str]],
         retries: int = 0,
         timeout: int = 900,
         executes_in: int = 0,
         start_timeout: int = 0,
         callback_url: str = "",
         parent_task_id: str = "",
+        batch_size: int = 1000,
+        max_in_flight: int = 4,
     ) -> List[str]:
         """Launches a list a task.
 
         Each task is represented a 3-uple that will be added to maestro.
+        Payloads are cached as the tasks are read, batch by batch, the given
+        tasks are left untouched. The cached payloads of the tasks which could
+        not be launched are deleted.
 
         Args:
             tasks:
-                The list of tasks to be added. Each task is a 3-uple containing
+                The tasks to be added, any iterable. Each task is a 3-uple containing
                 1. The owner of the task (as str)
                 2. The queue
                 3. The payload
@@ -146,13 +259,16 @@ class CachedClient(Client):
             start_timeout: Allowed time span in seconds for the task to start. Must be > 0 if the task is in a cached queue.
             callback_url: URL called after task execution is completed.
             parent_task_id: Task ID of the parent, if any.
+            batch_size: Maximum number of tasks sent per request.
+            max_in_flight: Maximum number of requests sent concurrently.
 
         Returns:
             A list of string representing the identifiers of the tasks
 
 
         Raises:
-            ValueError: Error in communication with maestro or invalid start_time
+            ValueError: Error in communication with maestro, invalid start_time or exceeded cache budget
+            LaunchTaskListError: Some batches could not be launched.
         """
 
         payload_ttl = (
@@ -161,29 +277,37 @@ class CachedClient(Client):
             + (start_timeout + timeout) * (retries + 1)
         )
 
-        for i, (owner, queue, payload) in enumerate(tasks):
-            if queue in self.__cached_queues and start_timeout <= 0:
-                raise ValueError("Start timeout must be > 0 for cached task")
-
-            tasks[i] = (
-                owner,
-                queue,
-                self.__cache_payload(
-                    queue,
-                    payload,
-                    payload_ttl,
-                ),
+        keys: list[Tuple[str, str]] = []
+
+        def cached(
+            tasks: Iterable[Tuple[str, str, str]]
+        ) -> Iterator[Tuple[str, str, str]]:
+            for owner, queue, payload in tasks:
+                if queue in self.__cached_queues and start_timeout <= 0:
+                    raise ValueError("Start timeout must be > 0 for cached task")
+
+                key = self.__cache_payload(queue, payload, payload_ttl)
+                keys.append((queue, key))
+                yield owner, queue, key
+
+        try:
+            return super().launch_task_list(
+                cached(tasks),
+                retries,
+                timeout,
+                executes_in,
+                start_timeout,
+                callback_url,
+                parent_task_id,
+                batch_size,
+                max_in_flight,
             )
-
-        return super().launch_task_list(
-            tasks,
-            retries,
-            timeout,
-            executes_in,
-            start_timeout,
-            callback_url,
-            parent_task_id,
-        )
+        except LaunchTaskListError as e:
+            # The payloads of the tasks which were not launched are unreachable
+            for index, (queue, key) in enumerate(keys):
+                if index >= len(e.task_ids) or e.task_ids[index] is None:
+                    self.__delete(queue, key)
+            raise
 
     def __task_from_cache(self, task: Task | None) -> Task | None:
         if not task:
@@ -200,28 +324,90 @@ class CachedClient(Client):
         if queue not in self.__cached_queues:
             return payload
 
-        cache_key = self.__unique_key(queue)
-        self.__cache.put(cache_key, payload, timeout)
+        value = self.__escape(payload)
+        size = len(payload.encode("utf-8"))
+        budget = self.__budgets.get(queue)
+        if budget and self.__exceeds(queue, budget, size):
+            if budget.policy == BudgetPolicy.INLINE:
+                self.__accounting.record(queue, "inlined")
+                return payload
+
+            if budget.policy == BudgetPolicy.COMPRESS:
+                value = self.__compress(payload)
+                size = len(value)
+
+            if budget.policy == BudgetPolicy.REJECT or self.__exceeds(
+                queue, budget, size
+            ):
+                self.__accounting.record(queue, "rejected")
+                raise ValueError(f"Cache budget of queue {queue} is exceeded")
+
+            self.__accounting.record(queue, "compressed")
+
+        cache_key = new_cache_key(queue)
+        self.__cache.put(cache_key, value, timeout)
+        self.__accounting.record_put(queue, cache_key, size, timeout)
         return cache_key
 
+    def __resolve_from(self, values: dict[str, str], task: Task) -> None:
+        keys = [
+            key
+            for key in (task.payload, task.result)
+            if key and not self.__is_inlined(key)
+        ]
+        for key in keys:
+            if key not in values:
+                raise ValueError(f"Key {key} is not cached")
+
+        if task.payload in values:
+            task.payload = self.__decode(values[task.payload])
+        if task.result and task.result in values:
+            task.result = self.__decode(values[task.result])
+
     def __payload_from_cache(self, queue: str, payload: str) -> str:
-        if queue not in self.__cached_queues:
+        if queue not in self.__cached_queues or self.__is_inlined(payload):
             return payload
 
-        return self.__cache.get(payload)
+        return self.__decode(self.__cache.get(payload))
 
     def __set_ttl(self, queue: str, key: str, ttl: int):
-        if queue not in self.__cached_queues:
+        if queue not in self.__cached_queues or self.__is_inlined(key):
             return
 
         self.__cache.set_ttl(key, ttl)
+        self.__accounting.record_set_ttl(key, ttl)
 
     def __delete(self, queue: str, key: str):
-        if queue not in self.__cached_queues:
+        if queue not in self.__cached_queues or self.__is_inlined(key):
             return
 
         self.__cache.delete(key)
+        self.__accounting.record_delete(key)
+
+    @staticmethod
+    def __is_inlined(payload: str) -> bool:
+        return not payload.startswith(CACHE_KEY_PREFIX)
+
+    def __exceeds(self, queue: str, budget: QueueBudget, size: int) -> bool:
+        return self.__accounting.live_bytes(queue) + size > budget.max_bytes
+
+    @staticmethod
+    def __compress(payload: str) -> str:
+        compressed = zlib.compress(payload.encode("utf-8"), level=9)
+        return COMPRESSED_PREFIX + base64.b64encode(compressed).decode("ascii")
+
+    @staticmethod
+    def __escape(payload: str) -> str:
+        if payload.startswith((RAW_PREFIX, COMPRESSED_PREFIX)):
+            return RAW_PREFIX + payload
+        return payload
 
     @staticmethod
-    def __unique_key(queue_name: str) -> str:
-        return f"maestro-cache-{queue_name}-{str(uuid4())}"
+    def __decode(value: str) -> str:
+        if value.startswith(RAW_PREFIX):
+            return value.removeprefix(RAW_PREFIX)
+        if not value.startswith(COMPRESSED_PREFIX):
+            return value
+
+        compressed = base64.b64decode(value.removeprefix(COMPRESSED_PREFIX))
+        return zlib.decompress(compressed).decode("utf-8")
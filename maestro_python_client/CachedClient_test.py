@@ -5,7 +5,15 @@ from unittest.mock import MagicMock, patch
 from pytest import fixture, raises
 
 from maestro_python_client.Cache.Cache import Cache
-from maestro_python_client.CachedClient import CachedClient
+from maestro_python_client.Cache.CacheAccounting import BudgetPolicy, QueueBudget
+from maestro_python_client.CachedClient import (
+    COMPRESSED_PREFIX,
+    RAW_PREFIX,
+    CachedClient,
+)
+from maestro_python_client.Client import LaunchTaskListError
+from maestro_python_client.Transport.InProcessTransport import InProcessTransport
+from maestro_python_client.Transport.Transport import JsonResponse
 from test_utils.String import unique_str
 
 
@@ -32,6 +40,8 @@ class TestCache(Cache):
     def __init__(self) -> None:
         super().__init__()
         self.__cache = {}
+        self.gets = 0
+        self.get_manys = 0
 
     @property
     def cache(self) -> dict[str, str]:
@@ -41,8 +51,13 @@ class TestCache(Cache):
         self.__cache[key] = value
 
     def get(self, key: str) -> str:
+        self.gets += 1
         return self.__cache[key]
 
+    def get_many(self, keys: list[str]) -> dict[str, str]:
+        self.get_manys += 1
+        return {key: self.__cache[key] for key in keys if key in self.__cache}
+
     def set_ttl(self, key: str, ttl: int):
         assert key in self.__cache
 
@@ -362,3 +377,241 @@ def test_task_stoppers(requests, subtests, json_task):
             test_method = getattr(client, method)
             test_method("not_cached")
             assert not cache.set_ttl.called
+
+
+@patch("requests.post")
+def test_cache_budget(requests, subtests):
+    response_mock = MagicMock()
+    requests.return_value = response_mock
+    response_mock.status_code = 200
+
+    with subtests.test("Stats"):
+        cache = TestCache()
+        client = CachedClient("", cache, ["cached"])
+        client.launch_task(unique_str(), "cached", "payload", start_timeout=100)
+
+        stats = client.cache_stats()["cached"]
+        assert stats.bytes_written == len("payload")
+        assert stats.live_bytes == len("payload")
+        assert stats.live_entries == 1
+
+    with subtests.test("Budget on a queue not cached should fail"):
+        with raises(ValueError):
+            CachedClient("", TestCache(), ["cached"], budgets={"other": QueueBudget(1)})
+
+    with subtests.test("Reject"):
+        cache = TestCache()
+        client = CachedClient(
+            "", cache, ["cached"], budgets={"cached": QueueBudget(10)}
+        )
+        client.launch_task(unique_str(), "cached", "payload", start_timeout=100)
+        with raises(ValueError):
+            client.launch_task(unique_str(), "cached", "payload", start_timeout=100)
+        assert client.cache_stats()["cached"].rejected == 1
+        assert len(cache.cache) == 1
+
+    with subtests.test("Inline"):
+        cache = TestCache()
+        budget = QueueBudget(10, BudgetPolicy.INLINE)
+        client = CachedClient("", cache, ["cached"], budgets={"cached": budget})
+        client.launch_task(unique_str(), "cached", "payload", start_timeout=100)
+        client.launch_task(unique_str(), "cached", "payload", start_timeout=100)
+
+        assert client.cache_stats()["cached"].inlined == 1
+        assert len(cache.cache) == 1
+        assert requests.call_args.kwargs["json"]["payload"] == "payload"
+
+    with subtests.test("Compress"):
+        cache = TestCache()
+        budget = QueueBudget(50, BudgetPolicy.COMPRESS)
+        client = CachedClient("", cache, ["cached"], budgets={"cached": budget})
+        payload = "a" * 100
+        client.launch_task(unique_str(), "cached", payload, start_timeout=100)
+        key = requests.call_args.kwargs["json"]["payload"]
+
+        assert client.cache_stats()["cached"].compressed == 1
+        assert cache.cache[key] != payload
+
+        response_mock.json.return_value = {
+            "task": {
+                "task_id": unique_str(),
+                "owner": unique_str(),
+                "task_queue": "cached",
+                "payload": key,
+                "state": "pending",
+                "timeout": 300,
+                "retries": 0,
+                "max_retries": 0,
+                "created_at": 1,
+                "updated_at": 1,
+                "not_before": 0,
+            }
+        }
+        task = client.task_state("task")
+        assert task.payload == payload
+
+
+def test_cached_values(subtests):
+    cache = TestCache()
+    client = CachedClient("", cache, ["cached"], transport=InProcessTransport())
+
+    with subtests.test("Raw values looking compressed"):
+        payload = COMPRESSED_PREFIX + "not compressed"
+        task_id = client.launch_task("owner", "cached", payload, start_timeout=100)
+
+        assert cache.key_for_value(RAW_PREFIX + payload)
+        assert client.task_state(task_id).payload == payload
+
+    with subtests.test("Raw values are cached as is"):
+        task_id = client.launch_task("owner", "cached", "raw", start_timeout=100)
+
+        assert cache.key_for_value("raw")
+        assert client.task_state(task_id).payload == "raw"
+
+
+class FailingBatchTransport(InProcessTransport):
+    def __init__(self, failing_batch: int) -> None:
+        super().__init__()
+        self.__failing_batch = failing_batch
+        self.__batches = 0
+
+    def request(self, method, path, payload=None):
+        if path == "/api/task/create/list":
+            self.__batches += 1
+            if self.__batches == self.__failing_batch:
+                return JsonResponse(400, {"error": "invalid task"})
+        return super().request(method, path, payload)
+
+
+def test_launch_task_list_failure():
+    cache = TestCache()
+    client = CachedClient(
+        "", cache, ["cached"], transport=FailingBatchTransport(failing_batch=2)
+    )
+
+    with raises(LaunchTaskListError) as error:
+        client.launch_task_list(
+            [("owner", "cached", f"cached {i}") for i in range(4)],
+            start_timeout=100,
+            batch_size=2,
+            max_in_flight=1,
+        )
+
+    launched = error.value.task_ids[:2]
+    assert error.value.task_ids[2:] == [None, None]
+    assert sorted(cache.cache.values()) == ["cached 0", "cached 1"]
+    assert [client.task_state(task_id).payload for task_id in launched] == [
+        "cached 0",
+        "cached 1",
+    ]
+
+
+def test_launch_task_list_exceeded_budget():
+    cache = TestCache()
+    client = CachedClient(
+        "",
+        cache,
+        ["cached"],
+        budgets={"cached": QueueBudget(30)},
+        transport=InProcessTransport(),
+    )
+
+    with raises(LaunchTaskListError) as error:
+        client.launch_task_list(
+            [("owner", "cached", f"cached {i}") for i in range(4)],
+            start_timeout=100,
+            batch_size=2,
+            max_in_flight=1,
+        )
+
+    assert isinstance(error.value.errors[1], ValueError)
+    assert len(error.value.task_ids) == 2
+    assert sorted(cache.cache.values()) == ["cached 0", "cached 1"]
+
+
+def test_task_states(subtests):
+    cache = TestCache()
+    client = CachedClient("", cache, ["cached"], transport=InProcessTransport())
+    cached = [
+        client.launch_task("owner", "cached", f"cached {i}", start_timeout=100)
+        for i in range(10)
+    ]
+    not_cached = client.launch_task("owner", "other", "not cached")
+    client.next("cached")
+    client.complete_task(cached[0], "result")
+    cache.gets = 0
+
+    with subtests.test("Payloads are read at once"):
+        states = client.task_states([*cached, not_cached, "unknown"])
+
+        assert [task.payload for task in states.tasks.values()] == [
+            *(f"cached {i}" for i in range(10)),
+            "not cached",
+        ]
+        assert states.tasks[cached[0]].result == "result"
+        assert states.missing == ["unknown"]
+        assert cache.gets == 0
+        assert cache.get_manys == 1
+
+    with subtests.test("Missing payload"):
+        key = cache.key_for_value("cached 1")
+        assert key
+        cache.delete(key)
+
+        with raises(ValueError):
+            client.task_states([cached[1]])
+
+
+def test_resolve_tasks(subtests):
+    cache = TestCache()
+    client = CachedClient("", cache, ["cached"], transport=InProcessTransport())
+    for i in range(3):
+        client.launch_task("owner", "cached", f"cached {i}", start_timeout=100)
+    tasks = [client.fetch_unresolved("cached") for _ in range(3)]
+    key = cache.key_for_value("cached 1")
+    assert key
+    cache.delete(key)
+
+    with subtests.test("A missing payload fails only its task"):
+        errors = {}
+        resolved = client.resolve_tasks(deepcopy(tasks), errors)
+
+        assert [task.payload for task in resolved] == ["cached 0", "cached 2"]
+        assert list(errors) == [tasks[1].task_id]
+        assert isinstance(errors[tasks[1].task_id], ValueError)
+        assert cache.get_manys == 1
+
+    with subtests.test("Without errors, a missing payload raises"):
+        with raises(ValueError):
+            client.resolve_tasks(deepcopy(tasks))
+
+
+def test_delete_owners_history(subtests):
+    cache = TestCache()
+    client = CachedClient("", cache, ["cached"], transport=InProcessTransport())
+    purged = [
+        client.launch_task(owner, queue, f"{owner} {queue}", start_timeout=100)
+        for owner in ["a", "b"]
+        for queue in ["cached", "other"]
+    ]
+    kept = client.launch_task("c", "cached", "c cached", start_timeout=100)
+    client.next("cached")
+    client.complete_task(purged[0], "a result")
+
+    with subtests.test("Payloads are kept if maestro fails"):
+        with patch(
+            "maestro_python_client.Client.Client.delete_owners_history",
+            side_effect=ValueError("maestro is unreachable"),
+        ):
+            with raises(ValueError):
+                client.delete_owners_history(["a", "b"])
+
+        assert len(cache.cache) == 4
+        assert client.task_state(purged[0]).result == "a result"
+
+    with subtests.test("Payloads are deleted with their tasks"):
+        client.delete_owners_history(["a", "b"])
+
+        assert sorted(cache.cache.values()) == ["c cached"]
+        assert client.task_state(kept).payload == "c cached"
+        assert client.get_owners_history(["a", "b"]) == []
@@ -0,0 +1,251 @@
+import json
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging import Logger
+from typing import Any, Callable
+
+from maestro_python_client.Client import TERMINAL_STATES, Client, Task
+
+CALLBACK_PATH = "/maestro/callback"
+
+
+class CallbackReceiver:
+    """Receives the callbacks maestro sends when tasks finish.
+
+    Serves an HTTP endpoint, from a background thread, to be used as the
+    callback_url of tasks. launch_task and watch return futures resolving to
+    the finished task, fetched from maestro (and resolved, for CachedClient)
+    when its callback comes in. Listeners are called for every finished
+    watched task.
+
+    Callbacks can be lost, so the watched tasks are also polled every
+    poll_interval seconds.
+
+    Usable as a context manager:
+
+        with CallbackReceiver(client) as receiver:
+            task = receiver.launch_task("owner", "queue", "payload").result()
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        public_url: str | None = None,
+        poll_interval: float = 30.0,
+        max_early_callbacks: int = 10000,
+        logger: Logger | None = None,
+    ) -> None:
+        """
+        Args:
+            client: the client used to launch and fetch tasks.
+            host: the address to listen on.
+            port: the port to listen on, a free one by default.
+            public_url: the callback URL given to maestro, when the receiver
+                is reached through another address, e.g. behind a proxy.
+            poll_interval: time between two polls of the watched tasks, in
+                seconds.
+            max_early_callbacks: number of callbacks of tasks not watched yet
+                which are remembered, for a task finishing before watch is
+                called.
+            logger: where errors are reported, the module logger by default.
+        """
+        self.__client = client
+        self.__public_url = public_url
+        self.__poll_interval = poll_interval
+        self.__max_early_callbacks = max_early_callbacks
+        self.__logger = logger or logging.getLogger(__name__)
+
+        self.__lock = threading.Lock()
+        self.__watched: dict[str, Future[Task]] = {}
+        self.__early_callbacks: OrderedDict[str, None] = OrderedDict()
+        self.__listeners: list[Callable[[Task], None]] = []
+
+        self.__server = ThreadingHTTPServer((host, port), self.__handler())
+        self.__server.daemon_threads = True
+        self.__stopped = threading.Event()
+        self.__threads: list[threading.Thread] = []
+
+    @property
+    def url(self) -> str:
+        if self.__public_url:
+            return self.__public_url
+
+        host, port = self.__server.server_address[:2]
+        return f"http://{host}:{port}{CALLBACK_PATH}"
+
+    def add_listener(self, listener: Callable[[Task], None]) -> None:
+        """Calls listener with every watched task once it is finished."""
+        with self.__lock:
+            self.__listeners.append(listener)
+
+    def launch_task(
+        self, owner: str, queue: str, task_payload: str, **kwargs
+    ) -> "Future[Task]":
+        """Launches a task calling back this receiver, and watches it.
+
+        Takes the same arguments as Client.launch_task, but callback_url.
+
+        Returns:
+            A future resolving to the finished task.
+
+        Raises:
+            ValueError: Problem in the communication with maestro.
+        """
+        task_id = self.__client.launch_task(
+            owner, queue, task_payload, callback_url=self.url, **kwargs
+        )
+        return self.watch(task_id)
+
+    def watch(self, task_id: str) -> "Future[Task]":
+        """Returns a future resolving to the task once it is finished."""
+        with self.__lock:
+            future = self.__watched.get(task_id)
+            if future:
+                return future
+
+            future = Future()
+            self.__watched[task_id] = future
+            called_back = task_id in self.__early_callbacks
+            self.__early_callbacks.pop(task_id, None)
+
+        if called_back:
+            self.__on_callback(task_id)
+        return future
+
+    def start(self) -> "CallbackReceiver":
+        self.__stopped.clear()
+        self.__threads = [
+            threading.Thread(target=self.__server.serve_forever, daemon=True),
+            threading.Thread(target=self.__poll, daemon=True),
+        ]
+        for thread in self.__threads:
+            thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.__stopped.set()
+        self.__server.shutdown()
+        self.__server.server_close()
+        for thread in self.__threads:
+            thread.join()
+
+    def __enter__(self) -> "CallbackReceiver":
+        return self.start()
+
+    def __exit__(self, *_) -> None:
+        self.stop()
+
+    def __on_callback(self, task_id: str) -> None:
+        with self.__lock:
+            if task_id not in self.__watched:
+                self.__early_callbacks[task_id] = None
+                while len(self.__early_callbacks) > self.__max_early_callbacks:
+                    self.__early_callbacks.popitem(last=False)
+                return
+
+        try:
+            task = self.__client.task_state(task_id)
+        except FileNotFoundError as e:
+            self.__finish(task_id, error=e)
+            return
+        except Exception as e:
+            # Left to the poller
+            self.__log_error(f"Failed to fetch called back task {task_id}", e)
+            return
+
+        if task.state in TERMINAL_STATES:
+            self.__finish(task_id, task)
+
+    def __poll(self) -> None:
+        while not self.__stopped.wait(self.__poll_interval):
+            with self.__lock:
+                task_ids = list(self.__watched)
+
+            try:
+                finished = []
+                for task_id, task in self.__client.iter_task_states(
+                    task_ids, resolve=False
+                ):
+                    if task is None:
+                        self.__finish(
+                            task_id,
+                            error=FileNotFoundError(f"Task {task_id} does not exists"),
+                        )
+                    elif task.state in TERMINAL_STATES:
+                        finished.append(task)
+
+                for task in self.__client.resolve_tasks(finished):
+                    self.__finish(task.task_id, task)
+            except Exception as e:
+                self.__log_error("Failed to poll the watched tasks", e)
+
+    def __finish(
+        self,
+        task_id: str,
+        task: Task | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        with self.__lock:
+            future = self.__watched.pop(task_id, None)
+            listeners = list(self.__listeners)
+
+        if future is None or not future.set_running_or_notify_cancel():
+            return
+
+        if error is not None:
+            future.set_exception(error)
+            return
+
+        assert task is not None
+        for listener in listeners:
+            try:
+                listener(task)
+            except Exception as e:
+                self.__log_error(f"Listener failed on task {task_id}", e)
+        future.set_result(task)
+
+    def __log_error(self, msg: str, e: Exception) -> None:
+        self.__logger.exception(
+            {
+                "infrastructure": "callback_receiver",
+                "msg": msg,
+                "err": str(e),
+            },
+        )
+
+    def __handler(self) -> type[BaseHTTPRequestHandler]:
+        on_callback = self.__on_callback
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    task_id = self.__task_id(json.loads(self.rfile.read(length)))
+                except (ValueError, KeyError, TypeError):
+                    self.__respond(400)
+                    return
+
+                self.__respond(200)
+                on_callback(task_id)
+
+            def log_message(self, *_) -> None:
+                pass
+
+            def __respond(self, status: int) -> None:
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            @staticmethod
+            def __task_id(body: dict[str, Any]) -> str:
+                task = body.get("task", body)
+                return str(task["task_id"])
+
+        return Handler
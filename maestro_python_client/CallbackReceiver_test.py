@@ -0,0 +1,104 @@
+import json
+import logging
+import urllib.request
+from unittest.mock import MagicMock
+
+from pytest import raises
+
+from maestro_python_client.CallbackReceiver import CallbackReceiver
+from maestro_python_client.Client import Client
+from maestro_python_client.Transport.InProcessTransport import InProcessTransport
+
+
+class RecordingTransport(InProcessTransport):
+    def __init__(self) -> None:
+        super().__init__()
+        self.paths: list[str] = []
+
+    def request(self, method, path, payload=None):
+        self.paths.append(path)
+        return super().request(method, path, payload)
+
+
+def test_callback_receiver(subtests):
+    with subtests.test("Resolved by the callback"):
+        transport = RecordingTransport()
+        client = Client("", transport=transport)
+        finished = []
+
+        with CallbackReceiver(client, poll_interval=60) as receiver:
+            receiver.add_listener(finished.append)
+            future = receiver.launch_task("owner", "queue", "payload")
+            task = client.next("queue")
+            assert task
+            client.complete_task(task.task_id, "result")
+
+            result = future.result(timeout=5)
+
+        assert result.task_id == task.task_id
+        assert result.result == "result"
+        assert finished == [result]
+        assert transport.paths.count("/api/task/get") == 1
+
+    with subtests.test("Callback before watch"):
+        client = Client("", transport=InProcessTransport())
+
+        with CallbackReceiver(client, poll_interval=60) as receiver:
+            task_id = client.launch_task(
+                "owner", "queue", "payload", callback_url=receiver.url
+            )
+            client.cancel_task(task_id)
+            post(receiver.url, {"task_id": task_id})
+
+            assert receiver.watch(task_id).result(timeout=5).state == "canceled"
+
+    with subtests.test("Missed callback"):
+        client = Client("", transport=InProcessTransport())
+
+        with CallbackReceiver(client, poll_interval=0.01) as receiver:
+            task_id = client.launch_task("owner", "queue", "payload")
+            future = receiver.watch(task_id)
+            client.cancel_task(task_id)
+
+            assert future.result(timeout=5).state == "canceled"
+
+    with subtests.test("Unknown task"):
+        with CallbackReceiver(client, poll_interval=0.01) as receiver:
+            future = receiver.watch("unknown")
+
+            with raises(FileNotFoundError):
+                future.result(timeout=5)
+
+    with subtests.test("Invalid callback"):
+        with CallbackReceiver(client) as receiver:
+            with raises(urllib.error.HTTPError) as error:
+                post(receiver.url, {"no": "task"})
+
+            assert error.value.code == 400
+
+    with subtests.test("Failing listener"):
+        client = Client("", transport=InProcessTransport())
+        logger = MagicMock(spec=logging.Logger)
+        finished = []
+
+        def fail(_):
+            raise RuntimeError("listener failure")
+
+        with CallbackReceiver(client, poll_interval=60, logger=logger) as receiver:
+            receiver.add_listener(fail)
+            receiver.add_listener(finished.append)
+            task_id = client.launch_task("owner", "queue", "payload")
+            future = receiver.watch(task_id)
+            client.cancel_task(task_id)
+            post(receiver.url, {"task_id": task_id})
+
+            result = future.result(timeout=5)
+
+        assert finished == [result]
+        logger.exception.assert_called_once()
+        assert logger.exception.call_args[0][0]["err"] == "listener failure"
+
+
+def post(url: str, body: dict) -> None:
+    request = urllib.request.Request(url, data=json.dumps(body).encode("utf-8"))
+    urllib.request.urlopen(request, timeout=5).close()
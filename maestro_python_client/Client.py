@@ -1,11 +1,36 @@
 import datetime
+import itertools
+import json
+import os
+import threading
+import time
+from array import array
+from collections.abc import Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Tuple, Union
-from urllib.parse import urljoin
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
 
-import requests
 from typing_extensions import deprecated
 
+from maestro_python_client.Metrics.MetricsSink import MetricsSink
+from maestro_python_client.Metrics.RequestMetrics import RequestMetrics
+from maestro_python_client.Transport.HttpTransport import HttpTransport
+from maestro_python_client.Transport.Transport import Response, Transport
+
+T = TypeVar("T")
+
 
 class Task:
     def __init__(self):
@@ -110,6 +135,118 @@ class QueueStats:
         )
 
 
+@dataclass(frozen=True)
+class QueueStatsCounts:
+    """Number of tasks of a queue in each state."""
+
+    canceled: int = 0
+    completed: int = 0
+    failed: int = 0
+    pending: int = 0
+    planned: int = 0
+    running: int = 0
+    timedout: int = 0
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> "QueueStatsCounts":
+        return cls(
+            canceled=len(payload["canceled"]),
+            completed=len(payload["completed"]),
+            failed=len(payload["failed"]),
+            pending=len(payload["pending"]),
+            planned=len(payload["planned"]),
+            running=len(payload["running"]),
+            timedout=len(payload["timedout"]),
+        )
+
+
+class TaskIdView(Sequence[str]):
+    """Read-only list of task ids, stored compactly.
+
+    The ids are kept encoded in a single buffer, each one is only decoded to
+    a str when accessed. A million uuids take about 45MB instead of 85MB as a
+    list of str.
+    """
+
+    def __init__(self, task_ids: Iterable[str] = ()) -> None:
+        data = bytearray()
+        offsets = array("Q", [0])
+        for task_id in task_ids:
+            data += task_id.encode("utf-8")
+            offsets.append(len(data))
+
+        self.__data = bytes(data)
+        self.__offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.__offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> str:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "TaskIdView":
+        ...
+
+    def __getitem__(self, index: int | slice) -> "str | TaskIdView":
+        if isinstance(index, slice):
+            return TaskIdView(self[i] for i in range(*index.indices(len(self))))
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("TaskIdView index out of range")
+        start, end = self.__offsets[index], self.__offsets[index + 1]
+        return self.__data[start:end].decode("utf-8")
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, TaskIdView):
+            return self.__offsets == other.__offsets and self.__data == other.__data
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TaskIdView({len(self)} ids)"
+
+
+@dataclass(frozen=True)
+class CompactQueueStats:
+    """Ids of the tasks of a queue in each state, see TaskIdView."""
+
+    canceled: TaskIdView = field(default_factory=TaskIdView)
+    completed: TaskIdView = field(default_factory=TaskIdView)
+    failed: TaskIdView = field(default_factory=TaskIdView)
+    pending: TaskIdView = field(default_factory=TaskIdView)
+    planned: TaskIdView = field(default_factory=TaskIdView)
+    running: TaskIdView = field(default_factory=TaskIdView)
+    timedout: TaskIdView = field(default_factory=TaskIdView)
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> "CompactQueueStats":
+        return cls(
+            canceled=TaskIdView(payload["canceled"]),
+            completed=TaskIdView(payload["completed"]),
+            failed=TaskIdView(payload["failed"]),
+            pending=TaskIdView(payload["pending"]),
+            planned=TaskIdView(payload["planned"]),
+            running=TaskIdView(payload["running"]),
+            timedout=TaskIdView(payload["timedout"]),
+        )
+
+    def counts(self) -> QueueStatsCounts:
+        return QueueStatsCounts(
+            canceled=len(self.canceled),
+            completed=len(self.completed),
+            failed=len(self.failed),
+            pending=len(self.pending),
+            planned=len(self.planned),
+            running=len(self.running),
+            timedout=len(self.timedout),
+        )
+
+
 @dataclass(frozen=True)
 class QueueOwnerStats:
     canceled: int = 0
@@ -133,9 +270,193 @@ class QueueOwnerStats:
         )
 
 
+STATES = (
+    "canceled",
+    "completed",
+    "failed",
+    "pending",
+    "planned",
+    "running",
+    "timedout",
+)
+
+
+class QueueOwnerStatsMatrix:
+    """QueueOwnerStats of many queues and owners, stored densely.
+
+    Counters are kept in one array of queues x owners x STATES integers.
+
+        matrix.get("queue", "owner").pending
+        matrix.to_numpy()[:, :, STATES.index("pending")].sum(axis=1)
+    """
+
+    def __init__(self, queues: Iterable[str], owners: Iterable[str]) -> None:
+        self.queues = list(dict.fromkeys(queues))
+        self.owners = list(dict.fromkeys(owners))
+        self.__queue_index = {queue: i for i, queue in enumerate(self.queues)}
+        self.__owner_index = {owner: i for i, owner in enumerate(self.owners)}
+        self.__counts = array("q", bytes(8 * self.__offset(len(self.queues), 0)))
+
+    def get(self, queue: str, owner: str) -> QueueOwnerStats:
+        """Raises KeyError for a queue or owner not in the matrix."""
+        start = self.__cell(queue, owner)
+        end = start + len(STATES)
+        return QueueOwnerStats(*self.__counts[start:end])
+
+    def set(self, queue: str, owner: str, stats: QueueOwnerStats) -> None:
+        """Raises KeyError for a queue or owner not in the matrix."""
+        start = self.__cell(queue, owner)
+        end = start + len(STATES)
+        self.__counts[start:end] = array("q", (getattr(stats, s) for s in STATES))
+
+    def copy(self) -> "QueueOwnerStatsMatrix":
+        matrix = QueueOwnerStatsMatrix(self.queues, self.owners)
+        matrix.__counts = array("q", self.__counts)
+        return matrix
+
+    def to_numpy(self) -> Any:
+        """Returns the counters as a numpy array of shape
+        (queues, owners, STATES), requires numpy."""
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("QueueOwnerStatsMatrix.to_numpy requires numpy")
+
+        return (
+            numpy.frombuffer(self.__counts, dtype=numpy.int64)
+            .reshape(len(self.queues), len(self.owners), len(STATES))
+            .copy()
+        )
+
+    def __offset(self, queue: int, owner: int) -> int:
+        return (queue * len(self.owners) + owner) * len(STATES)
+
+    def __cell(self, queue: str, owner: str) -> int:
+        return self.__offset(self.__queue_index[queue], self.__owner_index[owner])
+
+
+TERMINAL_STATES = ("canceled", "completed", "failed", "timedout")
+
+
+@dataclass(frozen=True)
+class TaskStates:
+    """States of tasks fetched by Client.task_states.
+
+    Attributes:
+        tasks: the tasks found, by identifier, in the requested order.
+        missing: the identifiers of the tasks maestro does not know.
+    """
+
+    tasks: dict[str, Task] = field(default_factory=dict)
+    missing: list[str] = field(default_factory=list)
+
+
+class MaestroError(ValueError):
+    """Maestro answered with an error, or with an unexpected status code."""
+
+    def __init__(self, endpoint: str, status_code: int, content: bytes) -> None:
+        super().__init__(
+            f"Could not communicate with maestro. Status code is {status_code}, "
+            f"response is {content}"
+        )
+        self.endpoint = endpoint
+        self.status_code = status_code
+
+
+def serialize_task(
+    owner: str,
+    queue: str,
+    task_payload: str,
+    retries: int,
+    timeout: int,
+    executes_in: int,
+    start_timeout: int,
+    callback_url: str,
+    parent_task_id: str,
+) -> dict[str, Any]:
+    """Builds the body maestro expects for a new task."""
+    task = {
+        "owner": owner,
+        "queue": queue,
+        "retries": retries,
+        "timeout": timeout,
+        "payload": task_payload,
+        "callback_url": callback_url,
+        "parent_task_id": parent_task_id,
+    }
+
+    if executes_in > 0:
+        task["not_before"] = int(datetime.datetime.now().timestamp()) + executes_in
+
+    if start_timeout > 0:
+        task["startTimeout"] = int(datetime.datetime.now().timestamp()) + executes_in
+
+    return task
+
+
+class LaunchTaskListError(ValueError):
+    """Some batches of a launch_task_list call could not be launched.
+
+    Attributes:
+        task_ids: the identifiers of the tasks, in the order they were given,
+            None for the tasks of the failed batches.
+        errors: the error of each failed batch, by batch index.
+    """
+
+    def __init__(
+        self, batches: list[list[str] | int], errors: dict[int, Exception]
+    ) -> None:
+        super().__init__(
+            f"{len(errors)} of {len(batches)} batches could not be launched: "
+            + ", ".join(f"batch {i}: {e}" for i, e in sorted(errors.items()))
+        )
+        self.task_ids: list[str | None] = [
+            task_id
+            for batch in batches
+            for task_id in ([None] * batch if isinstance(batch, int) else batch)
+        ]
+        self.errors = errors
+
+
+class PurgeOwnersHistoryError(ValueError):
+    """Some chunks of a purge_owners_history call could not be purged.
+
+    Attributes:
+        purged: the owners whose history was deleted.
+        failed: the owners whose history could not be deleted.
+        errors: the error of each failed chunk, by chunk index.
+    """
+
+    def __init__(
+        self, purged: list[str], failed: list[str], errors: dict[int, Exception]
+    ) -> None:
+        super().__init__(
+            f"History of {len(failed)} owners could not be deleted: "
+            + ", ".join(f"chunk {i}: {e}" for i, e in sorted(errors.items()))
+        )
+        self.purged = purged
+        self.failed = failed
+        self.errors = errors
+
+
 class Client:
-    def __init__(self, maestro_endpoint: str):
-        self.__maestro_endpoint = maestro_endpoint
+    def __init__(
+        self,
+        maestro_endpoint: str,
+        metrics: MetricsSink | None = None,
+        transport: Transport | None = None,
+    ):
+        """
+        Args:
+            maestro_endpoint: address of maestro.
+            metrics: if set, receives the latency, status codes, sizes and
+                in-flight count of every call made to maestro, labelled by
+                endpoint (e.g. /api/task/create).
+            transport: how requests reach maestro, HTTP to maestro_endpoint
+                by default. See InProcessTransport to run without a server.
+        """
+        self.__transport = transport or HttpTransport(maestro_endpoint)
+        self.__metrics = RequestMetrics(metrics) if metrics is not None else None
 
     def launch_task(
         self,
@@ -171,9 +492,9 @@ class Client:
             ValueError: Problem in the communication with maestro.
         """
 
-        resp = requests.post(
-            urljoin(self.__maestro_endpoint, "/api/task/create"),
-            json=self.__serialize_task(
+        resp = self.__post(
+            "/api/task/create",
+            serialize_task(
                 owner,
                 queue,
                 task_payload,
@@ -185,11 +506,6 @@ class Client:
                 parent_task_id,
             ),
         )
-        if resp.status_code > 400 or "error" in resp.json():
-            raise ValueError(
-                f"Could not communicate with maestro. Status code is {resp.status_code}, "
-                f"response is {resp.content}"
-            )
         return resp.json()["task_id"]
 
     def task_state(self, task_id: str) -> Task:
@@ -206,20 +522,181 @@ class Client:
             ValueError: Error in communication with maestro
 
         """
-        resp = requests.post(
-            urljoin(self.__maestro_endpoint, "/api/task/get"),
-            json={"task_id": task_id},
-        )
-        if resp.status_code == 404:
-            raise FileNotFoundError("Could not find this task")
-        elif resp.status_code > 400 or "error" in resp.json():
-            raise ValueError(
-                f"Could not communicate with maestro. Status code is {resp.status_code}, "
-                f"response is {resp.content}"
-            )
+        resp = self.__post("/api/task/get", {"task_id": task_id}, not_found=True)
 
         return Task.from_dict(resp.json()["task"])
 
+    def task_states(
+        self, task_ids: Iterable[str], max_concurrency: int = 8, chunk_size: int = 100
+    ) -> TaskStates:
+        """Return the states of many tasks given their ids.
+
+        See iter_task_states.
+
+        Returns:
+            A TaskStates holding the tasks found and the missing ids
+
+        Raises:
+            ValueError: Error in communication with maestro
+        """
+        states = TaskStates()
+        for task_id, task in self.iter_task_states(
+            task_ids, max_concurrency, chunk_size
+        ):
+            if task is None:
+                states.missing.append(task_id)
+            else:
+                states.tasks[task_id] = task
+
+        return states
+
+    def iter_task_states(
+        self,
+        task_ids: Iterable[str],
+        max_concurrency: int = 8,
+        chunk_size: int = 100,
+        resolve: bool = True,
+    ) -> Iterator[Tuple[str, Task | None]]:
+        """Return the states of many tasks given their ids, as they come.
+
+        Ids are read by chunks of chunk_size, the tasks of a chunk are fetched
+        with up to max_concurrency requests at the same time and yielded in
+        the order of task_ids.
+
+        Args:
+            task_ids: the maestro ids of the tasks, any iterable
+            max_concurrency: maximum number of requests sent concurrently
+            chunk_size: number of tasks fetched and resolved together
+            resolve: if False, payloads stored out of maestro (see
+                CachedClient) are not fetched, use resolve_tasks.
+
+        Returns:
+            An iterator of (task id, Task) pairs, the Task being None when
+            maestro does not know the task
+
+        Raises:
+            ValueError: Error in communication with maestro
+        """
+        if max_concurrency <= 0 or chunk_size <= 0:
+            raise ValueError("Max concurrency and chunk size must be > 0")
+
+        def task_state(task_id: str) -> Task | None:
+            try:
+                # Not resolved one by one, each chunk is resolved at once
+                return Client.task_state(self, task_id)
+            except FileNotFoundError:
+                return None
+
+        with ThreadPoolExecutor(max_concurrency) as executor:
+            for chunk in self.__chunks(task_ids, chunk_size):
+                tasks = (
+                    list(map(task_state, chunk))
+                    if max_concurrency == 1
+                    else list(executor.map(task_state, chunk))
+                )
+                found = [task for task in tasks if task]
+                resolved = iter(self.resolve_tasks(found) if resolve else found)
+                for task_id, task in zip(chunk, tasks):
+                    yield task_id, next(resolved) if task else None
+
+    def as_completed(
+        self,
+        task_ids: Iterable[str],
+        timeout: float | None = None,
+        min_interval: float = 0.05,
+        max_interval: float = 5.0,
+        max_concurrency: int = 8,
+    ) -> Iterator[Task]:
+        """Yields tasks as they reach a terminal state.
+
+        The tasks not yet finished are polled with iter_task_states. The
+        polling interval starts at min_interval, doubles every time no task
+        finished, up to max_interval, and goes back to min_interval as soon
+        as one did.
+
+        Args:
+            task_ids: the maestro ids of the tasks
+            timeout: maximum time to wait for all the tasks, in seconds, None
+                to wait forever
+            min_interval: shortest time between two polls, in seconds
+            max_interval: longest time between two polls, in seconds
+            max_concurrency: maximum number of requests sent concurrently
+
+        Returns:
+            An iterator of the finished tasks, resolved
+
+        Raises:
+            TimeoutError: Some tasks are not finished after timeout seconds
+            FileNotFoundError: A task does not exists
+            ValueError: Error in communication with maestro
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        remaining = list(dict.fromkeys(task_ids))
+        interval = min_interval
+
+        while remaining:
+            finished = []
+            pending = []
+            for task_id, task in self.iter_task_states(
+                remaining, max_concurrency, resolve=False
+            ):
+                if task is None:
+                    raise FileNotFoundError(f"Task {task_id} does not exists")
+                if task.state in TERMINAL_STATES:
+                    finished.append(task)
+                else:
+                    pending.append(task_id)
+            remaining = pending
+
+            if finished:
+                interval = min_interval
+                yield from self.resolve_tasks(finished)
+            else:
+                interval = min(interval * 2, max_interval)
+
+            if not remaining:
+                return
+
+            delay = interval
+            if deadline is not None:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"{len(remaining)} tasks are not finished")
+                delay = min(delay, deadline - time.monotonic())
+            time.sleep(max(0.0, delay))
+
+    def wait(
+        self,
+        task_ids: Iterable[str],
+        timeout: float | None = None,
+        min_interval: float = 0.05,
+        max_interval: float = 5.0,
+        max_concurrency: int = 8,
+    ) -> Tuple[List[Task], List[str]]:
+        """Waits for tasks to reach a terminal state.
+
+        See as_completed.
+
+        Returns:
+            The finished tasks, resolved, and the ids of the tasks not
+            finished after timeout seconds
+
+        Raises:
+            FileNotFoundError: A task does not exists
+            ValueError: Error in communication with maestro
+        """
+        task_ids = list(dict.fromkeys(task_ids))
+        done: List[Task] = []
+        try:
+            for task in self.as_completed(
+                task_ids, timeout, min_interval, max_interval, max_concurrency
+            ):
+                done.append(task)
+        except TimeoutError:
+            pass
+
+        finished = {task.task_id for task in done}
+        return done, [task_id for task_id in task_ids if task_id not in finished]
+
     def next(self, queue: str) -> Union[Task, None]:
         """Get the following pending task.
 
@@ -234,16 +711,7 @@ class Client:
         Raises:
             ValueError: Error in communication with maestro
         """
-        resp = requests.post(
-            urljoin(self.__maestro_endpoint, "/api/queue/next"),
-            json={"queue": queue},
-        )
-
-        if resp.status_code > 400 or "error" in resp.json():
-            raise ValueError(
-                f"Could not communicate with maestro. Status code is {resp.status_code}, "
-                f"response is {resp.content}"
-            )
+        resp = self.__post("/api/queue/next", {"queue": queue})
 
         return Task.from_dict(resp.json()["task"]) if resp.json() != {} else None
 
@@ -263,19 +731,80 @@ class Client:
             ValueError: Error in communication with maestro
 
         """
-        resp = requests.post(
-            urljoin(self.__maestro_endpoint, "/api/queue/results/consume"),
-            json={"queue": queue},
-        )
-
-        if resp.status_code > 400 or "error" in resp.json():
-            raise ValueError(
-                f"Could not communicate with maestro. Status code is {resp.status_code}, "
-                f"response is {resp.content}"
-            )
+        resp = self.__post("/api/queue/results/consume", {"queue": queue})
 
         return Task.from_dict(resp.json()["task"]) if resp.json() != {} else None
 
+    def fetch_unresolved(self, queue: str) -> Union[Task, None]:
+        """Get the following pending task, without resolving its payload.
+
+        Used by the task handlers, which resolve tasks later with
+        resolve_tasks. Client stores payloads in maestro, so this is next,
+        overrides of next included. Clients storing payloads elsewhere, such
+        as CachedClient, override it to skip fetching them.
+
+        Args:
+            queue: the queue name
+
+        Returns:
+            A Task Object or None is no task is available
+        """
+        return self.next(queue)
+
+    def consume_unresolved(self, queue: str) -> Union[Task, None]:
+        """Consumes a task result, without resolving it, see fetch_unresolved.
+
+        Args:
+            queue: the queue name
+
+        Returns:
+            A Task Object or None is no result is available
+        """
+        return self.consume(queue)
+
+    def resolve_task(self, task: Task) -> Task:
+        """Fetches the payload and result of a task stored out of maestro.
+
+        Tasks are resolved by default, this is only needed for tasks fetched
+        with fetch_unresolved, consume_unresolved or resolve=False. Client
+        stores everything in maestro, so the task is returned as is.
+
+        Args:
+            task: a task fetched unresolved
+
+        Returns:
+            The task, with its payload and result
+        """
+        return task
+
+    def resolve_tasks(
+        self, tasks: List[Task], errors: Dict[str, Exception] | None = None
+    ) -> List[Task]:
+        """Resolves many tasks at once, see resolve_task.
+
+        Args:
+            tasks: tasks fetched unresolved
+            errors: if given, the tasks that cannot be resolved are left out
+                of the result and their error is stored here, by task id,
+                instead of being raised
+
+        Returns:
+            The tasks, in the same order, with their payload and result
+
+        Raises:
+            ValueError: The payload or result of a task cannot be found,
+                without errors
+        """
+        resolved = []
+        for task in tasks:
+            try:
+                resolved.append(self.resolve_task(task))
+            except Exception as e:
+                if errors is None:
+                    raise
+                errors[task.task_id] = e
+        return resolved
+
     def delete_task(self, task_id: str, consume: bool = False) -> None:
         """Delete a task from maestro.
 
@@ -288,20 +817,14 @@ class Client:
             FileNotFoundError: This task does not exists
             ValueError: Error in communication with maestro
         """
-        resp = requests.post(
-            urljoin(self.__maestro_endpoint, "/api/task/delete"),
-            json={
+        resp = self.__post(
+            "/api/task/delete",
+            {
                 "task_id": task_id,
                 "consume": consume,
             },
+            not_found=True,
         )
-        if resp.status_code == 404:
-            raise FileNotFoundError("Could not find this task")
-        elif resp.status_code > 400 or "error" in resp.json():
-            raise ValueError(
-                f"Could not communicate with maestro. Status code is {resp.status_code}, "
-                f"response is {resp.content}"
-            )
 
         return resp.json()
 
@@ -317,17 +840,7 @@ class Client:
             FileNotFoundError: This task does not exists
             ValueError: Error in communication with maestro
         """
-        resp = requests.post(
-            urljoin(self.__maestro_endpoint, "/api/task/cancel"),
-            json={"task_id": task_id},
-        )
-        if resp.status_code == 404:
-            raise FileNotFoundError("Could not find this task")
-        elif resp.status_code > 400 or "error" in resp.json():
-            raise ValueError(
-                f"Could not communicate with maestro. Status code is {resp.status_code}, "
-                f"response is {resp.content}"
-            )
+        resp = self.__post("/api/task/cancel", {"task_id": task_id}, not_found=True)
 
         return resp.json()
 
@@ -344,17 +857,9 @@ class Client:
             FileNotFoundError: This task does not exists
             ValueError: Error in communication with maestro
         """
-        resp = requests.post(
-            urljoin(self.__maestro_endpoint, "/api/task/complete"),
-            json={"task_id": task_id, "result": result},
+        resp = self.__post(
+            "/api/task/complete", {"task_id": task_id, "result": result}, not_found=True
         )
-        if resp.status_code == 404:
-            raise FileNotFoundError("Could not find this task")
-        elif resp.status_code > 400 or "error" in resp.json():
-            raise ValueError(
-                f"Could not communicate with maestro. Status code is {resp.status_code}, "
-                f"response is {resp.content}"
-            )
 
         return resp.json()
 
@@ -370,17 +875,7 @@ class Client:
             FileNotFoundError: This task does not exists
             ValueError: Error in communication with maestro
         """
-        resp = requests.post(
-            urljoin(self.__maestro_endpoint, "/api/task/fail"),
-            json={"task_id": task_id},
-        )
-        if resp.status_code == 404:
-            raise FileNotFoundError("Could not find this task")
-        elif resp.status_code > 400 or "error" in resp.json():
-            raise ValueError(
-                f"Could not communicate with maestro. Status code is {resp.status_code}, "
-                f"response is {resp.content}"
-            )
+        resp = self.__post("/api/task/fail", {"task_id": task_id}, not_found=True)
 
         return resp.json()
 
@@ -396,17 +891,7 @@ class Client:
             FileNotFoundError: This task does not exists
             ValueError: Error in communication with maestro
         """
-        resp = requests.post(
-            urljoin(self.__maestro_endpoint, "/api/task/consume"),
-            json={"task_id": task_id},
-        )
-        if resp.status_code == 404:
-            raise FileNotFoundError("Could not find this task")
-        elif resp.status_code > 400 or "error" in resp.json():
-            raise ValueError(
-                f"Could not communicate with maestro. Status code is {resp.status_code}, "
-                f"response is {resp.content}"
-            )
+        resp = self.__post("/api/task/consume", {"task_id": task_id}, not_found=True)
 
         return resp.json()
 
@@ -418,16 +903,7 @@ class Client:
         Raises:
             ValueError: Error in communication with maestro
         """
-        resp = requests.post(
-            urljoin(self.__maestro_endpoint, "/api/owners/history/get"),
-            json={"owner_ids": owner_ids},
-        )
-
-        if resp.status_code > 400 or "error" in resp.json():
-            raise ValueError(
-                f"Could not communicate with maestro. Status code is {resp.status_code}, "
-                f"response is {resp.content}"
-            )
+        resp = self.__post("/api/owners/history/get", {"owner_ids": owner_ids})
 
         tasks = [TaskHistory.from_dict(task) for task in resp.json()["tasks"]]
 
@@ -441,18 +917,85 @@ class Client:
         Raises:
             ValueError: Error in communication with maestro
         """
-        resp = requests.post(
-            urljoin(self.__maestro_endpoint, "/api/owners/history/delete"),
-            json={"owner_ids": owner_ids},
-        )
+        resp = self.__post("/api/owners/history/delete", {"owner_ids": owner_ids})
+
+        return resp.json()
+
+    def purge_owners_history(
+        self,
+        owner_ids: Iterable[str],
+        chunk_size: int = 100,
+        max_concurrency: int = 4,
+        progress: Callable[[int, int], None] | None = None,
+        checkpoint: str | None = None,
+    ) -> list[str]:
+        """Delete the history of many owners, by chunks.
+
+        Chunks of chunk_size owners are deleted with delete_owners_history,
+        up to max_concurrency at the same time. A failed chunk does not stop
+        the others.
+
+        With checkpoint, the owners purged are appended to this file as they
+        are, and the owners it already lists are skipped: an interrupted
+        purge is resumed by running it again with the same checkpoint.
+
+        Args:
+            owner_ids: the owner ids, any iterable
+            chunk_size: number of owners deleted per request
+            max_concurrency: maximum number of requests sent concurrently
+            progress: called after each chunk with the number of owners
+                purged so far and the number of owners to purge
+            checkpoint: path of the file recording the owners purged
 
-        if resp.status_code > 400 or "error" in resp.json():
-            raise ValueError(
-                f"Could not communicate with maestro. Status code is {resp.status_code}, "
-                f"response is {resp.content}"
+        Returns:
+            The owners purged by this call, skipped ones left out
+
+        Raises:
+            PurgeOwnersHistoryError: Some chunks could not be purged, the
+                others were.
+        """
+        if chunk_size <= 0 or max_concurrency <= 0:
+            raise ValueError("Chunk size and max concurrency must be > 0")
+
+        done = set()
+        if checkpoint and os.path.exists(checkpoint):
+            with open(checkpoint, encoding="utf-8") as f:
+                done = {line.rstrip("\n") for line in f if line.strip()}
+
+        owners = [owner for owner in dict.fromkeys(owner_ids) if owner not in done]
+        chunks = list(self.__chunks(owners, chunk_size))
+        purged: list[str] = []
+        failed: list[str] = []
+        errors: dict[int, Exception] = {}
+        lock = threading.Lock()
+
+        def purge(index: int, chunk: list[str]) -> None:
+            try:
+                self.delete_owners_history(chunk)
+            except Exception as e:
+                with lock:
+                    failed.extend(chunk)
+                    errors[index] = e
+                return
+
+            with lock:
+                purged.extend(chunk)
+                if checkpoint:
+                    with open(checkpoint, "a", encoding="utf-8") as f:
+                        f.writelines(f"{owner}\n" for owner in chunk)
+                if progress:
+                    progress(len(purged), len(owners))
+
+        with ThreadPoolExecutor(max_concurrency) as executor:
+            list(
+                map(purge, range(len(chunks)), chunks)
+                if max_concurrency == 1
+                else executor.map(purge, range(len(chunks)), chunks)
             )
 
-        return resp.json()
+        if errors:
+            raise PurgeOwnersHistoryError(purged, failed, errors)
+        return purged
 
     def get_queue_stats(self, queue: str) -> QueueStats:
         """Retrieve the stats of the tasks in a specific queue.
@@ -462,19 +1005,40 @@ class Client:
         Raises:
             ValueError: Error in communication with maestro
         """
-        resp = requests.post(
-            urljoin(self.__maestro_endpoint, "/api/queue/stats"),
-            json={"queue": queue},
-        )
-
-        if resp.status_code > 400 or "error" in resp.json():
-            raise ValueError(
-                f"Could not communicate with maestro. Status code is {resp.status_code}, "
-                f"response is {resp.content}"
-            )
+        resp = self.__post("/api/queue/stats", {"queue": queue})
 
         return QueueStats.from_dict(resp.json())
 
+    def get_queue_stats_counts(self, queue: str) -> QueueStatsCounts:
+        """Retrieve the number of tasks in each state in a specific queue.
+
+        maestro sends the ids of the tasks, they are dropped as soon as they
+        are counted. See QueueStatsCache to share the counts between callers.
+        Args:
+            queue: the target queue
+
+        Raises:
+            ValueError: Error in communication with maestro
+        """
+        resp = self.__post("/api/queue/stats", {"queue": queue})
+
+        return QueueStatsCounts.from_dict(resp.json())
+
+    def get_compact_queue_stats(self, queue: str) -> CompactQueueStats:
+        """Retrieve the stats of the tasks in a specific queue, as TaskIdViews.
+
+        Suited to queues with many tasks, the ids take less than half the
+        memory of get_queue_stats.
+        Args:
+            queue: the target queue
+
+        Raises:
+            ValueError: Error in communication with maestro
+        """
+        resp = self.__post("/api/queue/stats", {"queue": queue})
+
+        return CompactQueueStats.from_dict(resp.json())
+
     def get_queue_owner_stats(self, queue: str, owner: str) -> QueueOwnerStats:
         """Retrieve the stats of the tasks of a given owner in a specific queue.
         Args:
@@ -484,35 +1048,93 @@ class Client:
         Raises:
             ValueError: Error in communication with maestro
         """
-        resp = requests.get(
-            urljoin(self.__maestro_endpoint, f"/api/queue/{queue}/owner/{owner}/stats")
+        resp = self.__get(
+            "/api/queue/{queue}/owner/{owner}/stats",
+            f"/api/queue/{queue}/owner/{owner}/stats",
         )
 
-        if resp.status_code > 400 or "error" in resp.json():
-            raise ValueError(
-                f"Could not communicate with maestro. Status code is {resp.status_code}, "
-                f"response is {resp.content}"
-            )
-
         return QueueOwnerStats.from_dict(resp.json())
 
+    def get_queue_owner_stats_matrix(
+        self, queues: Iterable[str], owners: Iterable[str], max_concurrency: int = 8
+    ) -> QueueOwnerStatsMatrix:
+        """Retrieve the stats of every owner in every queue.
+
+        See refresh_queue_owner_stats.
+        Args:
+            queues: the target queues
+            owners: task owner ids
+            max_concurrency: maximum number of requests sent concurrently
+
+        Raises:
+            ValueError: Error in communication with maestro
+        """
+        matrix = QueueOwnerStatsMatrix(queues, owners)
+        self.refresh_queue_owner_stats(matrix, max_concurrency=max_concurrency)
+        return matrix
+
+    def refresh_queue_owner_stats(
+        self,
+        matrix: QueueOwnerStatsMatrix,
+        cells: Iterable[Tuple[str, str]] | None = None,
+        max_concurrency: int = 8,
+    ) -> None:
+        """Updates the stats of a QueueOwnerStatsMatrix in place.
+
+        One request is sent per queue and owner, up to max_concurrency at the
+        same time. Give the client a transport reusing its connections, e.g.
+        HttpTransport with a requests.Session.
+        Args:
+            matrix: the matrix to update
+            cells: the (queue, owner) pairs to update, all by default
+            max_concurrency: maximum number of requests sent concurrently
+
+        Raises:
+            ValueError: Error in communication with maestro
+        """
+        if max_concurrency <= 0:
+            raise ValueError("Max concurrency must be > 0")
+
+        if cells is None:
+            cells = [
+                (queue, owner) for queue in matrix.queues for owner in matrix.owners
+            ]
+
+        def owner_stats(cell: Tuple[str, str]) -> QueueOwnerStats:
+            return self.get_queue_owner_stats(*cell)
+
+        cells = list(cells)
+        with ThreadPoolExecutor(max_concurrency) as executor:
+            results = (
+                map(owner_stats, cells)
+                if max_concurrency == 1
+                else executor.map(owner_stats, cells)
+            )
+            for cell, stats in zip(cells, results):
+                matrix.set(*cell, stats)
+
     def launch_task_list(
         self,
-        tasks: List[Tuple[str, str, str]],
+        tasks: Iterable[Tuple[str, str, str]],
         retries: int = 0,
         timeout: int = 900,
         executes_in: int = 0,
         start_timeout: int = 0,
         callback_url: str = "",
         parent_task_id: str = "",
+        batch_size: int = 1000,
+        max_in_flight: int = 4,
     ) -> List[str]:
         """Launches a list a task.
 
         Each task is represented a 3-uple that will be added to maestro.
+        Tasks are sent by batches of batch_size, with at most max_in_flight
+        batches being sent at the same time. tasks is read lazily, so a
+        generator can be used to launch more tasks than fit in memory.
 
         Args:
             tasks:
-                The list of tasks to be added. Each task is a 3-uple containing
+                The tasks to be added, any iterable. Each task is a 3-uple containing
                 1. The owner of the task (as str)
                 2. The queue
                 3. The payload
@@ -522,18 +1144,26 @@ class Client:
             start_timeout: Allowed time span in seconds for the task to start.
             callback_url: URL called after task execution is completed.
             parent_task_id: Task ID of the parent, if any.
+            batch_size: Maximum number of tasks sent per request.
+            max_in_flight: Maximum number of requests sent concurrently.
 
         Returns:
-            A list of string representing the identifiers of the tasks
+            A list of string representing the identifiers of the tasks, in
+            the order of tasks
 
 
         Raises:
-            ValueError: Error in communication with maestro
+            LaunchTaskListError: Some batches could not be launched, the
+                identifiers of the other ones are available. When reading
+                tasks fails, the tasks of the batch being read and the
+                following ones are left out of its identifiers.
         """
-        payload = []
-        for owner, task_name, task_payload in tasks:
-            payload.append(
-                self.__serialize_task(
+        if batch_size <= 0 or max_in_flight <= 0:
+            raise ValueError("Batch size and max in flight must be > 0")
+
+        batches = (
+            [
+                serialize_task(
                     owner,
                     task_name,
                     task_payload,
@@ -544,47 +1174,101 @@ class Client:
                     callback_url,
                     parent_task_id,
                 )
-            )
+                for owner, task_name, task_payload in batch
+            ]
+            for batch in self.__chunks(tasks, batch_size)
+        )
 
-        resp = requests.post(
-            urljoin(self.__maestro_endpoint, "/api/task/create/list"),
-            json={"tasks": payload},
+        task_ids: list[list[str] | int] = []
+        errors: dict[int, Exception] = {}
+
+        def read() -> Iterator[list[dict[str, Any]]]:
+            try:
+                yield from batches
+            except Exception as e:
+                errors[len(task_ids)] = e
+                task_ids.append(0)
+
+        def launch(index: int, batch: list[dict[str, Any]]) -> None:
+            try:
+                resp = self.__post("/api/task/create/list", {"tasks": batch})
+                task_ids[index] = resp.json()["task_ids"]
+            except Exception as e:
+                errors[index] = e
+
+        if max_in_flight == 1:
+            for index, batch in enumerate(read()):
+                task_ids.append(len(batch))
+                launch(index, batch)
+        else:
+            with ThreadPoolExecutor(max_in_flight) as executor:
+                in_flight: set[Future] = set()
+                for index, batch in enumerate(read()):
+                    if len(in_flight) >= max_in_flight:
+                        _, in_flight = wait_futures(
+                            in_flight, return_when=FIRST_COMPLETED
+                        )
+                    task_ids.append(len(batch))
+                    in_flight.add(executor.submit(launch, index, batch))
+
+        if errors:
+            raise LaunchTaskListError(task_ids, errors) from errors[min(errors)]
+
+        return [task_id for batch_ids in task_ids for task_id in batch_ids]  # type: ignore
+
+    def __post(
+        self, endpoint: str, payload: dict[str, Any], not_found: bool = False
+    ) -> Response:
+        return self.__request(
+            endpoint,
+            lambda: self.__transport.request("POST", endpoint, payload),
+            payload,
+            not_found,
         )
-        if resp.status_code > 400 or "error" in resp.json():
-            raise ValueError(
-                f"Could not communicate with maestro. Status code is {resp.status_code}, "
-                f"response is {resp.content}"
-            )
-        return resp.json()["task_ids"]
 
-    @staticmethod
-    def __serialize_task(
-        owner: str,
-        queue: str,
-        task_payload: str,
-        retries: int,
-        timeout: int,
-        executes_in: int,
-        start_timeout: int,
-        callback_url: str,
-        parent_task_id: str,
-    ) -> dict[str, Any]:
-        task = {
-            "owner": owner,
-            "queue": queue,
-            "retries": retries,
-            "timeout": timeout,
-            "payload": task_payload,
-            "callback_url": callback_url,
-            "parent_task_id": parent_task_id,
-        }
-
-        if executes_in > 0:
-            task["not_before"] = int(datetime.datetime.now().timestamp()) + executes_in
-
-        if start_timeout > 0:
-            task["startTimeout"] = (
-                int(datetime.datetime.now().timestamp()) + executes_in
-            )
+    def __get(self, endpoint: str, path: str) -> Response:
+        return self.__request(
+            endpoint, lambda: self.__transport.request("GET", path), None, False
+        )
 
-        return task
+    def __request(
+        self,
+        endpoint: str,
+        send: Callable[[], Response],
+        payload: dict[str, Any] | None,
+        not_found: bool,
+    ) -> Response:
+        resp = (
+            send()
+            if self.__metrics is None
+            else self.__measure(endpoint, send, payload)
+        )
+
+        if not_found and resp.status_code == 404:
+            raise FileNotFoundError("Could not find this task")
+        elif resp.status_code > 400 or "error" in resp.json():
+            raise MaestroError(endpoint, resp.status_code, resp.content)
+
+        return resp
+
+    def __measure(
+        self,
+        endpoint: str,
+        send: Callable[[], Response],
+        payload: dict[str, Any] | None,
+    ) -> Response:
+        assert self.__metrics is not None
+        started_at = self.__metrics.start(endpoint, payload)
+        try:
+            resp = send()
+        except Exception:
+            self.__metrics.finish(endpoint, started_at, None)
+            raise
+        self.__metrics.finish(endpoint, started_at, resp)
+        return resp
+
+    @staticmethod
+    def __chunks(items: Iterable[T], size: int) -> Iterator[list[T]]:
+        iterator = iter(items)
+        while batch := list(itertools.islice(iterator, size)):
+            yield batch
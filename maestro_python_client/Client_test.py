@@ -1,4 +1,22 @@
-from maestro_python_client.Client import QueueStats, TaskHistory
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from pytest import raises
+
+from maestro_python_client.Client import (
+    Client,
+    LaunchTaskListError,
+    MaestroError,
+    PurgeOwnersHistoryError,
+    QueueOwnerStats,
+    QueueStats,
+    QueueStatsCounts,
+    TaskHistory,
+)
+from maestro_python_client.Metrics.InMemoryMetricsSink import InMemoryMetricsSink
+from maestro_python_client.Transport.InProcessTransport import InProcessTransport
+from maestro_python_client.Transport.Transport import JsonResponse
 
 
 def test_task_history_from_dict():
@@ -52,3 +70,356 @@ def test_queue_stats_from_dict():
     assert queue_stats.pending == 4
     assert queue_stats.running == 1
     assert queue_stats.timedout == 1
+
+
+def test_compact_queue_stats(subtests):
+    client = Client("", transport=InProcessTransport())
+    task_ids = client.launch_task_list([("owner", "queue", "x")] * 5)
+    client.cancel_task(task_ids[0])
+
+    with subtests.test("Counts"):
+        counts = client.get_queue_stats_counts("queue")
+
+        assert counts == QueueStatsCounts(canceled=1, pending=4)
+
+    with subtests.test("Ids"):
+        stats = client.get_compact_queue_stats("queue")
+
+        assert stats.counts() == QueueStatsCounts(canceled=1, pending=4)
+        assert stats.canceled == [task_ids[0]]
+        assert list(stats.pending) == task_ids[1:]
+        assert stats.pending[-1] == task_ids[-1]
+        assert stats.pending[1:3] == task_ids[2:4]
+        assert task_ids[1] in stats.pending
+        assert stats.failed == []
+
+
+def test_queue_owner_stats_matrix(subtests):
+    client = Client("", transport=InProcessTransport())
+    client.launch_task_list(
+        [("a", "q1", "x")] * 3 + [("b", "q1", "x")] + [("b", "q2", "x")] * 2
+    )
+    client.cancel_task(client.launch_task("a", "q2", "x"))
+
+    for max_concurrency in [1, 8]:
+        with subtests.test("Matrix", max_concurrency=max_concurrency):
+            matrix = client.get_queue_owner_stats_matrix(
+                ["q1", "q2"], ["a", "b", "c"], max_concurrency
+            )
+
+            assert matrix.get("q1", "a") == QueueOwnerStats(pending=3)
+            assert matrix.get("q1", "b") == QueueOwnerStats(pending=1)
+            assert matrix.get("q2", "a") == QueueOwnerStats(canceled=1)
+            assert matrix.get("q2", "b") == QueueOwnerStats(pending=2)
+            assert matrix.get("q2", "c") == QueueOwnerStats()
+            with raises(KeyError):
+                matrix.get("q3", "a")
+
+    with subtests.test("Refresh some cells"):
+        client.launch_task("c", "q2", "x")
+        client.launch_task("a", "q1", "x")
+
+        client.refresh_queue_owner_stats(matrix, [("q2", "c")])
+
+        assert matrix.get("q2", "c") == QueueOwnerStats(pending=1)
+        assert matrix.get("q1", "a") == QueueOwnerStats(pending=3)
+
+
+class PartlyFailingClient(Client):
+    def delete_owners_history(self, owner_ids: list[str]) -> dict:
+        if "bad" in owner_ids:
+            raise MaestroError("/api/owners/history/delete", 500, b"")
+        return super().delete_owners_history(owner_ids)
+
+
+def test_purge_owners_history(subtests, tmp_path):
+    with subtests.test("Owners are purged by chunks"):
+        client = Client("", transport=InProcessTransport())
+        owners = [f"owner {i}" for i in range(10)]
+        client.launch_task_list([(owner, "queue", "x") for owner in owners])
+        progress = []
+
+        purged = client.purge_owners_history(
+            owners, chunk_size=3, progress=lambda *p: progress.append(p)
+        )
+
+        assert sorted(purged) == owners
+        assert sorted(progress) == [(3, 10), (6, 10), (9, 10), (10, 10)]
+        assert client.get_owners_history(owners) == []
+
+    with subtests.test("Failed chunks are resumed from the checkpoint"):
+        client = PartlyFailingClient("", transport=InProcessTransport())
+        owners = ["a", "b", "bad", "c", "d"]
+        client.launch_task_list([(owner, "queue", "x") for owner in owners])
+        checkpoint = str(tmp_path / "checkpoint")
+
+        with raises(PurgeOwnersHistoryError) as error:
+            client.purge_owners_history(owners, chunk_size=2, checkpoint=checkpoint)
+
+        assert sorted(error.value.purged) == ["a", "b", "d"]
+        assert error.value.failed == ["bad", "c"]
+        assert list(error.value.errors) == [1]
+        assert {task.owner for task in client.get_owners_history(owners)} == {
+            "bad",
+            "c",
+        }
+
+        owners.remove("bad")
+        assert client.purge_owners_history(owners, checkpoint=checkpoint) == ["c"]
+        assert client.get_owners_history(owners) == []
+
+
+@patch("requests.post")
+def test_metrics(requests, subtests):
+    response_mock = MagicMock()
+    requests.return_value = response_mock
+    response_mock.content = b'{"task_id": "id"}'
+
+    with subtests.test("Success"):
+        response_mock.status_code = 200
+        response_mock.json.return_value = {"task_id": "id"}
+        metrics = InMemoryMetricsSink()
+        client = Client("", metrics=metrics)
+
+        assert client.launch_task("owner", "queue", "payload") == "id"
+
+        labels = {"endpoint": "/api/task/create"}
+        assert metrics.counter(
+            "maestro_client_responses_total", {**labels, "status": "200"}
+        )
+        latency = metrics.histogram("maestro_client_request_seconds", labels)
+        assert latency and latency.count == 1
+        response_size = metrics.histogram("maestro_client_response_bytes", labels)
+        assert response_size and response_size.sum == len(response_mock.content)
+        assert metrics.histogram("maestro_client_request_bytes", labels)
+        assert metrics.gauge("maestro_client_requests_in_flight", labels) == 0
+
+    with subtests.test("Error"):
+        response_mock.status_code = 500
+        response_mock.json.return_value = {"error": "error"}
+        metrics = InMemoryMetricsSink()
+        client = Client("", metrics=metrics)
+
+        with raises(MaestroError) as error:
+            client.next("queue")
+
+        assert error.value.status_code == 500
+        assert error.value.endpoint == "/api/queue/next"
+        assert metrics.counter(
+            "maestro_client_responses_total",
+            {"endpoint": "/api/queue/next", "status": "500"},
+        )
+
+    with subtests.test("Not found"):
+        response_mock.status_code = 404
+        client = Client("", metrics=InMemoryMetricsSink())
+
+        with raises(FileNotFoundError):
+            client.task_state("task")
+
+
+class FailingTransport(InProcessTransport):
+    def __init__(self, failing_payloads: set[str]) -> None:
+        super().__init__()
+        self.__failing_payloads = failing_payloads
+
+    def request(self, method, path, payload=None):
+        if any(
+            task["payload"] in self.__failing_payloads
+            for task in (payload or {}).get("tasks", [])
+        ):
+            return JsonResponse(500, {"error": "error"})
+        return super().request(method, path, payload)
+
+
+class UnavailableTransport(InProcessTransport):
+    def request(self, method, path, payload=None):
+        return JsonResponse(503, {"error": "unavailable"})
+
+
+def test_launch_task_list(subtests):
+    for max_in_flight in (1, 4):
+        with subtests.test("Batches, in order", max_in_flight=max_in_flight):
+            client = Client("", transport=InProcessTransport())
+            tasks = (("owner", "queue", str(i)) for i in range(25))
+
+            task_ids = client.launch_task_list(
+                tasks, batch_size=4, max_in_flight=max_in_flight
+            )
+
+            assert len(task_ids) == 25
+            assert [client.task_state(task_id).payload for task_id in task_ids] == [
+                str(i) for i in range(25)
+            ]
+
+    with subtests.test("Partial failure"):
+        client = Client("", transport=FailingTransport({"5"}))
+
+        with raises(LaunchTaskListError) as error:
+            client.launch_task_list(
+                [("owner", "queue", str(i)) for i in range(10)], batch_size=4
+            )
+
+        assert list(error.value.errors) == [1]
+        assert isinstance(error.value.errors[1], MaestroError)
+        task_ids = error.value.task_ids
+        assert len(task_ids) == 10
+        assert task_ids[4:8] == [None] * 4
+        assert all(task_ids[:4]) and all(task_ids[8:])
+        assert client.task_state(task_ids[9]).payload == "9"
+
+    for max_in_flight in (1, 4):
+        with subtests.test("Failing tasks", max_in_flight=max_in_flight):
+            client = Client("", transport=InProcessTransport())
+
+            def tasks():
+                for i in range(6):
+                    yield "owner", "queue", str(i)
+                raise ValueError("unreadable task")
+
+            with raises(LaunchTaskListError) as error:
+                client.launch_task_list(
+                    tasks(), batch_size=4, max_in_flight=max_in_flight
+                )
+
+            assert list(error.value.errors) == [1]
+            assert str(error.value.errors[1]) == "unreadable task"
+            task_ids = error.value.task_ids
+            assert len(task_ids) == 4
+            assert [client.task_state(task_id).payload for task_id in task_ids] == [
+                str(i) for i in range(4)
+            ]
+
+    with subtests.test("Invalid batch size"):
+        with raises(ValueError):
+            Client("", transport=InProcessTransport()).launch_task_list(
+                [], batch_size=0
+            )
+
+
+def test_task_states(subtests):
+    client = Client("", transport=InProcessTransport())
+    task_ids = [client.launch_task("owner", "queue", str(i)) for i in range(25)]
+
+    for max_concurrency in (1, 8):
+        with subtests.test("Missing tasks", max_concurrency=max_concurrency):
+            states = client.task_states(
+                ["unknown", *task_ids, "other"],
+                max_concurrency=max_concurrency,
+                chunk_size=10,
+            )
+
+            assert list(states.tasks) == task_ids
+            assert [task.payload for task in states.tasks.values()] == [
+                str(i) for i in range(25)
+            ]
+            assert states.missing == ["unknown", "other"]
+
+    with subtests.test("Iterator"):
+        states = client.iter_task_states(iter(task_ids[:3]))
+
+        assert [(task_id, task.task_id) for task_id, task in states] == [
+            (task_id, task_id) for task_id in task_ids[:3]
+        ]
+
+    with subtests.test("Error"):
+        with raises(MaestroError):
+            Client("", transport=UnavailableTransport()).task_states(["id"])
+
+
+class RecordingTransport(InProcessTransport):
+    def __init__(self) -> None:
+        super().__init__()
+        self.polled: list[str] = []
+
+    def request(self, method, path, payload=None):
+        if path == "/api/task/get":
+            self.polled.append((payload or {})["task_id"])
+        return super().request(method, path, payload)
+
+
+def test_as_completed(subtests):
+    transport = RecordingTransport()
+    client = Client("", transport=transport)
+    task_ids = [client.launch_task("owner", "queue", str(i)) for i in range(3)]
+
+    def complete(task_id: str, delay: float) -> None:
+        time.sleep(delay)
+        task = client.next("queue")
+        assert task and task.task_id == task_id
+        client.complete_task(task_id, "result")
+
+    with subtests.test("Yields tasks as they finish"):
+        threads = [
+            threading.Thread(target=complete, args=(task_id, 0.05 * (i + 1)))
+            for i, task_id in enumerate(task_ids[:2])
+        ]
+        for thread in threads:
+            thread.start()
+        threads[1].join()
+
+        client.cancel_task(task_ids[2])
+        tasks = list(client.as_completed(task_ids, timeout=5, min_interval=0.01))
+
+        assert {task.task_id for task in tasks} == set(task_ids)
+        assert all(task.state in ("completed", "canceled") for task in tasks)
+        assert transport.polled.count(task_ids[0]) == 1
+
+    with subtests.test("Finished tasks are not polled again"):
+        transport.polled.clear()
+        pending = client.launch_task("owner", "queue", "pending")
+        threading.Thread(target=complete, args=(pending, 0.1)).start()
+
+        tasks = list(
+            client.as_completed([task_ids[0], pending], timeout=5, min_interval=0.01)
+        )
+
+        assert [task.task_id for task in tasks] == [task_ids[0], pending]
+        assert transport.polled.count(task_ids[0]) == 1
+        assert transport.polled.count(pending) > 1
+
+    with subtests.test("Timeout"):
+        pending = client.launch_task("owner", "other", "pending")
+
+        with raises(TimeoutError):
+            list(client.as_completed([pending], timeout=0.05, min_interval=0.01))
+
+        done, not_done = client.wait([task_ids[0], pending], timeout=0.05)
+        assert [task.task_id for task in done] == [task_ids[0]]
+        assert not_done == [pending]
+
+    with subtests.test("Unknown task"):
+        with raises(FileNotFoundError):
+            client.wait(["unknown"])
+
+
+class UpperClient(Client):
+    """Overrides next and consume, as subclasses of Client may."""
+
+    def __init__(self) -> None:
+        super().__init__("", transport=InProcessTransport())
+
+    def next(self, queue):
+        task = super().next(queue)
+        if task:
+            task.payload = task.payload.upper()
+        return task
+
+    def consume(self, queue):
+        task = super().consume(queue)
+        if task:
+            task.result = task.result.upper()
+        return task
+
+
+def test_fetch_unresolved():
+    client = UpperClient()
+    task_id = client.launch_task("owner", "queue", "payload")
+
+    task = client.fetch_unresolved("queue")
+
+    assert task and task.payload == "PAYLOAD"
+    assert client.fetch_unresolved("queue") is None
+    client.complete_task(task_id, "result")
+    result = client.consume_unresolved("queue")
+    assert result and result.result == "RESULT"
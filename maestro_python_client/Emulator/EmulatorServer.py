@@ -0,0 +1,92 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from maestro_python_client.Emulator.MaestroEmulator import MaestroEmulator
+
+
+class EmulatorServer:
+    """Serves a MaestroEmulator over HTTP, from a background thread.
+
+    Usable as a context manager:
+
+        with EmulatorServer() as server:
+            client = Client(server.url)
+    """
+
+    def __init__(
+        self,
+        emulator: MaestroEmulator | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """
+        Args:
+            emulator: the emulator to serve, a new one by default.
+            host: the address to listen on.
+            port: the port to listen on, a free one by default.
+        """
+        self.__emulator = emulator or MaestroEmulator()
+        self.__server = ThreadingHTTPServer((host, port), self.__handler())
+        self.__server.daemon_threads = True
+        self.__thread: threading.Thread | None = None
+
+    @property
+    def emulator(self) -> MaestroEmulator:
+        return self.__emulator
+
+    @property
+    def url(self) -> str:
+        host, port = self.__server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "EmulatorServer":
+        self.__thread = threading.Thread(
+            target=self.__server.serve_forever, daemon=True
+        )
+        self.__thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.__server.shutdown()
+        self.__server.server_close()
+        if self.__thread:
+            self.__thread.join()
+
+    def __enter__(self) -> "EmulatorServer":
+        return self.start()
+
+    def __exit__(self, *_) -> None:
+        self.stop()
+
+    def __handler(self) -> type[BaseHTTPRequestHandler]:
+        emulator = self.__emulator
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                self.__respond(*emulator.handle("GET", self.path))
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self.__respond(400, {"error": "invalid JSON body"})
+                    return
+
+                self.__respond(*emulator.handle("POST", self.path, payload))
+
+            def log_message(self, *_) -> None:
+                pass
+
+            def __respond(self, status: int, body) -> None:
+                content = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+        return Handler
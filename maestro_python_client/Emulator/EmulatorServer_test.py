@@ -0,0 +1,74 @@
+from pytest import fixture, raises
+
+from maestro_python_client.Client import Client
+from maestro_python_client.Emulator.EmulatorServer import EmulatorServer
+from test_utils.String import unique_str
+
+
+@fixture(scope="module")
+def client():
+    with EmulatorServer() as server:
+        yield Client(server.url)
+
+
+def test_task_lifecycle(client, subtests):
+    with subtests.test("next and complete"):
+        queue = unique_str()
+        task_id = client.launch_task("owner", queue, "payload")
+
+        task = client.next(queue)
+        assert task and task.task_id == task_id
+        assert task.state == "running"
+        assert client.next(queue) is None
+
+        client.complete_task(task_id, "result")
+        task = client.task_state(task_id)
+        assert task.state == "completed"
+        assert task.result == "result"
+
+        result = client.consume(queue)
+        assert result and result.task_id == task_id
+        assert client.consume(queue) is None
+
+    with subtests.test("fail with retries"):
+        queue = unique_str()
+        task_id = client.launch_task("owner", queue, "payload", retries=1)
+
+        client.next(queue)
+        client.fail_task(task_id)
+        assert client.task_state(task_id).state == "pending"
+
+        client.next(queue)
+        client.fail_task(task_id)
+        assert client.task_state(task_id).state == "failed"
+
+    with subtests.test("planned"):
+        queue = unique_str()
+        task_id = client.launch_task("owner", queue, "payload", executes_in=100)
+
+        assert client.next(queue) is None
+        assert client.get_queue_stats(queue).planned == [task_id]
+
+    with subtests.test("list and stats"):
+        queue = unique_str()
+        task_ids = client.launch_task_list(
+            [("owner", queue, "a"), ("other", queue, "b")]
+        )
+
+        assert client.get_queue_stats(queue).pending == task_ids
+        assert client.get_queue_owner_stats(queue, "owner").pending == 1
+
+    with subtests.test("owners history"):
+        owner = unique_str()
+        task_id = client.launch_task(owner, unique_str(), "payload")
+
+        (history,) = client.get_owners_history([owner])
+        assert history.task_id == task_id
+
+        client.delete_owners_history([owner])
+        with raises(FileNotFoundError):
+            client.task_state(task_id)
+
+    with subtests.test("unknown task"):
+        with raises(FileNotFoundError):
+            client.complete_task(unique_str(), "result")
@@ -0,0 +1,337 @@
+import heapq
+import itertools
+import json
+import threading
+import time
+import urllib.request
+from collections import deque
+from typing import Any, Callable
+from uuid import uuid4
+
+TERMINAL_STATES = ("canceled", "completed", "failed", "timedout")
+STATES = (
+    "canceled",
+    "completed",
+    "failed",
+    "pending",
+    "planned",
+    "running",
+    "timedout",
+)
+
+
+class MaestroEmulator:
+    """In-memory stand-in for the Maestro API.
+
+    Implements the endpoints used by Client with the same payloads and status
+    codes, to run tests, benchmarks and single process pipelines without a
+    Maestro server. Tasks running past their timeout are retried or timed out
+    lazily, when their queue is accessed.
+
+    Every request waits latency seconds before being handled, to emulate the
+    network and the server. When a task with a callback_url finishes, the task
+    is posted to its callback_url from a background thread.
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.__latency = latency
+        self.__lock = threading.Lock()
+        self.__tasks: dict[str, dict[str, Any]] = {}
+        self.__pending: dict[str, deque[str]] = {}
+        self.__planned: dict[str, list[tuple[int, int, str]]] = {}
+        self.__running: dict[str, set[str]] = {}
+        self.__results: dict[str, deque[str]] = {}
+        self.__sequence = itertools.count()
+        self.__callbacks: list[tuple[str, dict[str, Any]]] = []
+        self.__routes: dict[str, Callable[[dict[str, Any]], tuple[int, Any]]] = {
+            "/api/task/create": self.__create,
+            "/api/task/create/list": self.__create_list,
+            "/api/task/get": self.__get,
+            "/api/task/delete": self.__delete,
+            "/api/task/cancel": self.__cancel,
+            "/api/task/complete": self.__complete,
+            "/api/task/fail": self.__fail,
+            "/api/task/consume": self.__consume_task,
+            "/api/queue/next": self.__next,
+            "/api/queue/results/consume": self.__consume,
+            "/api/queue/stats": self.__queue_stats,
+            "/api/owners/history/get": self.__get_history,
+            "/api/owners/history/delete": self.__delete_history,
+        }
+
+    def handle(
+        self, method: str, path: str, payload: dict[str, Any] | None = None
+    ) -> tuple[int, Any]:
+        """Handles a request.
+
+        Args:
+            method: "GET" or "POST".
+            path: the path of the endpoint, e.g. /api/task/create.
+            payload: the decoded JSON body of the request.
+
+        Returns:
+            The status code and the JSON body of the response.
+        """
+        if self.__latency > 0:
+            time.sleep(self.__latency)
+
+        with self.__lock:
+            response = self.__route(method, path, payload)
+            callbacks, self.__callbacks = self.__callbacks, []
+
+        for url, task in callbacks:
+            threading.Thread(
+                target=self.__call_back, args=(url, task), daemon=True
+            ).start()
+
+        return response
+
+    def __route(
+        self, method: str, path: str, payload: dict[str, Any] | None
+    ) -> tuple[int, Any]:
+        if method == "GET":
+            parts = path.strip("/").split("/")
+            if len(parts) == 6 and parts[:2] == ["api", "queue"]:
+                return self.__owner_stats(parts[2], parts[4])
+        elif path in self.__routes:
+            try:
+                return self.__routes[path](payload or {})
+            except (KeyError, TypeError) as e:
+                return 400, {"error": f"invalid request: {e}"}
+
+        return 404, {"error": f"Unknown endpoint {method} {path}"}
+
+    def __create(self, payload: dict[str, Any]) -> tuple[int, Any]:
+        return 200, {"task_id": self.__add(payload)}
+
+    def __create_list(self, payload: dict[str, Any]) -> tuple[int, Any]:
+        return 200, {"task_ids": [self.__add(task) for task in payload["tasks"]]}
+
+    def __get(self, payload: dict[str, Any]) -> tuple[int, Any]:
+        task = self.__task(payload["task_id"])
+        if not task:
+            return 404, {"error": "task not found"}
+        return 200, {"task": self.__public(task)}
+
+    def __delete(self, payload: dict[str, Any]) -> tuple[int, Any]:
+        task = self.__task(payload["task_id"])
+        if not task:
+            return 404, {"error": "task not found"}
+        del self.__tasks[task["task_id"]]
+        return 200, {}
+
+    def __cancel(self, payload: dict[str, Any]) -> tuple[int, Any]:
+        return self.__finish(payload["task_id"], "canceled")
+
+    def __complete(self, payload: dict[str, Any]) -> tuple[int, Any]:
+        return self.__finish(payload["task_id"], "completed", payload["result"])
+
+    def __fail(self, payload: dict[str, Any]) -> tuple[int, Any]:
+        task = self.__task(payload["task_id"])
+        if not task:
+            return 404, {"error": "task not found"}
+        if task["state"] != "running":
+            return 400, {"error": "task is not running"}
+
+        self.__retry_or(task, "failed")
+        return 200, {}
+
+    def __consume_task(self, payload: dict[str, Any]) -> tuple[int, Any]:
+        task = self.__task(payload["task_id"])
+        if not task:
+            return 404, {"error": "task not found"}
+        task["consumed"] = True
+        return 200, {}
+
+    def __next(self, payload: dict[str, Any]) -> tuple[int, Any]:
+        queue = payload["queue"]
+        self.__refresh(queue)
+
+        pending = self.__pending.get(queue, deque())
+        while pending:
+            task = self.__tasks.get(pending.popleft())
+            if task and task["state"] == "pending":
+                self.__set_state(task, "running")
+                self.__running.setdefault(queue, set()).add(task["task_id"])
+                return 200, {"task": self.__public(task)}
+
+        return 200, {}
+
+    def __consume(self, payload: dict[str, Any]) -> tuple[int, Any]:
+        queue = payload["queue"]
+        self.__refresh(queue)
+
+        results = self.__results.get(queue, deque())
+        while results:
+            task = self.__tasks.get(results.popleft())
+            if task and not task["consumed"]:
+                task["consumed"] = True
+                return 200, {"task": self.__public(task)}
+
+        return 200, {}
+
+    def __queue_stats(self, payload: dict[str, Any]) -> tuple[int, Any]:
+        queue = payload["queue"]
+        self.__refresh(queue)
+
+        stats: dict[str, list[str]] = {state: [] for state in STATES}
+        for task in self.__tasks.values():
+            if task["task_queue"] == queue:
+                stats[task["state"]].append(task["task_id"])
+        return 200, stats
+
+    def __owner_stats(self, queue: str, owner: str) -> tuple[int, Any]:
+        self.__refresh(queue)
+
+        stats = {state: 0 for state in STATES}
+        for task in self.__tasks.values():
+            if task["task_queue"] == queue and task["owner"] == owner:
+                stats[task["state"]] += 1
+        return 200, stats
+
+    def __get_history(self, payload: dict[str, Any]) -> tuple[int, Any]:
+        owners = set(payload["owner_ids"])
+        return 200, {
+            "tasks": [
+                {
+                    "task_id": task["task_id"],
+                    "parent_task_id": task["parent_task_id"],
+                    "owner_id": task["owner"],
+                    "task_queue": task["task_queue"],
+                    "state": task["state"],
+                    "timeout": task["timeout"],
+                    "retries": task["retries"],
+                    "max_retries": task["max_retries"],
+                    "version": task["version"],
+                    "not_before": task["not_before"],
+                    "start_timeout": task["start_timeout"],
+                    "consumed": task["consumed"],
+                }
+                for task in self.__tasks.values()
+                if task["owner"] in owners
+            ]
+        }
+
+    def __delete_history(self, payload: dict[str, Any]) -> tuple[int, Any]:
+        owners = set(payload["owner_ids"])
+        for task_id in [
+            task_id for task_id, task in self.__tasks.items() if task["owner"] in owners
+        ]:
+            del self.__tasks[task_id]
+        return 200, {}
+
+    def __add(self, payload: dict[str, Any]) -> str:
+        now = int(time.time())
+        task = {
+            "task_id": str(uuid4()),
+            "owner": payload["owner"],
+            "task_queue": payload["queue"],
+            "payload": payload["payload"],
+            "state": "pending",
+            "timeout": payload.get("timeout", 900),
+            "retries": 0,
+            "max_retries": payload.get("retries", 0),
+            "created_at": now,
+            "updated_at": now,
+            "not_before": payload.get("not_before", 0),
+            "start_timeout": payload.get("startTimeout", 0),
+            "consumed": False,
+            "parent_task_id": payload.get("parent_task_id", ""),
+            "callback_url": payload.get("callback_url", ""),
+            "version": 0,
+        }
+        self.__tasks[task["task_id"]] = task
+
+        if task["not_before"] > now:
+            self.__set_state(task, "planned")
+            heapq.heappush(
+                self.__planned.setdefault(task["task_queue"], []),
+                (task["not_before"], next(self.__sequence), task["task_id"]),
+            )
+        else:
+            self.__pending.setdefault(task["task_queue"], deque()).append(
+                task["task_id"]
+            )
+
+        return task["task_id"]
+
+    def __finish(
+        self, task_id: str, state: str, result: str | None = None
+    ) -> tuple[int, Any]:
+        task = self.__task(task_id)
+        if not task:
+            return 404, {"error": "task not found"}
+        if task["state"] in TERMINAL_STATES:
+            return 400, {"error": f"task is already {task['state']}"}
+
+        if result is not None:
+            task["result"] = result
+        self.__set_state(task, state)
+        return 200, {}
+
+    def __refresh(self, queue: str) -> None:
+        now = int(time.time())
+
+        planned = self.__planned.get(queue, [])
+        while planned and planned[0][0] <= now:
+            _, _, task_id = heapq.heappop(planned)
+            task = self.__tasks.get(task_id)
+            if task and task["state"] == "planned":
+                self.__set_state(task, "pending")
+                self.__pending.setdefault(queue, deque()).append(task_id)
+
+        for task_id in list(self.__running.get(queue, ())):
+            task = self.__tasks.get(task_id)
+            if not task or task["state"] != "running":
+                self.__running[queue].discard(task_id)
+            elif task["updated_at"] + task["timeout"] < now:
+                self.__retry_or(task, "timedout")
+
+    def __retry_or(self, task: dict[str, Any], state: str) -> None:
+        if task["retries"] < task["max_retries"]:
+            task["retries"] += 1
+            self.__set_state(task, "pending")
+            self.__pending.setdefault(task["task_queue"], deque()).append(
+                task["task_id"]
+            )
+        else:
+            self.__set_state(task, state)
+
+    def __set_state(self, task: dict[str, Any], state: str) -> None:
+        task["state"] = state
+        task["updated_at"] = int(time.time())
+        task["version"] += 1
+
+        if state in TERMINAL_STATES:
+            self.__running.get(task["task_queue"], set()).discard(task["task_id"])
+            self.__results.setdefault(task["task_queue"], deque()).append(
+                task["task_id"]
+            )
+            if task["callback_url"]:
+                self.__callbacks.append((task["callback_url"], self.__public(task)))
+
+    def __task(self, task_id: str) -> dict[str, Any] | None:
+        task = self.__tasks.get(task_id)
+        if task:
+            self.__refresh(task["task_queue"])
+        return task
+
+    @staticmethod
+    def __call_back(url: str, task: dict[str, Any]) -> None:
+        request = urllib.request.Request(
+            url,
+            data=json.dumps(task).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            urllib.request.urlopen(request, timeout=10).close()
+        except OSError:
+            pass
+
+    @staticmethod
+    def __public(task: dict[str, Any]) -> dict[str, Any]:
+        return {
+            key: value
+            for key, value in task.items()
+            if key not in ("callback_url", "start_timeout", "version")
+        }
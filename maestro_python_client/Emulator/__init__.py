@@ -0,0 +1,2 @@
+from maestro_python_client.Emulator.EmulatorServer import EmulatorServer
+from maestro_python_client.Emulator.MaestroEmulator import MaestroEmulator
@@ -0,0 +1,236 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import NamedTuple
+
+from maestro_python_client.Client import Client, LaunchTaskListError, MaestroError
+
+
+class _LaunchOptions(NamedTuple):
+    retries: int
+    timeout: int
+    executes_in: int
+    start_timeout: int
+    callback_url: str
+    parent_task_id: str
+
+
+class _PendingTask(NamedTuple):
+    owner: str
+    queue: str
+    task_payload: str
+    future: Future
+
+
+class LaunchBatcher:
+    """Groups launch_task calls into launch_task_list requests.
+
+    Tasks submitted from any thread are buffered and sent in the background,
+    as one /api/task/create/list request per max_batch_size tasks, or after
+    max_delay seconds for smaller batches, with up to max_in_flight requests
+    sent concurrently. Only tasks sharing the same options can go in the same
+    request.
+
+    When Maestro rejects a batch, or the client refuses it (e.g. a cache budget
+    exceeded), its tasks are launched one by one so that each caller gets its
+    own error. Other failures, such as Maestro being unreachable, are set on
+    every future of the batch.
+
+    Usable as a context manager, pending tasks are sent on exit:
+
+        with LaunchBatcher(client) as batcher:
+            task_id = batcher.launch_task("owner", "queue", "payload")
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        max_batch_size: int = 100,
+        max_delay: float = 0.01,
+        max_in_flight: int = 4,
+    ) -> None:
+        """
+        Args:
+            client: the client used to launch the tasks.
+            max_batch_size: maximum number of tasks sent per request.
+            max_delay: maximum time a task waits for its batch to fill, in
+                seconds.
+            max_in_flight: maximum number of requests sent concurrently.
+        """
+        if max_batch_size <= 0 or max_in_flight <= 0:
+            raise ValueError("Max batch size and max in flight must be > 0")
+
+        self.__client = client
+        self.__max_batch_size = max_batch_size
+        self.__max_delay = max_delay
+        self.__max_in_flight = max_in_flight
+        self.__slots = threading.BoundedSemaphore(max_in_flight)
+
+        self.__lock = threading.Condition()
+        self.__pending: dict[_LaunchOptions, list[_PendingTask]] = {}
+        self.__deadlines: dict[_LaunchOptions, float] = {}
+        self.__closed = False
+        self.__flusher: threading.Thread | None = None
+
+    def submit(
+        self,
+        owner: str,
+        queue: str,
+        task_payload: str,
+        retries: int = 0,
+        timeout: int = 900,
+        executes_in: int = 0,
+        start_timeout: int = 0,
+        callback_url: str = "",
+        parent_task_id: str = "",
+    ) -> "Future[str]":
+        """Buffers a task to be launched.
+
+        Takes the same arguments as Client.launch_task.
+
+        Returns:
+            A future resolving to the Maestro task id.
+
+        Raises:
+            RuntimeError: The batcher is closed.
+        """
+        options = _LaunchOptions(
+            retries, timeout, executes_in, start_timeout, callback_url, parent_task_id
+        )
+        future: Future[str] = Future()
+
+        with self.__lock:
+            if self.__closed:
+                raise RuntimeError("Cannot launch tasks after the batcher is closed")
+
+            if self.__flusher is None:
+                self.__flusher = threading.Thread(target=self.__flush_loop, daemon=True)
+                self.__flusher.start()
+
+            pending = self.__pending.setdefault(options, [])
+            if not pending:
+                self.__deadlines[options] = time.monotonic() + self.__max_delay
+            pending.append(_PendingTask(owner, queue, task_payload, future))
+            if len(pending) >= self.__max_batch_size:
+                self.__lock.notify()
+
+        return future
+
+    def launch_task(self, *args, **kwargs) -> str:
+        """Launches a task, through the next batch.
+
+        Takes the same arguments as Client.launch_task, and blocks until the
+        batch holding the task is sent.
+
+        Returns:
+            A string representing the Maestro task id
+
+        Raises:
+            ValueError: Problem in the communication with maestro.
+        """
+        return self.submit(*args, **kwargs).result()
+
+    def close(self) -> None:
+        """Sends the pending tasks and stops the background threads."""
+        with self.__lock:
+            self.__closed = True
+            self.__lock.notify()
+            flusher = self.__flusher
+
+        if flusher:
+            flusher.join()
+
+    def __enter__(self) -> "LaunchBatcher":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __flush_loop(self) -> None:
+        with ThreadPoolExecutor(self.__max_in_flight) as executor:
+            while True:
+                # Batches keep filling while every request slot is taken
+                self.__slots.acquire()
+                with self.__lock:
+                    batch = self.__ready_batch()
+                    while batch is None and not self.__closed:
+                        self.__lock.wait(self.__next_deadline())
+                        batch = self.__ready_batch()
+                    if batch is None:
+                        self.__slots.release()
+                        return
+
+                executor.submit(self.__send_in_slot, *batch)
+
+    def __ready_batch(self) -> tuple[_LaunchOptions, list[_PendingTask]] | None:
+        now = time.monotonic()
+        for options, pending in self.__pending.items():
+            if (
+                self.__closed
+                or len(pending) >= self.__max_batch_size
+                or self.__deadlines[options] <= now
+            ):
+                batch = pending[: self.__max_batch_size]
+                del pending[: self.__max_batch_size]
+                if pending:
+                    self.__deadlines[options] = now + self.__max_delay
+                else:
+                    del self.__pending[options]
+                    del self.__deadlines[options]
+                return options, batch
+
+        return None
+
+    def __next_deadline(self) -> float | None:
+        if not self.__deadlines:
+            return None
+        return max(0.0, min(self.__deadlines.values()) - time.monotonic())
+
+    def __send_in_slot(
+        self, options: _LaunchOptions, tasks: list[_PendingTask]
+    ) -> None:
+        try:
+            self.__send(options, tasks)
+        finally:
+            self.__slots.release()
+
+    def __send(self, options: _LaunchOptions, tasks: list[_PendingTask]) -> None:
+        tasks = [task for task in tasks if task.future.set_running_or_notify_cancel()]
+        if not tasks:
+            return
+
+        try:
+            task_ids = self.__client.launch_task_list(
+                [(task.owner, task.queue, task.task_payload) for task in tasks],
+                *options,
+                batch_size=len(tasks),
+                max_in_flight=1,
+            )
+        except Exception as e:
+            error = e.__cause__ if isinstance(e, LaunchTaskListError) else e
+            if len(tasks) > 1 and self.__is_rejected(error):
+                for task in tasks:
+                    self.__send_one(options, task)
+            else:
+                for task in tasks:
+                    task.future.set_exception(error or e)
+            return
+
+        for task, task_id in zip(tasks, task_ids):
+            task.future.set_result(task_id)
+
+    def __send_one(self, options: _LaunchOptions, task: _PendingTask) -> None:
+        try:
+            task.future.set_result(
+                self.__client.launch_task(
+                    task.owner, task.queue, task.task_payload, *options
+                )
+            )
+        except Exception as e:
+            task.future.set_exception(e)
+
+    @staticmethod
+    def __is_rejected(error: BaseException | None) -> bool:
+        if isinstance(error, MaestroError):
+            return 400 <= error.status_code < 500
+        return isinstance(error, ValueError)
@@ -0,0 +1,144 @@
+import threading
+import time
+
+from pytest import raises
+
+from maestro_python_client.Client import Client, MaestroError
+from maestro_python_client.LaunchBatcher import LaunchBatcher
+from maestro_python_client.Transport.InProcessTransport import InProcessTransport
+from maestro_python_client.Transport.Transport import JsonResponse
+
+
+class CountingTransport(InProcessTransport):
+    def __init__(self, status: int = 200, rejected_payload: str = "") -> None:
+        super().__init__()
+        self.paths: list[str] = []
+        self.__status = status
+        self.__rejected_payload = rejected_payload
+
+    def request(self, method, path, payload=None):
+        self.paths.append(path)
+        if self.__status != 200:
+            return JsonResponse(self.__status, {"error": "error"})
+        tasks = (payload or {}).get("tasks", [payload or {}])
+        if any(task.get("payload") == self.__rejected_payload for task in tasks):
+            return JsonResponse(400, {"error": "invalid task"})
+        return super().request(method, path, payload)
+
+
+class BarrierTransport(InProcessTransport):
+    def __init__(self, parties: int) -> None:
+        super().__init__()
+        self.__barrier = threading.Barrier(parties, timeout=1)
+
+    def request(self, method, path, payload=None):
+        self.__barrier.wait()
+        return super().request(method, path, payload)
+
+
+def test_launch_batcher(subtests):
+    with subtests.test("Batches concurrent calls"):
+        transport = CountingTransport()
+        client = Client("", transport=transport)
+
+        with LaunchBatcher(client, max_batch_size=10, max_delay=1) as batcher:
+            futures = [batcher.submit("owner", "queue", str(i)) for i in range(30)]
+            task_ids = [future.result(timeout=1) for future in futures]
+
+        assert transport.paths == ["/api/task/create/list"] * 3
+        assert [client.task_state(task_id).payload for task_id in task_ids] == [
+            str(i) for i in range(30)
+        ]
+
+    with subtests.test("Flushes after max delay"):
+        transport = CountingTransport()
+        batcher = LaunchBatcher(Client("", transport=transport), max_delay=0.01)
+
+        task_id = batcher.launch_task("owner", "queue", "payload")
+
+        assert task_id
+        assert transport.paths == ["/api/task/create/list"]
+        batcher.close()
+
+    with subtests.test("Groups tasks by options"):
+        transport = CountingTransport()
+        client = Client("", transport=transport)
+
+        with LaunchBatcher(client, max_delay=0.05) as batcher:
+            short = batcher.submit("owner", "queue", "short", timeout=10)
+            long = batcher.submit("owner", "queue", "long", timeout=1000)
+
+        assert transport.paths == ["/api/task/create/list"] * 2
+        assert client.task_state(short.result()).timeout == 10
+        assert client.task_state(long.result()).timeout == 1000
+
+    with subtests.test("Many threads"):
+        transport = CountingTransport()
+        client = Client("", transport=transport)
+        task_ids: list[str] = []
+
+        with LaunchBatcher(client, max_delay=0.05) as batcher:
+            threads = [
+                threading.Thread(
+                    target=lambda: task_ids.append(
+                        batcher.launch_task("owner", "queue", "payload")
+                    )
+                )
+                for _ in range(50)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert len(set(task_ids)) == 50
+        assert len(transport.paths) < 50
+
+    with subtests.test("Rejected task"):
+        transport = CountingTransport(rejected_payload="bad")
+        client = Client("", transport=transport)
+
+        with LaunchBatcher(client, max_delay=0.05) as batcher:
+            good = batcher.submit("owner", "queue", "good")
+            bad = batcher.submit("owner", "queue", "bad")
+
+        assert client.task_state(good.result()).payload == "good"
+        with raises(MaestroError):
+            bad.result()
+
+    with subtests.test("Unavailable maestro"):
+        transport = CountingTransport(status=503)
+
+        with LaunchBatcher(Client("", transport=transport)) as batcher:
+            futures = [batcher.submit("owner", "queue", str(i)) for i in range(5)]
+
+        for future in futures:
+            with raises(MaestroError):
+                future.result()
+        assert transport.paths == ["/api/task/create/list"]
+
+    with subtests.test("Concurrent requests"):
+        client = Client("", transport=BarrierTransport(parties=2))
+
+        with LaunchBatcher(client, max_batch_size=1, max_in_flight=2) as batcher:
+            futures = [batcher.submit("owner", "queue", str(i)) for i in range(2)]
+
+        assert all(future.result() for future in futures)
+
+    with subtests.test("Closed"):
+        batcher = LaunchBatcher(Client("", transport=CountingTransport()))
+        batcher.close()
+
+        with raises(RuntimeError):
+            batcher.submit("owner", "queue", "payload")
+
+    with subtests.test("Cancelled task is not sent"):
+        transport = CountingTransport()
+        client = Client("", transport=transport)
+
+        with LaunchBatcher(client, max_delay=0.05) as batcher:
+            future = batcher.submit("owner", "queue", "payload")
+            assert future.cancel()
+            time.sleep(0.1)
+
+        assert transport.paths == []
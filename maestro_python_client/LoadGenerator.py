@@ -0,0 +1,348 @@
+import random
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable
+
+from maestro_python_client.Client import Client
+from maestro_python_client.maestro_task_handler.Backoff import Backoff
+
+_SIZE = re.compile(r"^(\d+)([km]?)$")
+_UNITS = {"": 1, "k": 1024, "m": 1024 * 1024}
+
+
+class PayloadSizes:
+    """Distribution of payload sizes, in bytes.
+
+    Parsed from a spec: "1k" for a fixed size, "100-10k" for sizes uniformly
+    distributed between two bounds, "1k:9,100k:1" for sizes picked with the
+    given weights.
+    """
+
+    def __init__(self, spec: str) -> None:
+        self.__sample: Callable[[random.Random], int]
+        spec = spec.strip().lower()
+        if ":" in spec:
+            choices = [choice.split(":") for choice in spec.split(",")]
+            if any(len(choice) != 2 for choice in choices):
+                raise ValueError(f"Invalid payload sizes {spec}")
+            sizes = [_parse_size(size) for size, _ in choices]
+            weights = [_parse_weight(weight) for _, weight in choices]
+            self.maximum = max(sizes)
+            self.__sample = lambda rng: rng.choices(sizes, weights)[0]
+        elif "-" in spec:
+            low, high = (_parse_size(size) for size in spec.split("-", 1))
+            if low > high:
+                raise ValueError(f"Invalid payload sizes {spec}")
+            self.maximum = high
+            self.__sample = lambda rng: rng.randint(low, high)
+        else:
+            size = _parse_size(spec)
+            self.maximum = size
+            self.__sample = lambda _: size
+
+    def sample(self, rng: random.Random) -> int:
+        return self.__sample(rng)
+
+
+def _parse_size(size: str) -> int:
+    match = _SIZE.match(size.strip())
+    if not match:
+        raise ValueError(f"Invalid payload size {size}")
+    return int(match[1]) * _UNITS[match[2]]
+
+
+def _parse_weight(weight: str) -> float:
+    try:
+        value = float(weight)
+    except ValueError:
+        raise ValueError(f"Invalid weight {weight}")
+    if value <= 0:
+        raise ValueError(f"Invalid weight {weight}")
+    return value
+
+
+@dataclass(frozen=True)
+class OperationStats:
+    """Throughput and latencies of one operation, latencies in milliseconds."""
+
+    operations: int = 0
+    errors: int = 0
+    ops_per_second: float = 0.0
+    p50_ms: float = 0.0
+    p95_ms: float = 0.0
+    p99_ms: float = 0.0
+    max_ms: float = 0.0
+    first_error: str | None = None
+
+
+@dataclass(frozen=True)
+class LoadReport:
+    """Results of a LoadGenerator run.
+
+    Attributes:
+        duration: length of the run, in seconds.
+        tasks: number of tasks launched, completed and consumed.
+        operations: stats of each operation: launch, next, complete and
+            consume. Polls of an empty queue are counted apart, as next_empty
+            and consume_empty.
+    """
+
+    duration: float
+    tasks: dict[str, int]
+    operations: dict[str, OperationStats]
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def format(self) -> str:
+        lines = [
+            f"duration={self.duration:.2f}s "
+            + " ".join(f"{name}={count}" for name, count in self.tasks.items())
+        ]
+        for name, stats in self.operations.items():
+            lines.append(
+                f"{name:14} "
+                + " ".join(
+                    f"{k}={v}" for k, v in asdict(stats).items() if k != "first_error"
+                )
+            )
+            if stats.first_error:
+                lines.append(f"{'':14} first_error={stats.first_error}")
+        return "\n".join(lines)
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__latencies: dict[str, list[float]] = {}
+        self.__errors: dict[str, int] = {}
+        self.__first_errors: dict[str, str] = {}
+
+    def observe(self, operation: str, latency: float) -> None:
+        with self.__lock:
+            self.__latencies.setdefault(operation, []).append(latency)
+
+    def error(self, operation: str, error: Exception) -> None:
+        with self.__lock:
+            self.__errors[operation] = self.__errors.get(operation, 0) + 1
+            self.__first_errors.setdefault(
+                operation, f"{type(error).__name__}: {error}"
+            )
+
+    def stats(self, duration: float) -> dict[str, OperationStats]:
+        with self.__lock:
+            operations = sorted({*self.__latencies, *self.__errors})
+            return {
+                operation: self.__stats(
+                    sorted(self.__latencies.get(operation, [])),
+                    self.__errors.get(operation, 0),
+                    self.__first_errors.get(operation),
+                    duration,
+                )
+                for operation in operations
+            }
+
+    @staticmethod
+    def __stats(
+        latencies: list[float], errors: int, first_error: str | None, duration: float
+    ) -> OperationStats:
+        def rank(q: float) -> float:
+            index = min(len(latencies) - 1, int(q / 100 * len(latencies)))
+            return round(latencies[index] * 1000, 3) if latencies else 0.0
+
+        return OperationStats(
+            operations=len(latencies),
+            errors=errors,
+            ops_per_second=round(len(latencies) / duration, 1) if duration else 0.0,
+            p50_ms=rank(50),
+            p95_ms=rank(95),
+            p99_ms=rank(99),
+            max_ms=round(latencies[-1] * 1000, 3) if latencies else 0.0,
+            first_error=first_error,
+        )
+
+
+class LoadGenerator:
+    """Drives load against maestro, to measure what a deployment sustains.
+
+    For duration seconds, producers launch tasks, workers fetch and complete
+    them with next and complete_task, and consumers consume their results.
+    Any of them can be set to 0, e.g. producers only to measure launches.
+
+    Tasks are launched by owner "maestro-bench" in queue, run it against a
+    queue dedicated to the benchmark. Give a CachedClient caching queue to
+    measure the cache.
+
+        report = LoadGenerator(client, producers=4, workers=4).run()
+        print(report.format())
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        queue: str = "maestro-bench",
+        duration: float = 10.0,
+        producers: int = 1,
+        workers: int = 1,
+        consumers: int = 0,
+        batch_size: int = 1,
+        payload_sizes: PayloadSizes | None = None,
+        seed: int | None = None,
+        start_timeout: int = 60,
+    ) -> None:
+        """
+        Args:
+            client: the client sending the requests.
+            queue: the queue the tasks are launched in.
+            duration: length of the run, in seconds.
+            producers: number of threads launching tasks.
+            workers: number of threads fetching and completing tasks.
+            consumers: number of threads consuming results.
+            batch_size: number of tasks launched per request, launch_task is
+                used for 1, launch_task_list above.
+            payload_sizes: distribution of the size of payloads and results,
+                100 bytes by default.
+            seed: seed of the payload sizes and contents, for reproducible
+                runs.
+            start_timeout: start timeout of the tasks, in seconds, tasks
+                left in the queue are dropped after it.
+        """
+        if duration <= 0 or batch_size <= 0:
+            raise ValueError("Duration and batch size must be > 0")
+        if min(producers, workers, consumers) < 0:
+            raise ValueError("Concurrencies must be >= 0")
+
+        self.__client = client
+        self.__queue = queue
+        self.__duration = duration
+        self.__producers = producers
+        self.__workers = workers
+        self.__consumers = consumers
+        self.__batch_size = batch_size
+        self.__payload_sizes = payload_sizes or PayloadSizes("100")
+        self.__seed = seed
+        self.__start_timeout = start_timeout
+
+        rng = random.Random(seed)
+        self.__blob = rng.randbytes(self.__payload_sizes.maximum // 2 + 1).hex()
+        self.__recorder = _Recorder()
+        self.__stopped = threading.Event()
+        self.__lock = threading.Lock()
+        self.__tasks = {"launched": 0, "completed": 0, "consumed": 0}
+
+    def run(self) -> LoadReport:
+        loops = [
+            *(self.__producer for _ in range(self.__producers)),
+            *(self.__worker for _ in range(self.__workers)),
+            *(self.__consumer for _ in range(self.__consumers)),
+        ]
+        threads = [
+            threading.Thread(
+                target=loop,
+                args=(random.Random(None if self.__seed is None else self.__seed + i),),
+                daemon=True,
+            )
+            for i, loop in enumerate(loops)
+        ]
+
+        started_at = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        self.__stopped.wait(self.__duration)
+        self.__stopped.set()
+        for thread in threads:
+            thread.join()
+        duration = time.perf_counter() - started_at
+
+        return LoadReport(
+            round(duration, 3), dict(self.__tasks), self.__recorder.stats(duration)
+        )
+
+    def __producer(self, rng: random.Random) -> None:
+        while not self.__stopped.is_set():
+            tasks = [
+                ("maestro-bench", self.__queue, self.__payload(rng))
+                for _ in range(self.__batch_size)
+            ]
+            if self.__batch_size == 1:
+                launched = self.__call(
+                    "launch",
+                    lambda: self.__client.launch_task(
+                        *tasks[0], start_timeout=self.__start_timeout
+                    ),
+                )
+            else:
+                launched = self.__call(
+                    "launch",
+                    lambda: self.__client.launch_task_list(
+                        tasks, start_timeout=self.__start_timeout
+                    ),
+                )
+            if launched:
+                self.__count("launched", len(tasks))
+
+    def __worker(self, rng: random.Random) -> None:
+        backoff = Backoff(min_delay=0.001, max_delay=0.05)
+        while not self.__stopped.is_set():
+            task = self.__poll("next", lambda: self.__client.next(self.__queue))
+            if task is None:
+                backoff.wait(self.__stopped)
+                continue
+
+            backoff.reset()
+            result = self.__payload(rng)
+            if self.__call(
+                "complete", lambda: self.__client.complete_task(task.task_id, result)
+            ):
+                self.__count("completed", 1)
+
+    def __consumer(self, rng: random.Random) -> None:
+        backoff = Backoff(min_delay=0.001, max_delay=0.05)
+        while not self.__stopped.is_set():
+            task = self.__poll("consume", lambda: self.__client.consume(self.__queue))
+            if task is None:
+                backoff.wait(self.__stopped)
+                continue
+
+            backoff.reset()
+            self.__count("consumed", 1)
+
+    def __poll(self, operation: str, call: Callable):
+        """Calls next or consume, an empty queue is recorded as operation_empty."""
+        started_at = time.perf_counter()
+        try:
+            task = call()
+        except Exception as e:
+            self.__recorder.error(operation, e)
+            return None
+
+        empty = task is None or task.task_id == ""
+        self.__recorder.observe(
+            f"{operation}_empty" if empty else operation,
+            time.perf_counter() - started_at,
+        )
+        return None if empty else task
+
+    def __call(self, operation: str, call: Callable) -> bool:
+        """Returns whether the call succeeded."""
+        started_at = time.perf_counter()
+        try:
+            call()
+        except Exception as e:
+            self.__recorder.error(operation, e)
+            return False
+
+        self.__recorder.observe(operation, time.perf_counter() - started_at)
+        return True
+
+    def __count(self, counter: str, count: int) -> None:
+        with self.__lock:
+            self.__tasks[counter] += count
+
+    def __payload(self, rng: random.Random) -> str:
+        size = self.__payload_sizes.sample(rng)
+        start = rng.randint(0, len(self.__blob) - size)
+        end = start + size
+        return self.__blob[start:end]
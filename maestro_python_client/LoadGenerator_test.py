@@ -0,0 +1,87 @@
+import random
+
+from pytest import raises
+
+from maestro_python_client.Cache.InMemoryCache import InMemoryCache
+from maestro_python_client.CachedClient import CachedClient
+from maestro_python_client.Client import Client
+from maestro_python_client.LoadGenerator import LoadGenerator, PayloadSizes
+from maestro_python_client.Transport.InProcessTransport import InProcessTransport
+
+
+def test_payload_sizes(subtests):
+    rng = random.Random(0)
+
+    with subtests.test("Fixed"):
+        sizes = PayloadSizes("2k")
+
+        assert sizes.maximum == 2048
+        assert sizes.sample(rng) == 2048
+
+    with subtests.test("Uniform"):
+        sizes = PayloadSizes("10-20")
+
+        assert sizes.maximum == 20
+        assert {sizes.sample(rng) for _ in range(200)} == set(range(10, 21))
+
+    with subtests.test("Weighted"):
+        sizes = PayloadSizes("1:9, 1m:1")
+
+        assert sizes.maximum == 1024 * 1024
+        samples = [sizes.sample(rng) for _ in range(1000)]
+        assert set(samples) == {1, 1024 * 1024}
+        assert samples.count(1) > 800
+
+    for spec in ["", "abc", "20-10", "1k:0", "1k:2:3", "1g"]:
+        with subtests.test("Invalid", spec=spec):
+            with raises(ValueError):
+                PayloadSizes(spec)
+
+
+def test_load_generator(subtests):
+    with subtests.test("Launch, run and consume"):
+        client = Client("", transport=InProcessTransport())
+
+        report = LoadGenerator(
+            client, duration=0.3, producers=2, workers=2, consumers=1, seed=1
+        ).run()
+
+        assert report.tasks["launched"] >= report.tasks["completed"] > 0
+        assert report.tasks["completed"] >= report.tasks["consumed"] > 0
+        for operation in ["launch", "next", "complete", "consume"]:
+            assert report.operations[operation].operations > 0
+            assert report.operations[operation].errors == 0
+        assert report.operations["launch"].operations == report.tasks["launched"]
+        assert "launch" in report.format()
+        assert report.to_dict()["operations"]["next"]["p50_ms"] >= 0
+
+    with subtests.test("Batches over a cached queue"):
+        client = CachedClient(
+            "", InMemoryCache(), ["bench"], transport=InProcessTransport()
+        )
+
+        report = LoadGenerator(
+            client,
+            "bench",
+            duration=0.2,
+            workers=0,
+            batch_size=10,
+            payload_sizes=PayloadSizes("1k-2k"),
+        ).run()
+
+        assert report.tasks["launched"] == 10 * report.operations["launch"].operations
+        assert report.operations["launch"].errors == 0
+        assert "next" not in report.operations
+
+    with subtests.test("Errors are counted"):
+        client = CachedClient(
+            "", InMemoryCache(), ["bench"], transport=InProcessTransport()
+        )
+
+        report = LoadGenerator(
+            client, "bench", duration=0.1, workers=0, start_timeout=0
+        ).run()
+
+        assert report.tasks["launched"] == 0
+        assert report.operations["launch"].errors > 0
+        assert "Start timeout" in (report.operations["launch"].first_error or "")
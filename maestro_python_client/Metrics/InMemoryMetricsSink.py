@@ -0,0 +1,138 @@
+import threading
+from bisect import bisect_left
+from typing import Sequence
+
+from maestro_python_client.Metrics.MetricsSink import MetricsSink
+
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+SIZE_BUCKETS = tuple(float(4**i) for i in range(4, 14))
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class Histogram:
+    """Fixed buckets histogram, bucket counts are not cumulative."""
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def percentile(self, q: float) -> float:
+        """Returns the upper bound of the bucket holding the q-th percentile.
+
+        Args:
+            q: the percentile, between 0 and 100.
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = q / 100 * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+
+        return float("inf")
+
+
+class InMemoryMetricsSink(MetricsSink):
+    """Keeps every metric in memory.
+
+    Histograms use LATENCY_BUCKETS, or SIZE_BUCKETS for metrics whose name ends
+    with _bytes, unless buckets are given for their name.
+    """
+
+    def __init__(self, buckets: dict[str, Sequence[float]] | None = None) -> None:
+        self.__buckets = dict(buckets or {})
+        self.__lock = threading.Lock()
+        self.__counters: dict[tuple[str, Labels], float] = {}
+        self.__gauges: dict[tuple[str, Labels], float] = {}
+        self.__histograms: dict[tuple[str, Labels], Histogram] = {}
+
+    def increment(
+        self, name: str, value: float = 1, labels: dict[str, str] | None = None
+    ) -> None:
+        key = (name, self.__labels(labels))
+        with self.__lock:
+            self.__counters[key] = self.__counters.get(key, 0) + value
+
+    def observe(
+        self, name: str, value: float, labels: dict[str, str] | None = None
+    ) -> None:
+        key = (name, self.__labels(labels))
+        with self.__lock:
+            histogram = self.__histograms.get(key)
+            if histogram is None:
+                histogram = self.__histograms[key] = Histogram(self.__bounds(name))
+            histogram.observe(value)
+
+    def set_gauge(
+        self, name: str, value: float, labels: dict[str, str] | None = None
+    ) -> None:
+        key = (name, self.__labels(labels))
+        with self.__lock:
+            self.__gauges[key] = value
+
+    def counter(self, name: str, labels: dict[str, str] | None = None) -> float:
+        with self.__lock:
+            return self.__counters.get((name, self.__labels(labels)), 0)
+
+    def gauge(self, name: str, labels: dict[str, str] | None = None) -> float:
+        with self.__lock:
+            return self.__gauges.get((name, self.__labels(labels)), 0)
+
+    def histogram(
+        self, name: str, labels: dict[str, str] | None = None
+    ) -> Histogram | None:
+        with self.__lock:
+            return self.__histograms.get((name, self.__labels(labels)))
+
+    def snapshot(
+        self,
+    ) -> tuple[
+        dict[tuple[str, Labels], float],
+        dict[tuple[str, Labels], float],
+        dict[tuple[str, Labels], Histogram],
+    ]:
+        """Returns copies of the counters, gauges and histograms."""
+        with self.__lock:
+            histograms = {}
+            for key, histogram in self.__histograms.items():
+                copy = Histogram(histogram.bounds)
+                copy.counts = list(histogram.counts)
+                copy.sum, copy.count = histogram.sum, histogram.count
+                histograms[key] = copy
+
+            return dict(self.__counters), dict(self.__gauges), histograms
+
+    def __bounds(self, name: str) -> Sequence[float]:
+        if name in self.__buckets:
+            return self.__buckets[name]
+        return SIZE_BUCKETS if name.endswith("_bytes") else LATENCY_BUCKETS
+
+    @staticmethod
+    def __labels(labels: dict[str, str] | None) -> Labels:
+        return tuple(sorted(labels.items())) if labels else ()
@@ -0,0 +1,28 @@
+from abc import ABC, abstractmethod
+
+
+class MetricsSink(ABC):
+    """Receives the measures made by the instrumented parts of the client.
+
+    Labels are small string mappings, e.g. {"queue": "my-queue"}. Metric names
+    follow the Prometheus conventions: counters end with _total and
+    histograms end with their unit (_seconds, _bytes).
+    """
+
+    @abstractmethod
+    def increment(
+        self, name: str, value: float = 1, labels: dict[str, str] | None = None
+    ) -> None:
+        ...
+
+    @abstractmethod
+    def observe(
+        self, name: str, value: float, labels: dict[str, str] | None = None
+    ) -> None:
+        ...
+
+    @abstractmethod
+    def set_gauge(
+        self, name: str, value: float, labels: dict[str, str] | None = None
+    ) -> None:
+        ...
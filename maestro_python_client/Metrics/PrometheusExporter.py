@@ -0,0 +1,54 @@
+from maestro_python_client.Metrics.InMemoryMetricsSink import (
+    InMemoryMetricsSink,
+    Labels,
+)
+
+
+def to_prometheus_text(sink: InMemoryMetricsSink) -> str:
+    """Renders the metrics of a sink in the Prometheus text exposition format."""
+    counters, gauges, histograms = sink.snapshot()
+    lines: list[str] = []
+
+    _render_samples(lines, "counter", counters)
+    _render_samples(lines, "gauge", gauges)
+
+    typed = set()
+    for (name, labels), histogram in sorted(histograms.items()):
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} histogram")
+
+        cumulative = 0
+        for bound, count in zip(histogram.bounds, histogram.counts):
+            cumulative += count
+            le = labels + (("le", repr(float(bound))),)
+            lines.append(f"{name}_bucket{_format_labels(le)} {cumulative}")
+        le = labels + (("le", "+Inf"),)
+        lines.append(f"{name}_bucket{_format_labels(le)} {histogram.count}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum}")
+        lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def _render_samples(
+    lines: list[str], metric_type: str, samples: dict[tuple[str, Labels], float]
+) -> None:
+    typed = set()
+    for (name, labels), value in sorted(samples.items()):
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} {metric_type}")
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+
+    formatted = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+    return f"{{{formatted}}}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
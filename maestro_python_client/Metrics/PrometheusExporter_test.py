@@ -0,0 +1,45 @@
+from maestro_python_client.Metrics.InMemoryMetricsSink import InMemoryMetricsSink
+from maestro_python_client.Metrics.PrometheusExporter import to_prometheus_text
+
+
+def test_to_prometheus_text(subtests):
+    with subtests.test("empty"):
+        assert to_prometheus_text(InMemoryMetricsSink()) == ""
+
+    with subtests.test("counters and gauges"):
+        sink = InMemoryMetricsSink()
+        sink.increment("requests_total", labels={"path": 'a"b'})
+        sink.increment("requests_total", 2, labels={"path": 'a"b'})
+        sink.set_gauge("in_flight", 3)
+
+        text = to_prometheus_text(sink)
+
+        assert "# TYPE requests_total counter\n" in text
+        assert 'requests_total{path="a\\"b"} 3' in text
+        assert "# TYPE in_flight gauge\nin_flight 3\n" in text
+
+    with subtests.test("histograms"):
+        sink = InMemoryMetricsSink(buckets={"latency_seconds": [0.1, 1]})
+        sink.observe("latency_seconds", 0.05, {"op": "get"})
+        sink.observe("latency_seconds", 0.5, {"op": "get"})
+        sink.observe("latency_seconds", 5, {"op": "get"})
+
+        text = to_prometheus_text(sink)
+
+        assert 'latency_seconds_bucket{op="get",le="0.1"} 1\n' in text
+        assert 'latency_seconds_bucket{op="get",le="1.0"} 2\n' in text
+        assert 'latency_seconds_bucket{op="get",le="+Inf"} 3\n' in text
+        assert 'latency_seconds_sum{op="get"} 5.55\n' in text
+        assert 'latency_seconds_count{op="get"} 3\n' in text
+
+
+def test_histogram_percentile():
+    sink = InMemoryMetricsSink(buckets={"latency_seconds": [1, 2, 3]})
+    for value in [0.5] * 50 + [1.5] * 45 + [2.5] * 5:
+        sink.observe("latency_seconds", value)
+
+    histogram = sink.histogram("latency_seconds")
+    assert histogram
+    assert histogram.percentile(50) == 1
+    assert histogram.percentile(95) == 2
+    assert histogram.percentile(99) == 3
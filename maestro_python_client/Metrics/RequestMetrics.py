@@ -0,0 +1,60 @@
+import json
+import threading
+import time
+from typing import Any
+
+from maestro_python_client.Metrics.MetricsSink import MetricsSink
+from maestro_python_client.Transport.Transport import Response
+
+
+class RequestMetrics:
+    """Records the requests a client sends to maestro, labelled by endpoint.
+
+    Shared by Client and AsyncClient: start is called before sending a
+    request, and finish with its response, or None if it could not be sent.
+    Records the latency, status code, request and response sizes, and the
+    number of requests in flight.
+    """
+
+    def __init__(self, sink: MetricsSink) -> None:
+        self.__sink = sink
+        self.__lock = threading.Lock()
+        self.__in_flight: dict[str, int] = {}
+
+    def start(self, endpoint: str, payload: dict[str, Any] | None) -> float:
+        """Returns the start time of the request, to give to finish."""
+        if payload is not None:
+            self.__sink.observe(
+                "maestro_client_request_bytes",
+                len(json.dumps(payload)),
+                {"endpoint": endpoint},
+            )
+        self.__add_in_flight(endpoint, 1)
+        return time.perf_counter()
+
+    def finish(
+        self, endpoint: str, started_at: float, response: Response | None
+    ) -> None:
+        labels = {"endpoint": endpoint}
+        self.__sink.observe(
+            "maestro_client_request_seconds", time.perf_counter() - started_at, labels
+        )
+        self.__add_in_flight(endpoint, -1)
+
+        status = "error" if response is None else str(response.status_code)
+        self.__sink.increment(
+            "maestro_client_responses_total", labels={**labels, "status": status}
+        )
+        if response is not None:
+            self.__sink.observe(
+                "maestro_client_response_bytes", len(response.content), labels
+            )
+
+    def __add_in_flight(self, endpoint: str, delta: int) -> None:
+        with self.__lock:
+            in_flight = self.__in_flight[endpoint] = (
+                self.__in_flight.get(endpoint, 0) + delta
+            )
+            self.__sink.set_gauge(
+                "maestro_client_requests_in_flight", in_flight, {"endpoint": endpoint}
+            )
@@ -0,0 +1,50 @@
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Hashable
+
+
+@dataclass(frozen=True)
+class Percentiles:
+    count: int = 0
+    p50: float = 0.0
+    p95: float = 0.0
+    p99: float = 0.0
+
+
+class RollingPercentiles:
+    """Exact percentiles over the last window values observed for each key."""
+
+    def __init__(self, window: int = 1000) -> None:
+        self.__window = window
+        self.__lock = threading.Lock()
+        self.__values: dict[Hashable, deque[float]] = {}
+
+    def observe(self, key: Hashable, value: float) -> None:
+        with self.__lock:
+            values = self.__values.get(key)
+            if values is None:
+                values = self.__values[key] = deque(maxlen=self.__window)
+            values.append(value)
+
+    def keys(self) -> list[Hashable]:
+        with self.__lock:
+            return list(self.__values)
+
+    def summary(self, key: Hashable) -> Percentiles:
+        with self.__lock:
+            values = sorted(self.__values.get(key, ()))
+
+        if not values:
+            return Percentiles()
+
+        return Percentiles(
+            count=len(values),
+            p50=self.__rank(values, 50),
+            p95=self.__rank(values, 95),
+            p99=self.__rank(values, 99),
+        )
+
+    @staticmethod
+    def __rank(values: list[float], q: float) -> float:
+        return values[min(len(values) - 1, int(q / 100 * len(values)))]
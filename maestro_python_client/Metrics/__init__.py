@@ -0,0 +1,6 @@
+from maestro_python_client.Metrics.InMemoryMetricsSink import (
+    Histogram,
+    InMemoryMetricsSink,
+)
+from maestro_python_client.Metrics.MetricsSink import MetricsSink
+from maestro_python_client.Metrics.PrometheusExporter import to_prometheus_text
@@ -0,0 +1,143 @@
+import math
+import threading
+import time
+from typing import Callable, Iterable
+
+from maestro_python_client.Client import (
+    Client,
+    QueueOwnerStatsMatrix,
+    QueueStatsCounts,
+)
+
+
+class _Entry:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.stats: QueueStatsCounts | None = None
+        self.fetched_at = 0.0
+
+
+class QueueStatsCache:
+    """Queue stats counts shared by the callers of a process.
+
+    The counts of a queue are fetched at most once every ttl seconds. Callers
+    asking for them while they are fetched wait for that fetch instead of
+    sending their own request.
+
+        stats = QueueStatsCache(client, ttl=5)
+        stats.get("queue").pending
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        ttl: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            client: the client used to fetch the stats.
+            ttl: time the counts are kept for, in seconds.
+            clock: returns the current time in seconds, for tests.
+        """
+        if ttl < 0:
+            raise ValueError("TTL must be >= 0")
+
+        self.__client = client
+        self.__ttl = ttl
+        self.__clock = clock
+        self.__lock = threading.Lock()
+        self.__entries: dict[str, _Entry] = {}
+
+    def get(self, queue: str) -> QueueStatsCounts:
+        """Returns the counts of a queue, at most ttl seconds old.
+
+        Raises:
+            ValueError: Error in communication with maestro
+        """
+        with self.__lock:
+            entry = self.__entries.setdefault(queue, _Entry())
+
+        with entry.lock:
+            if entry.stats is None or self.__clock() - entry.fetched_at >= self.__ttl:
+                entry.stats = self.__client.get_queue_stats_counts(queue)
+                entry.fetched_at = self.__clock()
+            return entry.stats
+
+    def invalidate(self, queue: str | None = None) -> None:
+        """Drops the counts of a queue, of every queue if None."""
+        with self.__lock:
+            if queue is None:
+                self.__entries.clear()
+            else:
+                self.__entries.pop(queue, None)
+
+
+class QueueOwnerStatsCache:
+    """QueueOwnerStatsMatrix of queues and owners, refreshed incrementally.
+
+    Each cell of the matrix is kept for ttl seconds, get only fetches the
+    stale ones, see Client.refresh_queue_owner_stats. Callers asking for the
+    matrix while it is refreshed wait for that refresh.
+
+        stats = QueueOwnerStatsCache(client, queues, owners, ttl=30)
+        stats.get().get("queue", "owner").running
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        queues: Iterable[str],
+        owners: Iterable[str],
+        ttl: float = 30.0,
+        max_concurrency: int = 8,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            client: the client used to fetch the stats.
+            queues: the queues of the matrix.
+            owners: the owners of the matrix.
+            ttl: time a cell is kept for, in seconds.
+            max_concurrency: maximum number of requests sent concurrently.
+            clock: returns the current time in seconds, for tests.
+        """
+        if ttl < 0:
+            raise ValueError("TTL must be >= 0")
+
+        self.__client = client
+        self.__matrix = QueueOwnerStatsMatrix(queues, owners)
+        self.__ttl = ttl
+        self.__max_concurrency = max_concurrency
+        self.__clock = clock
+        self.__lock = threading.Lock()
+        self.__fetched_at: dict[tuple[str, str], float] = {}
+
+    def get(self) -> QueueOwnerStatsMatrix:
+        """Returns a copy of the matrix, each cell at most ttl seconds old.
+
+        Raises:
+            ValueError: Error in communication with maestro
+        """
+        with self.__lock:
+            now = self.__clock()
+            stale = [
+                (queue, owner)
+                for queue in self.__matrix.queues
+                for owner in self.__matrix.owners
+                if now - self.__fetched_at.get((queue, owner), -math.inf) >= self.__ttl
+            ]
+            if stale:
+                self.__client.refresh_queue_owner_stats(
+                    self.__matrix, stale, self.__max_concurrency
+                )
+                self.__fetched_at.update((cell, now) for cell in stale)
+
+            return self.__matrix.copy()
+
+    def invalidate(self, queue: str | None = None, owner: str | None = None) -> None:
+        """Marks cells as stale, those of queue and owner when given."""
+        with self.__lock:
+            for cell in list(self.__fetched_at):
+                if queue in (None, cell[0]) and owner in (None, cell[1]):
+                    del self.__fetched_at[cell]
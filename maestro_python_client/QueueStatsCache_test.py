@@ -0,0 +1,90 @@
+import threading
+import time
+
+from maestro_python_client.Client import Client, QueueOwnerStats, QueueStatsCounts
+from maestro_python_client.QueueStatsCache import (
+    QueueOwnerStatsCache,
+    QueueStatsCache,
+)
+from maestro_python_client.Transport.InProcessTransport import InProcessTransport
+
+
+class SlowClient(Client):
+    def __init__(self) -> None:
+        super().__init__("", transport=InProcessTransport())
+        self.fetches = 0
+
+    def get_queue_stats_counts(self, queue: str) -> QueueStatsCounts:
+        self.fetches += 1
+        time.sleep(0.05)
+        return super().get_queue_stats_counts(queue)
+
+    def get_queue_owner_stats(self, queue: str, owner: str) -> QueueOwnerStats:
+        self.fetches += 1
+        return super().get_queue_owner_stats(queue, owner)
+
+
+def test_queue_stats_cache(subtests):
+    with subtests.test("Concurrent callers share one fetch"):
+        client = SlowClient()
+        client.launch_task_list([("owner", "queue", "x")] * 3)
+        cache = QueueStatsCache(client)
+        results = []
+
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get("queue")))
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert client.fetches == 1
+        assert [stats.pending for stats in results] == [3] * 10
+
+    with subtests.test("Counts expire after ttl"):
+        client = SlowClient()
+        now = [0.0]
+        cache = QueueStatsCache(client, ttl=5, clock=lambda: now[0])
+
+        assert cache.get("queue").pending == 0
+        client.launch_task("owner", "queue", "x")
+        now[0] = 4.9
+        assert cache.get("queue").pending == 0
+        now[0] = 5.0
+        assert cache.get("queue").pending == 1
+        assert client.fetches == 2
+
+        client.launch_task("owner", "queue", "x")
+        cache.invalidate("queue")
+        assert cache.get("queue").pending == 2
+        assert cache.get("other").pending == 0
+        assert client.fetches == 4
+
+
+def test_queue_owner_stats_cache():
+    client = SlowClient()
+    client.launch_task("a", "q1", "x")
+    now = [0.0]
+    cache = QueueOwnerStatsCache(
+        client, ["q1", "q2"], ["a", "b"], ttl=10, clock=lambda: now[0]
+    )
+
+    matrix = cache.get()
+    assert matrix.get("q1", "a").pending == 1
+    assert client.fetches == 4
+
+    client.launch_task("b", "q2", "x")
+    now[0] = 5
+    assert cache.get().get("q2", "b").pending == 0
+    assert client.fetches == 4
+
+    cache.invalidate(queue="q2", owner="b")
+    assert cache.get().get("q2", "b").pending == 1
+    assert client.fetches == 5
+
+    now[0] = 10
+    cache.get()
+    assert client.fetches == 8
+    assert matrix.get("q2", "b").pending == 0
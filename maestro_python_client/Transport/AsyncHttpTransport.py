@@ -0,0 +1,57 @@
+import json
+from typing import Any
+from urllib.parse import urljoin
+
+from maestro_python_client.Transport.Transport import AsyncTransport, Response
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+
+class AsyncHttpTransport(AsyncTransport):
+    """Sends requests to maestro over HTTP with aiohttp.
+
+    Requires the aiohttp package. The session is created on first use, in the
+    running event loop, and must be released with close().
+    """
+
+    def __init__(self, maestro_endpoint: str, max_connections: int = 100) -> None:
+        if aiohttp is None:
+            raise ImportError("AsyncHttpTransport requires the aiohttp package")
+
+        self.__maestro_endpoint = maestro_endpoint
+        self.__max_connections = max_connections
+        self.__session: Any = None
+
+    async def request(
+        self, method: str, path: str, payload: dict[str, Any] | None = None
+    ) -> Response:
+        if self.__session is None:
+            self.__session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.__max_connections)
+            )
+
+        url = urljoin(self.__maestro_endpoint, path)
+        async with self.__session.request(method, url, json=payload) as resp:
+            content = await resp.read()
+            return HttpResponse(resp.status, content)
+
+    async def close(self) -> None:
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+
+class HttpResponse:
+    def __init__(self, status_code: int, content: bytes) -> None:
+        self.status_code = status_code
+        self.__content = content
+
+    @property
+    def content(self) -> bytes:
+        return self.__content
+
+    def json(self) -> Any:
+        return json.loads(self.__content)
@@ -0,0 +1,27 @@
+from typing import Any
+from urllib.parse import urljoin
+
+import requests
+
+from maestro_python_client.Transport.Transport import Response, Transport
+
+
+class HttpTransport(Transport):
+    """Sends requests to maestro over HTTP with requests.
+
+    Pass a requests.Session to reuse connections between requests.
+    """
+
+    def __init__(
+        self, maestro_endpoint: str, session: requests.Session | None = None
+    ) -> None:
+        self.__maestro_endpoint = maestro_endpoint
+        self.__http: Any = session if session is not None else requests
+
+    def request(
+        self, method: str, path: str, payload: dict[str, Any] | None = None
+    ) -> Response:
+        url = urljoin(self.__maestro_endpoint, path)
+        if method == "GET":
+            return self.__http.get(url)
+        return self.__http.post(url, json=payload)
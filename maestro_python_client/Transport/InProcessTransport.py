@@ -0,0 +1,53 @@
+import asyncio
+from typing import Any
+
+from maestro_python_client.Emulator.MaestroEmulator import MaestroEmulator
+from maestro_python_client.Transport.Transport import (
+    AsyncTransport,
+    JsonResponse,
+    Response,
+    Transport,
+)
+
+
+class InProcessTransport(Transport):
+    """Sends requests to a MaestroEmulator living in the same process.
+
+    No socket is opened and bodies are never serialized, which makes it suited
+    to unit tests, load tests and single process pipelines.
+    """
+
+    def __init__(self, emulator: MaestroEmulator | None = None) -> None:
+        self.__emulator = emulator or MaestroEmulator()
+
+    @property
+    def emulator(self) -> MaestroEmulator:
+        return self.__emulator
+
+    def request(
+        self, method: str, path: str, payload: dict[str, Any] | None = None
+    ) -> Response:
+        return JsonResponse(*self.__emulator.handle(method, path, payload))
+
+
+class AsyncInProcessTransport(AsyncTransport):
+    """Async flavor of InProcessTransport.
+
+    Requests run in the default executor so the emulator latency, if any, does
+    not block the event loop.
+    """
+
+    def __init__(self, emulator: MaestroEmulator | None = None) -> None:
+        self.__emulator = emulator or MaestroEmulator()
+
+    @property
+    def emulator(self) -> MaestroEmulator:
+        return self.__emulator
+
+    async def request(
+        self, method: str, path: str, payload: dict[str, Any] | None = None
+    ) -> Response:
+        status_code, body = await asyncio.to_thread(
+            self.__emulator.handle, method, path, payload
+        )
+        return JsonResponse(status_code, body)
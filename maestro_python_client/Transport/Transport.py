@@ -0,0 +1,60 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Protocol
+
+
+class Response(Protocol):
+    """What transports return, a subset of requests.Response."""
+
+    status_code: int
+
+    @property
+    def content(self) -> bytes:
+        ...
+
+    def json(self) -> Any:
+        ...
+
+
+class JsonResponse:
+    """Response holding an already decoded body.
+
+    The body is only encoded when content is read.
+    """
+
+    def __init__(self, status_code: int, body: Any) -> None:
+        self.status_code = status_code
+        self.__body = body
+
+    @property
+    def content(self) -> bytes:
+        return json.dumps(self.__body).encode("utf-8")
+
+    def json(self) -> Any:
+        return self.__body
+
+
+class Transport(ABC):
+    @abstractmethod
+    def request(
+        self, method: str, path: str, payload: dict[str, Any] | None = None
+    ) -> Response:
+        """Sends a request to maestro.
+
+        Args:
+            method: "GET" or "POST".
+            path: the path of the endpoint, e.g. /api/task/create.
+            payload: the JSON body of the request.
+        """
+        ...
+
+
+class AsyncTransport(ABC):
+    @abstractmethod
+    async def request(
+        self, method: str, path: str, payload: dict[str, Any] | None = None
+    ) -> Response:
+        ...
+
+    async def close(self) -> None:
+        """Releases the resources of the transport, e.g. its connections."""
@@ -0,0 +1,74 @@
+import asyncio
+
+from pytest import importorskip, raises
+
+from maestro_python_client.Cache.InMemoryCache import InMemoryCache
+from maestro_python_client.CachedClient import CachedClient
+from maestro_python_client.Client import Client, MaestroError
+from maestro_python_client.Emulator.EmulatorServer import EmulatorServer
+from maestro_python_client.Transport.InProcessTransport import (
+    AsyncInProcessTransport,
+    InProcessTransport,
+)
+from test_utils.String import unique_str
+
+
+def test_in_process_transport(subtests):
+    with subtests.test("Client"):
+        client = Client("", transport=InProcessTransport())
+        queue = unique_str()
+
+        task_id = client.launch_task("owner", queue, "payload")
+        task = client.next(queue)
+        assert task and task.task_id == task_id
+        client.complete_task(task_id, "result")
+        assert client.task_state(task_id).result == "result"
+
+    with subtests.test("CachedClient"):
+        cache = InMemoryCache()
+        client = CachedClient("", cache, ["cached"], transport=InProcessTransport())
+
+        task_id = client.launch_task("owner", "cached", "payload", start_timeout=10)
+        task = client.next("cached")
+        assert task and task.payload == "payload"
+        client.complete_task(task_id, "result")
+        assert client.task_state(task_id).result == "result"
+
+    with subtests.test("Errors"):
+        client = Client("", transport=InProcessTransport())
+        with raises(FileNotFoundError):
+            client.task_state(unique_str())
+        with raises(MaestroError):
+            client.fail_task(client.launch_task("owner", unique_str(), "payload"))
+
+
+def test_async_transports(subtests):
+    async def create_and_get(transport):
+        resp = await transport.request(
+            "POST",
+            "/api/task/create",
+            {"owner": "owner", "queue": "queue", "payload": "payload"},
+        )
+        task_id = resp.json()["task_id"]
+        resp = await transport.request("POST", "/api/task/get", {"task_id": task_id})
+        return resp.status_code, resp.json()["task"]["payload"]
+
+    with subtests.test("in process"):
+        transport = AsyncInProcessTransport()
+        assert asyncio.run(create_and_get(transport)) == (200, "payload")
+
+    with subtests.test("http"):
+        importorskip("aiohttp")
+        from maestro_python_client.Transport.AsyncHttpTransport import (
+            AsyncHttpTransport,
+        )
+
+        async def run(url):
+            transport = AsyncHttpTransport(url)
+            try:
+                return await create_and_get(transport)
+            finally:
+                await transport.close()
+
+        with EmulatorServer() as server:
+            assert asyncio.run(run(server.url)) == (200, "payload")
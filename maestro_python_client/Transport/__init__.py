@@ -0,0 +1,11 @@
+from maestro_python_client.Transport.HttpTransport import HttpTransport
+from maestro_python_client.Transport.InProcessTransport import (
+    AsyncInProcessTransport,
+    InProcessTransport,
+)
+from maestro_python_client.Transport.Transport import (
+    AsyncTransport,
+    JsonResponse,
+    Response,
+    Transport,
+)
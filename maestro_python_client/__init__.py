@@ -2,16 +2,59 @@
 Maestro client implemented in python
 """
 
+from maestro_python_client.AsyncClient import AsyncClient
 from maestro_python_client.Cache.Cache import Cache
+from maestro_python_client.Cache.CacheAccounting import BudgetPolicy, QueueBudget
+from maestro_python_client.Cache.InstrumentedCache import InstrumentedCache
 from maestro_python_client.Cache.RedisCache import RedisCache
 from maestro_python_client.CachedClient import CachedClient
-from maestro_python_client.Client import Client, Task, TaskHistory
+from maestro_python_client.CallbackReceiver import CallbackReceiver
+from maestro_python_client.Client import (
+    Client,
+    LaunchTaskListError,
+    MaestroError,
+    PurgeOwnersHistoryError,
+    QueueOwnerStatsMatrix,
+    QueueStatsCounts,
+    Task,
+    TaskHistory,
+    TaskIdView,
+)
+from maestro_python_client.LaunchBatcher import LaunchBatcher
+from maestro_python_client.Metrics.InMemoryMetricsSink import InMemoryMetricsSink
+from maestro_python_client.Metrics.MetricsSink import MetricsSink
+from maestro_python_client.QueueStatsCache import (
+    QueueOwnerStatsCache,
+    QueueStatsCache,
+)
+from maestro_python_client.Transport.HttpTransport import HttpTransport
+from maestro_python_client.Transport.InProcessTransport import InProcessTransport
+from maestro_python_client.Transport.Transport import Transport
 
 __all__ = [
+    "AsyncClient",
+    "BudgetPolicy",
     "Cache",
     "CachedClient",
+    "CallbackReceiver",
     "Client",
+    "HttpTransport",
+    "InProcessTransport",
+    "InMemoryMetricsSink",
+    "InstrumentedCache",
+    "LaunchBatcher",
+    "LaunchTaskListError",
+    "MaestroError",
+    "MetricsSink",
+    "PurgeOwnersHistoryError",
+    "QueueBudget",
+    "QueueOwnerStatsCache",
+    "QueueOwnerStatsMatrix",
+    "QueueStatsCache",
+    "QueueStatsCounts",
     "RedisCache",
     "Task",
     "TaskHistory",
+    "TaskIdView",
+    "Transport",
 ]
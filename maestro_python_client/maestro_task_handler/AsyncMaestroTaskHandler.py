@@ -0,0 +1,208 @@
+import abc
+import asyncio
+import time
+from logging import Logger
+from typing import Callable
+
+from maestro_python_client.AsyncClient import AsyncClient
+from maestro_python_client.Client import Task
+from maestro_python_client.maestro_task_handler.Backoff import Backoff
+from maestro_python_client.maestro_task_handler.Deadline import (
+    Deadline,
+    DeadlineExceeded,
+    deadline_scope,
+)
+from maestro_python_client.maestro_task_handler.TaskTracer import TaskSpan, TaskTracer
+
+
+class AsyncTaskWorker(abc.ABC):
+    @abc.abstractmethod
+    async def on_task(self, task_payload: str) -> str:
+        pass
+
+
+class AsyncMaestroTaskHandler:
+    """Runs the tasks of a queue as coroutines, on one event loop.
+
+    fetch_concurrency coroutines call next, each task fetched runs in its own
+    asyncio task, with at most max_concurrency tasks running at once. Fetchers
+    finding the queue empty back off, see Backoff, and tasks are traced as by
+    MaestroTaskHandler, the "cache" phase excepted.
+
+    Tasks get their Deadline with current_deadline(). With min_budget, tasks
+    left with less time than that are failed without being run. With
+    enforce_deadline, tasks are cancelled once their deadline expires.
+
+        handler = AsyncMaestroTaskHandler(client, "queue", worker, logger)
+        await handler.run()  # until handler.stop() is called
+    """
+
+    def __init__(
+        self,
+        client: AsyncClient,
+        queue_name: str,
+        worker: AsyncTaskWorker,
+        logger: Logger,
+        max_concurrency: int = 100,
+        fetch_concurrency: int = 4,
+        tracer: TaskTracer | None = None,
+        backoff: Callable[[], Backoff] = Backoff,
+        min_budget: float | None = None,
+        enforce_deadline: bool = False,
+    ) -> None:
+        assert isinstance(worker, AsyncTaskWorker)
+        if max_concurrency <= 0 or fetch_concurrency <= 0:
+            raise ValueError("Concurrencies must be > 0")
+
+        self.__client = client
+        self.__queue = queue_name
+        self.__worker = worker
+        self.__logger = logger
+        self.__max_concurrency = max_concurrency
+        self.__fetch_concurrency = fetch_concurrency
+        self.__tracer = tracer
+        self.__backoff = backoff
+        self.__min_budget = min_budget
+        self.__enforce_deadline = enforce_deadline
+
+        self.__stop_requested = False
+        self.__stopped: asyncio.Event | None = None
+        self.__handled = 0
+
+    @property
+    def handled(self) -> int:
+        """Number of tasks run, successfully or not."""
+        return self.__handled
+
+    def stop(self) -> None:
+        """Stops fetching tasks, run returns once running tasks are done.
+
+        Must be called from the event loop running the handler. Called before
+        run, run returns at once.
+        """
+        self.__stop_requested = True
+        if self.__stopped:
+            self.__stopped.set()
+
+    async def run(self) -> None:
+        self.__stopped = asyncio.Event()
+        if self.__stop_requested:
+            self.__stopped.set()
+        slots = asyncio.Semaphore(self.__max_concurrency)
+        running: set[asyncio.Task] = set()
+
+        await asyncio.gather(
+            *(self.__fetch(slots, running) for _ in range(self.__fetch_concurrency))
+        )
+        await asyncio.gather(*running)
+
+    async def __fetch(self, slots: asyncio.Semaphore, running: set[asyncio.Task]):
+        assert self.__stopped is not None
+        backoff = self.__backoff()
+        while not self.__stopped.is_set():
+            await slots.acquire()
+            if self.__stopped.is_set():
+                slots.release()
+                return
+
+            fetch_started_at = time.time_ns()
+            try:
+                task = await self.__client.next(self.__queue)
+            except Exception as e:
+                task = None
+                self.__log_error(f"Could not manage task for queue {self.__queue}", e)
+
+            if task is None or task.task_id == "":
+                slots.release()
+                await self.__wait(backoff.next_delay())
+                continue
+
+            backoff.reset()
+            handling = asyncio.create_task(self.__handle(task, fetch_started_at))
+            running.add(handling)
+            handling.add_done_callback(running.discard)
+            handling.add_done_callback(lambda _: slots.release())
+
+    async def __wait(self, delay: float) -> None:
+        assert self.__stopped is not None
+        try:
+            await asyncio.wait_for(self.__stopped.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+
+    async def __handle(self, task: Task, fetch_started_at: int) -> None:
+        span = TaskSpan.for_task(task, fetch_started_at)
+        deadline = Deadline.for_task(task)
+        result = ""
+
+        try:
+            if (
+                self.__min_budget is not None
+                and deadline.remaining() < self.__min_budget
+            ):
+                self.__logger.warning(
+                    {
+                        "infrastructure": "task_handler",
+                        "queue": self.__queue,
+                        "task_id": task.task_id,
+                        "msg": f"Skipping task {task.task_id} from queue "
+                        f"{self.__queue}, {deadline.remaining():.3f}s left to run it",
+                    },
+                )
+            else:
+                with span.phase("work"):
+                    result, span.success = await self.__execute_task(task, deadline)
+
+            with span.phase("report"):
+                if span.success:
+                    await self.__client.complete_task(task.task_id, result)
+                else:
+                    await self.__client.fail_task(task.task_id)
+        except Exception as e:
+            self.__log_error(f"Could not report task {task.task_id}", e)
+        finally:
+            self.__handled += 1
+
+        if self.__tracer:
+            self.__tracer.record(span)
+
+    async def __execute_task(self, task: Task, deadline: Deadline) -> tuple[str, bool]:
+        try:
+            with deadline_scope(deadline):
+                if not self.__enforce_deadline:
+                    return await self.__worker.on_task(task.payload), True
+
+                try:
+                    return (
+                        await asyncio.wait_for(
+                            self.__worker.on_task(task.payload),
+                            max(0.0, deadline.remaining()),
+                        ),
+                        True,
+                    )
+                except asyncio.TimeoutError:
+                    deadline.cancelled.set()
+                    raise DeadlineExceeded(
+                        "Deadline expired while the task was running"
+                    )
+
+        except Exception as e:
+            self.__logger.exception(
+                {
+                    "infrastructure": "task_handler",
+                    "queue": task.task_queue,
+                    "task_id": task.task_id,
+                    "msg": f"Cannot run task {task.task_id} from queue {task.task_queue}",
+                    "err": str(e),
+                },
+            )
+            return "", False
+
+    def __log_error(self, msg: str, e: Exception) -> None:
+        self.__logger.exception(
+            {
+                "infrastructure": "task_handler",
+                "msg": msg,
+                "err": str(e),
+            },
+        )
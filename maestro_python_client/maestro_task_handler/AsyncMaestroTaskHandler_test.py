@@ -0,0 +1,110 @@
+import asyncio
+import logging
+
+from maestro_python_client.AsyncClient import AsyncClient
+from maestro_python_client.Client import Client
+from maestro_python_client.Emulator.MaestroEmulator import MaestroEmulator
+from maestro_python_client.maestro_task_handler.AsyncMaestroTaskHandler import (
+    AsyncMaestroTaskHandler,
+    AsyncTaskWorker,
+)
+from maestro_python_client.maestro_task_handler.Deadline import current_deadline
+from maestro_python_client.maestro_task_handler.TaskTracer import TaskTracer
+from maestro_python_client.Transport.InProcessTransport import (
+    AsyncInProcessTransport,
+    InProcessTransport,
+)
+
+logger = logging.getLogger("test")
+
+
+class SleepingWorker(AsyncTaskWorker):
+    def __init__(self, delay: float) -> None:
+        self.__delay = delay
+        self.running = 0
+        self.max_running = 0
+
+    async def on_task(self, task_payload: str) -> str:
+        if task_payload == "bad":
+            raise ValueError("bad payload")
+
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            deadline = current_deadline()
+            assert deadline and deadline.remaining() > 0
+            await asyncio.sleep(self.__delay)
+        finally:
+            self.running -= 1
+        return task_payload.upper()
+
+
+async def run_until_handled(handler: AsyncMaestroTaskHandler, count: int) -> None:
+    async def handled() -> None:
+        while handler.handled < count:
+            await asyncio.sleep(0.01)
+
+    running = asyncio.create_task(handler.run())
+    await asyncio.wait_for(handled(), 5)
+    handler.stop()
+    await running
+
+
+def test_async_task_handler(subtests):
+    with subtests.test("Runs tasks concurrently"):
+        emulator = MaestroEmulator()
+        client = Client("", transport=InProcessTransport(emulator))
+        task_ids = client.launch_task_list(
+            [("owner", "queue", "x")] * 50 + [("owner", "queue", "bad")]
+        )
+        worker = SleepingWorker(0.2)
+        tracer = TaskTracer()
+        handler = AsyncMaestroTaskHandler(
+            AsyncClient(transport=AsyncInProcessTransport(emulator)),
+            "queue",
+            worker,
+            logger,
+            max_concurrency=20,
+            tracer=tracer,
+        )
+
+        asyncio.run(run_until_handled(handler, 51))
+
+        assert worker.max_running == 20
+        tasks = client.task_states(task_ids).tasks
+        assert tasks[task_ids[0]].result == "X"
+        assert tasks[task_ids[-1]].state == "failed"
+        assert tracer.summaries("queue")["work"].count == 51
+
+    with subtests.test("Enforced deadline"):
+        emulator = MaestroEmulator()
+        client = Client("", transport=InProcessTransport(emulator))
+        task_id = client.launch_task("owner", "queue", "x", timeout=1)
+        handler = AsyncMaestroTaskHandler(
+            AsyncClient(transport=AsyncInProcessTransport(emulator)),
+            "queue",
+            SleepingWorker(10),
+            logger,
+            enforce_deadline=True,
+        )
+
+        asyncio.run(run_until_handled(handler, 1))
+
+        assert client.task_state(task_id).state == "failed"
+
+    with subtests.test("Stopped before run"):
+        emulator = MaestroEmulator()
+        client = Client("", transport=InProcessTransport(emulator))
+        task_id = client.launch_task("owner", "queue", "x")
+        handler = AsyncMaestroTaskHandler(
+            AsyncClient(transport=AsyncInProcessTransport(emulator)),
+            "queue",
+            SleepingWorker(0),
+            logger,
+        )
+
+        handler.stop()
+        asyncio.run(asyncio.wait_for(handler.run(), 5))
+
+        assert handler.handled == 0
+        assert client.task_state(task_id).state == "pending"
@@ -0,0 +1,58 @@
+import random
+import threading
+import time
+
+
+class Backoff:
+    """Exponential delay between polls of an empty queue.
+
+    The delay starts at min_delay, is multiplied by factor after every empty
+    poll up to max_delay, and goes back to min_delay with reset(), once
+    something was found. A random jitter of up to jitter times the delay is
+    added, so that pollers started together spread out.
+    """
+
+    def __init__(
+        self,
+        min_delay: float = 0.05,
+        max_delay: float = 1.0,
+        factor: float = 2.0,
+        jitter: float = 0.1,
+    ) -> None:
+        if not 0 < min_delay <= max_delay:
+            raise ValueError("Delays must be > 0, and min_delay <= max_delay")
+
+        self.__min_delay = min_delay
+        self.__max_delay = max_delay
+        self.__factor = factor
+        self.__jitter = jitter
+        self.__delay = min_delay
+
+    @property
+    def delay(self) -> float:
+        """The next delay, jitter excluded."""
+        return self.__delay
+
+    def next_delay(self) -> float:
+        """Returns the delay to wait now, and increases the next one."""
+        delay = self.__delay * (1 + random.uniform(0, self.__jitter))
+        self.__delay = min(self.__delay * self.__factor, self.__max_delay)
+        return delay
+
+    def reset(self) -> None:
+        self.__delay = self.__min_delay
+
+    def wait(self, stopped: threading.Event | None = None) -> bool:
+        """Sleeps for the next delay.
+
+        Args:
+            stopped: wakes up as soon as this event is set.
+
+        Returns:
+            True if stopped is set.
+        """
+        delay = self.next_delay()
+        if stopped is None:
+            time.sleep(delay)
+            return False
+        return stopped.wait(delay)
@@ -0,0 +1,30 @@
+import threading
+
+from pytest import raises
+
+from maestro_python_client.maestro_task_handler.Backoff import Backoff
+
+
+def test_backoff(subtests):
+    with subtests.test("Grows up to max delay"):
+        backoff = Backoff(0.1, 0.5, jitter=0)
+
+        assert [backoff.next_delay() for _ in range(5)] == [0.1, 0.2, 0.4, 0.5, 0.5]
+
+        backoff.reset()
+        assert backoff.delay == 0.1
+
+    with subtests.test("Jitter"):
+        backoff = Backoff(1, 1, jitter=0.5)
+
+        assert all(1 <= backoff.next_delay() <= 1.5 for _ in range(100))
+
+    with subtests.test("Stopped"):
+        stopped = threading.Event()
+        stopped.set()
+
+        assert Backoff(10, 10).wait(stopped)
+
+    with subtests.test("Invalid delays"):
+        with raises(ValueError):
+            Backoff(1, 0.5)
@@ -0,0 +1,67 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from maestro_python_client.Client import Task
+
+
+class DeadlineExceeded(TimeoutError):
+    """The time budget of a task is spent."""
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """Time by which a task must be reported, before maestro times it out.
+
+    A task is timed out timeout seconds after it was fetched, which is when
+    maestro last updated it. Both times come from the maestro server, the
+    deadline is only as accurate as the local clock is in sync with it.
+
+    Workers get the deadline of the task they run with current_deadline(),
+    and can call check() between steps to give up once it expired or the
+    task was cancelled.
+    """
+
+    expires_at: float
+    cancelled: threading.Event = field(default_factory=threading.Event, compare=False)
+
+    @classmethod
+    def for_task(cls, task: Task) -> "Deadline":
+        return cls(task.updated_at.timestamp() + task.timeout)
+
+    def remaining(self) -> float:
+        """Time left, in seconds."""
+        return self.expires_at - time.time()
+
+    @property
+    def expired(self) -> bool:
+        return self.cancelled.is_set() or self.remaining() <= 0
+
+    def check(self) -> None:
+        """Raises DeadlineExceeded if the deadline expired."""
+        if self.cancelled.is_set():
+            raise DeadlineExceeded("Task was cancelled")
+        if self.remaining() <= 0:
+            raise DeadlineExceeded(f"Deadline expired {-self.remaining():.3f}s ago")
+
+
+_current_deadline: contextvars.ContextVar[Deadline | None] = contextvars.ContextVar(
+    "maestro_task_deadline", default=None
+)
+
+
+def current_deadline() -> Deadline | None:
+    """Returns the deadline of the task being run, None outside of a task."""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Deadline) -> Iterator[Deadline]:
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
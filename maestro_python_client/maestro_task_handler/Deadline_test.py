@@ -0,0 +1,152 @@
+import datetime
+import logging
+import threading
+import time
+
+from pytest import raises
+
+from maestro_python_client.Client import Client, Task
+from maestro_python_client.maestro_task_handler.Deadline import (
+    Deadline,
+    DeadlineExceeded,
+    current_deadline,
+)
+from maestro_python_client.maestro_task_handler.MaestroTaskHandler import (
+    MaestroTaskHandler,
+    TaskWorker,
+)
+from maestro_python_client.maestro_task_handler.TaskProfiler import TaskProfiler
+from maestro_python_client.Transport.InProcessTransport import InProcessTransport
+
+logger = logging.getLogger("test")
+
+
+class DeadlineWorker(TaskWorker):
+    def __init__(self, wait: bool = False) -> None:
+        self.deadlines: list[Deadline | None] = []
+        self.__wait = wait
+
+    def on_task(self, task_payload: str) -> str:
+        deadline = current_deadline()
+        self.deadlines.append(deadline)
+        if self.__wait and deadline:
+            deadline.cancelled.wait(5)
+        return task_payload
+
+
+class SleepingWorker(TaskWorker):
+    """Ignores its deadline, and counts the workers running at once."""
+
+    def __init__(self, delay: float) -> None:
+        self.__delay = delay
+        self.__lock = threading.Lock()
+        self.__running = 0
+        self.max_running = 0
+
+    def on_task(self, task_payload: str) -> str:
+        with self.__lock:
+            self.__running += 1
+            self.max_running = max(self.max_running, self.__running)
+        time.sleep(self.__delay)
+        with self.__lock:
+            self.__running -= 1
+        return task_payload
+
+
+def run_until_finished(handler: MaestroTaskHandler, count: int = 1) -> None:
+    handler.start()
+    deadline = time.monotonic() + 5
+    while handler.handled < count:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    handler.stop()
+    handler.join()
+
+
+def test_deadline(subtests):
+    with subtests.test("Deadline of a task"):
+        task = Task()
+        task.updated_at = datetime.datetime.now()
+        task.timeout = 60
+
+        deadline = Deadline.for_task(task)
+
+        assert 59 < deadline.remaining() <= 60
+        assert not deadline.expired
+        deadline.check()
+        assert current_deadline() is None
+
+    with subtests.test("Expired deadline"):
+        deadline = Deadline(time.time() - 1)
+
+        assert deadline.expired
+        with raises(DeadlineExceeded):
+            deadline.check()
+
+    with subtests.test("Handed to the worker"):
+        client = Client("", transport=InProcessTransport())
+        client.launch_task("owner", "queue", "payload", timeout=60)
+        worker = DeadlineWorker()
+
+        run_until_finished(MaestroTaskHandler(client, "queue", worker, logger))
+
+        deadline = worker.deadlines[0]
+        assert deadline and 50 < deadline.remaining() <= 61
+        assert client.get_queue_stats("queue").completed
+
+    with subtests.test("Tasks without enough budget are skipped"):
+        client = Client("", transport=InProcessTransport())
+        client.launch_task("owner", "queue", "payload", timeout=5)
+        worker = DeadlineWorker()
+
+        handler = MaestroTaskHandler(client, "queue", worker, logger, min_budget=10)
+        run_until_finished(handler)
+
+        assert worker.deadlines == []
+        assert client.get_queue_stats("queue").failed
+
+    with subtests.test("Enforced deadline"):
+        client = Client("", transport=InProcessTransport())
+        client.launch_task("owner", "queue", "payload", timeout=1)
+        worker = DeadlineWorker(wait=True)
+
+        handler = MaestroTaskHandler(
+            client, "queue", worker, logger, enforce_deadline=True
+        )
+        started_at = time.monotonic()
+        run_until_finished(handler)
+
+        assert time.monotonic() - started_at < 3
+        assert client.get_queue_stats("queue").failed
+        deadline = worker.deadlines[0]
+        assert deadline and deadline.cancelled.is_set()
+
+    with subtests.test("Enforced deadline profiles the worker"):
+        client = Client("", transport=InProcessTransport())
+        client.launch_task("owner", "queue", "payload", timeout=60)
+        profiler = TaskProfiler(slow_threshold=0.01, sampling_interval=0.001)
+
+        handler = MaestroTaskHandler(
+            client,
+            "queue",
+            SleepingWorker(0.1),
+            logger,
+            profiler=profiler,
+            enforce_deadline=True,
+        )
+        run_until_finished(handler)
+
+        (profile,) = profiler.dump()
+        assert "on_task" in profile.profile
+
+    with subtests.test("At most one leftover worker"):
+        client = Client("", transport=InProcessTransport())
+        client.launch_task_list([("owner", "queue", "payload")] * 2, timeout=1)
+        worker = SleepingWorker(1.5)
+
+        handler = MaestroTaskHandler(
+            client, "queue", worker, logger, enforce_deadline=True
+        )
+        run_until_finished(handler, 2)
+
+        assert worker.max_running == 1
@@ -0,0 +1,151 @@
+import threading
+import time
+from logging import Logger
+
+from maestro_python_client.Client import Client
+from maestro_python_client.maestro_task_handler.MaestroTaskHandler import (
+    BatchTaskWorker,
+    MaestroTaskHandler,
+    TaskWorker,
+)
+from maestro_python_client.maestro_task_handler.TaskProfiler import TaskProfiler
+from maestro_python_client.maestro_task_handler.TaskTracer import TaskTracer
+
+
+class HandlerPool:
+    """A resizable group of MaestroTaskHandler threads for one queue.
+
+    Handlers removed by resize finish the task they are running before their
+    thread ends. handler_options are passed to every handler, e.g. min_budget.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        queue_name: str,
+        worker: TaskWorker | BatchTaskWorker,
+        logger: Logger,
+        size: int = 1,
+        tracer: TaskTracer | None = None,
+        profiler: TaskProfiler | None = None,
+        **handler_options,
+    ) -> None:
+        if size < 0:
+            raise ValueError("Size must be >= 0")
+
+        self.__client = client
+        self.__queue = queue_name
+        self.__worker = worker
+        self.__logger = logger
+        self.__tracer = tracer
+        self.__profiler = profiler
+        self.__handler_options = handler_options
+
+        self.__lock = threading.Lock()
+        self.__size = size
+        self.__handlers: list[MaestroTaskHandler] = []
+        self.__retired: list[MaestroTaskHandler] = []
+        self.__retired_handled = 0
+        self.__started = False
+
+    @property
+    def queue(self) -> str:
+        return self.__queue
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    @property
+    def handled(self) -> int:
+        """Number of tasks run by the handlers of the pool, past ones included."""
+        with self.__lock:
+            self.__prune()
+            return self.__retired_handled + sum(
+                handler.handled for handler in [*self.__handlers, *self.__retired]
+            )
+
+    def start(self) -> "HandlerPool":
+        with self.__lock:
+            self.__started = True
+            self.__apply()
+        return self
+
+    def stop(self, drain: bool = True, timeout: float | None = None) -> bool:
+        """Stops every handler, the same way as MaestroTaskHandler.stop.
+
+        Args:
+            drain: let the running tasks finish. Otherwise they are failed at
+                once.
+            timeout: with drain, time given to the running tasks to finish,
+                in seconds, before they are failed. None to return at once,
+                join waits for the handlers to end.
+
+        Returns:
+            True if no running task was failed.
+        """
+        with self.__lock:
+            self.__started = False
+            self.__apply()
+            retired = list(self.__retired)
+
+        if drain and timeout is None:
+            return True
+
+        ends_at = time.monotonic() + (timeout or 0.0)
+        return all(
+            [
+                handler.stop(drain, max(0.0, ends_at - time.monotonic()))
+                for handler in retired
+            ]
+        )
+
+    def join(self, timeout: float | None = None) -> None:
+        """Waits for the handlers stopped by stop or resize to end."""
+        with self.__lock:
+            retired = list(self.__retired)
+
+        ends_at = None if timeout is None else time.monotonic() + timeout
+        for handler in retired:
+            handler.join(
+                None if ends_at is None else max(0.0, ends_at - time.monotonic())
+            )
+
+    def resize(self, size: int) -> None:
+        if size < 0:
+            raise ValueError("Size must be >= 0")
+
+        with self.__lock:
+            self.__size = size
+            if self.__started:
+                self.__apply()
+
+    def __apply(self) -> None:
+        size = self.__size if self.__started else 0
+        while len(self.__handlers) < size:
+            handler = MaestroTaskHandler(
+                self.__client,
+                self.__queue,
+                self.__worker,
+                self.__logger,
+                self.__tracer,
+                self.__profiler,
+                **self.__handler_options,
+            )
+            handler.daemon = True
+            handler.start()
+            self.__handlers.append(handler)
+
+        while len(self.__handlers) > size:
+            handler = self.__handlers.pop()
+            handler.stop()
+            self.__retired.append(handler)
+
+        self.__prune()
+
+    def __prune(self) -> None:
+        for handler in [
+            handler for handler in self.__retired if not handler.is_alive()
+        ]:
+            self.__retired_handled += handler.handled
+            self.__retired.remove(handler)
@@ -0,0 +1,220 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from logging import Logger
+from typing import Callable
+
+from maestro_python_client.Client import Client, Task
+from maestro_python_client.maestro_task_handler.Backoff import Backoff
+
+
+class MaestroResultConsumer:
+    """Consumes the results of a queue and hands them to a callback.
+
+    concurrency threads call consume at the same time and push the results
+    to a buffer of buffer_size results. When the buffer is full, they wait,
+    so a slow callback slows down consumption instead of piling up results.
+    A thread polling an empty queue backs off, see Backoff.
+
+    A dispatcher thread takes up to batch_size results from the buffer,
+    resolves their payloads at once with Client.resolve_tasks, and calls
+    either callback for each result, or batch_callback with the whole batch.
+    With max_workers > 1, callbacks run in a thread pool of that size.
+
+    A result that cannot be resolved, e.g. its cached payload expired, is
+    logged and handed to error_callback with its error, the other results of
+    its batch are still handled.
+
+    Results are consumed in maestro before being handed to the callback: a
+    result whose callback fails is logged, and lost.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        queue_name: str,
+        logger: Logger,
+        callback: Callable[[Task], None] | None = None,
+        batch_callback: Callable[[list[Task]], None] | None = None,
+        error_callback: Callable[[Task, Exception], None] | None = None,
+        concurrency: int = 4,
+        batch_size: int = 100,
+        buffer_size: int = 1000,
+        max_workers: int = 1,
+        backoff: Callable[[], Backoff] = Backoff,
+    ) -> None:
+        """
+        Args:
+            client: the client used to consume the results.
+            queue_name: the queue to consume the results of.
+            logger: where errors are reported.
+            callback: called with every result.
+            batch_callback: called with batches of results, instead of
+                callback.
+            error_callback: called with every result that cannot be
+                resolved, and its error.
+            concurrency: number of consume calls in flight.
+            batch_size: maximum number of results resolved and handed to
+                batch_callback at once.
+            buffer_size: maximum number of results consumed but not handed
+                to a callback yet.
+            max_workers: number of threads running callbacks.
+            backoff: builds the backoff of each consuming thread.
+        """
+        if (callback is None) == (batch_callback is None):
+            raise ValueError("Exactly one of callback and batch_callback is needed")
+        if min(concurrency, batch_size, buffer_size, max_workers) <= 0:
+            raise ValueError("Sizes must be > 0")
+
+        self.__client = client
+        self.__queue = queue_name
+        self.__logger = logger
+        self.__callback = callback
+        self.__batch_callback = batch_callback
+        self.__error_callback = error_callback
+        self.__concurrency = concurrency
+        self.__batch_size = batch_size
+        self.__max_workers = max_workers
+        self.__backoff = backoff
+
+        self.__buffer: queue.Queue[Task] = queue.Queue(buffer_size)
+        self.__stopped = threading.Event()
+        self.__fetchers: list[threading.Thread] = []
+        self.__dispatcher: threading.Thread | None = None
+        self.__in_flight = threading.Semaphore(max_workers * 2)
+
+    def start(self) -> "MaestroResultConsumer":
+        self.__stopped.clear()
+        self.__fetchers = [
+            threading.Thread(target=self.__fetch, daemon=True)
+            for _ in range(self.__concurrency)
+        ]
+        self.__dispatcher = threading.Thread(target=self.__dispatch, daemon=True)
+        for thread in [*self.__fetchers, self.__dispatcher]:
+            thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops consuming, and waits for the consumed results to be handled."""
+        self.__stopped.set()
+        for thread in self.__fetchers:
+            thread.join()
+        if self.__dispatcher:
+            self.__dispatcher.join()
+
+    def __enter__(self) -> "MaestroResultConsumer":
+        return self.start()
+
+    def __exit__(self, *_) -> None:
+        self.stop()
+
+    def __fetch(self) -> None:
+        backoff = self.__backoff()
+        while not self.__stopped.is_set():
+            try:
+                task = self.__client.consume_unresolved(self.__queue)
+            except Exception as e:
+                self.__log_error("Could not consume results", e)
+                task = None
+
+            if task is None or task.task_id == "":
+                backoff.wait(self.__stopped)
+                continue
+
+            backoff.reset()
+            while True:
+                try:
+                    # Not interrupted by stop, the result is already consumed
+                    self.__buffer.put(task, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+    def __dispatch(self) -> None:
+        executor = (
+            ThreadPoolExecutor(self.__max_workers) if self.__max_workers > 1 else None
+        )
+        try:
+            while True:
+                batch = self.__next_batch()
+                if batch:
+                    self.__handle(batch, executor)
+                elif self.__stopped.is_set() and not any(
+                    thread.is_alive() for thread in self.__fetchers
+                ):
+                    return
+        finally:
+            if executor:
+                executor.shutdown()
+
+    def __next_batch(self) -> list[Task]:
+        try:
+            batch = [self.__buffer.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+
+        while len(batch) < self.__batch_size:
+            try:
+                batch.append(self.__buffer.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def __handle(self, batch: list[Task], executor: ThreadPoolExecutor | None):
+        resolved, errors = self.__resolve(batch)
+
+        calls: list[tuple[Callable, tuple]] = []
+        if resolved:
+            calls = (
+                [(self.__batch_callback, (resolved,))]
+                if self.__batch_callback
+                else [(self.__callback, (task,)) for task in resolved]
+            )
+        for task in batch:
+            if task.task_id in errors:
+                error = errors[task.task_id]
+                self.__log_error(f"Could not resolve result {task.task_id}", error)
+                if self.__error_callback:
+                    calls.append((self.__error_callback, (task, error)))
+
+        for callback, arguments in calls:
+            if executor is None:
+                self.__call(callback, arguments)
+            else:
+                self.__in_flight.acquire()
+                executor.submit(self.__call, callback, arguments).add_done_callback(
+                    lambda _: self.__in_flight.release()
+                )
+
+    def __resolve(self, batch: list[Task]) -> tuple[list[Task], dict[str, Exception]]:
+        errors: dict[str, Exception] = {}
+        try:
+            return self.__client.resolve_tasks(batch, errors), errors
+        except Exception as e:
+            self.__log_error(f"Could not resolve {len(batch)} results at once", e)
+
+        # The results are consumed already, each is resolved on its own
+        errors = {}
+        resolved = []
+        for task in batch:
+            try:
+                resolved.append(self.__client.resolve_task(task))
+            except Exception as e:
+                errors[task.task_id] = e
+        return resolved, errors
+
+    def __call(self, callback: Callable, arguments: tuple) -> None:
+        try:
+            callback(*arguments)
+        except Exception as e:
+            self.__log_error("Could not handle results", e)
+
+    def __log_error(self, msg: str, e: Exception) -> None:
+        self.__logger.exception(
+            {
+                "infrastructure": "result_consumer",
+                "queue": self.__queue,
+                "msg": f"{msg} for queue {self.__queue}",
+                "err": str(e),
+            },
+        )
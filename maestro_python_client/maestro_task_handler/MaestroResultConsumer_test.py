@@ -0,0 +1,156 @@
+import logging
+import threading
+import time
+
+from pytest import raises
+
+from maestro_python_client.Cache.InMemoryCache import InMemoryCache
+from maestro_python_client.CachedClient import CachedClient
+from maestro_python_client.Client import Client
+from maestro_python_client.maestro_task_handler.MaestroResultConsumer import (
+    MaestroResultConsumer,
+)
+from maestro_python_client.Transport.InProcessTransport import InProcessTransport
+
+logger = logging.getLogger("test")
+
+
+def completed_tasks(client: Client, queue: str, count: int) -> list[str]:
+    task_ids = client.launch_task_list(
+        [("owner", queue, str(i)) for i in range(count)], start_timeout=60
+    )
+    for _ in task_ids:
+        task = client.next(queue)
+        assert task
+        client.complete_task(task.task_id, f"result {task.payload}")
+    return task_ids
+
+
+class LossyCache(InMemoryCache):
+    """Drops the values containing "lost", as if they had expired."""
+
+    def put(self, key: str, value: str, ttl: int | None = None):
+        if "lost" not in value:
+            super().put(key, value, ttl)
+
+
+class UnbatchedClient(Client):
+    def resolve_tasks(self, tasks, errors=None):
+        raise RuntimeError("Cannot resolve at once")
+
+
+def wait_until(condition, timeout: float = 5) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_result_consumer(subtests):
+    with subtests.test("Callback"):
+        client = Client("", transport=InProcessTransport())
+        task_ids = completed_tasks(client, "queue", 20)
+        results = []
+
+        with MaestroResultConsumer(
+            client, "queue", logger, callback=results.append, max_workers=4
+        ):
+            wait_until(lambda: len(results) == 20)
+
+        assert {task.task_id for task in results} == set(task_ids)
+        assert all(task.consumed for task in results)
+
+    with subtests.test("Batch callback resolves cached results"):
+        client = CachedClient(
+            "", InMemoryCache(), ["queue"], transport=InProcessTransport()
+        )
+        completed_tasks(client, "queue", 20)
+        batches: list[list] = []
+
+        with MaestroResultConsumer(
+            client, "queue", logger, batch_callback=batches.append, batch_size=8
+        ):
+            wait_until(lambda: sum(map(len, batches)) == 20)
+
+        assert all(len(batch) <= 8 for batch in batches)
+        assert sorted(task.result for batch in batches for task in batch) == sorted(
+            f"result {i}" for i in range(20)
+        )
+
+    with subtests.test("A missing result fails only its task"):
+        client = CachedClient(
+            "", LossyCache(), ["queue"], transport=InProcessTransport()
+        )
+        task_ids = client.launch_task_list(
+            [("owner", "queue", str(i)) for i in range(3)], start_timeout=60
+        )
+        for result in ["a", "lost", "b"]:
+            task = client.next("queue")
+            assert task
+            client.complete_task(task.task_id, result)
+        batches = []
+        errors = []
+
+        with MaestroResultConsumer(
+            client,
+            "queue",
+            logger,
+            batch_callback=batches.append,
+            error_callback=lambda task, e: errors.append((task, e)),
+            concurrency=1,
+        ):
+            wait_until(lambda: sum(map(len, batches)) + len(errors) == 3)
+
+        assert sorted(task.result for batch in batches for task in batch) == [
+            "a",
+            "b",
+        ]
+        assert [task.task_id for task, _ in errors] == [task_ids[1]]
+        assert isinstance(errors[0][1], ValueError)
+
+    with subtests.test("Results are resolved one by one if the batch fails"):
+        client = UnbatchedClient("", transport=InProcessTransport())
+        completed_tasks(client, "queue", 5)
+        results = []
+
+        with MaestroResultConsumer(client, "queue", logger, callback=results.append):
+            wait_until(lambda: len(results) == 5)
+
+    with subtests.test("Back-pressure"):
+        client = Client("", transport=InProcessTransport())
+        completed_tasks(client, "queue", 20)
+        release = threading.Event()
+        results = []
+
+        def slow(task):
+            release.wait()
+            results.append(task)
+
+        consumer = MaestroResultConsumer(
+            client, "queue", logger, callback=slow, concurrency=2, buffer_size=2
+        ).start()
+        time.sleep(0.2)
+
+        stats = client.get_queue_stats("queue")
+        remaining = client.task_states(stats.completed)
+        unconsumed = [task for task in remaining.tasks.values() if not task.consumed]
+        # At most: the batch being handled, a full buffer, one per fetcher
+        assert len(unconsumed) >= 20 - 2 - 2 - 2
+
+        release.set()
+        wait_until(lambda: len(results) == 20)
+        consumer.stop()
+
+    with subtests.test("Stop hands the consumed results"):
+        client = Client("", transport=InProcessTransport())
+        results = []
+        consumer = MaestroResultConsumer(
+            client, "queue", logger, callback=results.append
+        ).start()
+        consumer.stop()
+
+        assert results == []
+
+    with subtests.test("Invalid callbacks"):
+        with raises(ValueError):
+            MaestroResultConsumer(client, "queue", logger)
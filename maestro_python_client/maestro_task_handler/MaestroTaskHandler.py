@@ -2,8 +2,13 @@ import abc
 import threading
 import time
 from logging import Logger
+from typing import Callable
 
 from maestro_python_client.Client import Client, Task
+from maestro_python_client.maestro_task_handler.Backoff import Backoff
+from maestro_python_client.maestro_task_handler.TaskProfiler import TaskProfiler
+from maestro_python_client.maestro_task_handler.TaskRunner import TaskRunner
+from maestro_python_client.maestro_task_handler.TaskTracer import TaskTracer
 
 
 class TaskWorker(abc.ABC):
@@ -12,62 +17,172 @@ class TaskWorker(abc.ABC):
         pass
 
 
+class BatchTaskWorker(abc.ABC):
+    @abc.abstractmethod
+    def on_tasks(self, task_payloads: list[str]) -> list[str | Exception]:
+        """Runs many tasks at once.
+
+        Returns:
+            The result of each task, in order, or the exception failing it.
+        """
+        pass
+
+
 class MaestroTaskHandler(threading.Thread):
     def __init__(
-        self, client: Client, queue_name: str, worker: TaskWorker, logger: Logger
+        self,
+        client: Client,
+        queue_name: str,
+        worker: TaskWorker | BatchTaskWorker,
+        logger: Logger,
+        tracer: TaskTracer | None = None,
+        profiler: TaskProfiler | None = None,
+        batch_size: int = 64,
+        batch_wait: float = 0.05,
+        min_budget: float | None = None,
+        enforce_deadline: bool = False,
+        backoff: Callable[[], Backoff] = Backoff,
     ):
-        assert isinstance(worker, TaskWorker)
+        """
+        Args:
+            client: the client used to fetch and report tasks.
+            queue_name: the queue to handle.
+            worker: runs the tasks. A BatchTaskWorker gets up to batch_size
+                tasks at once, fetched within batch_wait seconds from the
+                first one.
+            logger: where errors are reported.
+            tracer: records the span of every task.
+            profiler: profiles the tasks.
+            batch_size: maximum number of tasks given to a BatchTaskWorker.
+            batch_wait: maximum time to wait for a batch to fill, in seconds.
+            min_budget: tasks left with less time than this before their
+                timeout, in seconds, are failed without being run. None to
+                run every task.
+            enforce_deadline: fail tasks as soon as their timeout expires,
+                with at most one timed out worker left running, see
+                TaskRunner.
+            backoff: builds the backoff between polls of the queue while it
+                is empty.
+        """
+        assert isinstance(worker, (TaskWorker, BatchTaskWorker))
 
         super().__init__()
         self.__client = client
         self.__worker = worker
         self.__queue = queue_name
         self.__logger = logger
+        self.__runner = TaskRunner(
+            client, logger, tracer, profiler, min_budget, enforce_deadline
+        )
+        self.__batch_size = batch_size
+        self.__batch_wait = batch_wait
+        self.__stopped = threading.Event()
+        self.__backoff = backoff()
+        self.__handled = 0
+
+    @property
+    def handled(self) -> int:
+        """Number of tasks run, successfully or not."""
+        return self.__handled
+
+    def stop(self, drain: bool = True, timeout: float | None = None) -> bool:
+        """Stops fetching tasks, the thread ends once the running task is done.
+
+        Args:
+            drain: let the running tasks finish. Otherwise they are failed at
+                once, so that maestro retries them without waiting for their
+                timeout, see TaskRunner.abandon.
+            timeout: with drain, time given to the running tasks to finish,
+                in seconds, before they are failed. None to return at once,
+                join waits for the thread to end.
+
+        Returns:
+            True if no running task was failed.
+        """
+        self.__stopped.set()
+        if (
+            drain
+            and timeout is not None
+            and self.is_alive()
+            and threading.current_thread() is not self
+        ):
+            self.join(timeout)
+            drain = not self.is_alive()
+
+        return drain or not self.__runner.abandon()
 
     def run(self) -> None:
-        while True:
+        while not self.__stopped.is_set():
             try:
                 self.__run()
             except Exception as e:
-                self.__logger.exception(
-                    {
-                        "infrastructure": "task_handler",
-                        "msg": f"Could not manage task for queue {self.__queue}",
-                        "err": str(e),
-                    },
-                )
+                self.__log_error("Could not manage task", e)
 
     def __run(self) -> None:
+        if isinstance(self.__worker, BatchTaskWorker):
+            self.__run_batch(self.__worker)
+            return
+
+        fetch_started_at = time.time_ns()
         task = self.__try_get_task()
         if not task:
-            time.sleep(1)
+            self.__backoff.wait(self.__stopped)
             return
-        assert task is not None
 
-        result, success = self.__execute_task(task)
-        if success:
-            self.__client.complete_task(task.task_id, result)
-        else:
-            self.__client.fail_task(task.task_id)
+        self.__backoff.reset()
+        try:
+            self.__runner.run(task, self.__worker, fetch_started_at)
+        finally:
+            self.__handled += 1
+
+    def __run_batch(self, worker: BatchTaskWorker) -> None:
+        tasks: list[Task] = []
+        spans = []
+        deadline = None
+        while len(tasks) < self.__batch_size:
+            fetch_started_at = time.time_ns()
+            try:
+                task = self.__try_get_task()
+            except Exception as e:
+                if not tasks:
+                    raise
+                # The tasks fetched already are run, not left to time out
+                self.__log_error("Could not fetch the rest of the batch", e)
+                break
+            if task:
+                tasks.append(task)
+                spans.append(self.__runner.span(task, fetch_started_at))
+                self.__backoff.reset()
+                deadline = deadline or time.monotonic() + self.__batch_wait
+                if time.monotonic() >= deadline:
+                    break
+            elif deadline is None:
+                self.__backoff.wait(self.__stopped)
+                return
+            else:
+                # The queue is polled less and less while the batch fills
+                remaining = deadline - time.monotonic()
+                delay = min(remaining, self.__backoff.next_delay())
+                if remaining <= 0 or self.__stopped.wait(delay):
+                    break
 
-    def __execute_task(self, task: Task) -> tuple[str, bool]:
+        self.__backoff.reset()
         try:
-            return self.__worker.on_task(task.payload), True
-
-        except Exception as e:
-            self.__logger.exception(
-                {
-                    "infrastructure": "task_handler",
-                    "queue": task.task_queue,
-                    "task_id": task.task_id,
-                    "msg": f"Cannot run task {task.task_id} from queue {task.task_queue}",
-                    "err": str(e),
-                },
-            )
-            return "", False
+            self.__runner.run_batch(tasks, spans, worker)
+        finally:
+            self.__handled += len(tasks)
 
     def __try_get_task(self) -> Task | None:
-        task = self.__client.next(self.__queue)
+        task = self.__client.fetch_unresolved(self.__queue)
         if task is None or task.task_id == "":
             return None
         return task
+
+    def __log_error(self, msg: str, e: Exception) -> None:
+        self.__logger.exception(
+            {
+                "infrastructure": "task_handler",
+                "msg": f"{msg} for queue {self.__queue}",
+                "err": str(e),
+            },
+        )
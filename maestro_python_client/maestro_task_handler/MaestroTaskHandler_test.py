@@ -0,0 +1,265 @@
+import logging
+import os
+import signal
+import threading
+import time
+
+from maestro_python_client.Cache.InMemoryCache import InMemoryCache
+from maestro_python_client.CachedClient import CachedClient
+from maestro_python_client.Client import Client, Task
+from maestro_python_client.maestro_task_handler.Backoff import Backoff
+from maestro_python_client.maestro_task_handler.Deadline import current_deadline
+from maestro_python_client.maestro_task_handler.MaestroTaskHandler import (
+    BatchTaskWorker,
+    MaestroTaskHandler,
+    TaskWorker,
+)
+from maestro_python_client.maestro_task_handler.Shutdown import stop_on_signal
+from maestro_python_client.maestro_task_handler.TaskTracer import TaskTracer
+from maestro_python_client.Transport.InProcessTransport import InProcessTransport
+
+logger = logging.getLogger("test")
+
+
+class UpperWorker(BatchTaskWorker):
+    def __init__(self) -> None:
+        self.batches: list[int] = []
+
+    def on_tasks(self, task_payloads: list[str]) -> list[str | Exception]:
+        self.batches.append(len(task_payloads))
+        return [
+            ValueError("bad") if payload == "bad" else payload.upper()
+            for payload in task_payloads
+        ]
+
+
+class BrokenWorker(BatchTaskWorker):
+    def on_tasks(self, task_payloads: list[str]) -> list[str | Exception]:
+        return []
+
+
+class LossyCache(InMemoryCache):
+    """Drops the values containing "lost", as if they had expired."""
+
+    def put(self, key: str, value: str, ttl: int | None = None):
+        if "lost" not in value:
+            super().put(key, value, ttl)
+
+
+class FlakyClient(Client):
+    """Fails every other call to next."""
+
+    def __init__(self) -> None:
+        super().__init__("", transport=InProcessTransport())
+        self.calls = 0
+
+    def next(self, queue: str) -> Task | None:
+        self.calls += 1
+        if self.calls % 2 == 0:
+            raise ConnectionError("maestro is unreachable")
+        return super().next(queue)
+
+
+class CountingClient(Client):
+    """Counts the calls to next."""
+
+    def __init__(self) -> None:
+        super().__init__("", transport=InProcessTransport())
+        self.calls = 0
+
+    def next(self, queue: str) -> Task | None:
+        self.calls += 1
+        return super().next(queue)
+
+
+def run_until_handled(handler: MaestroTaskHandler, count: int) -> None:
+    handler.start()
+    deadline = time.monotonic() + 5
+    while handler.handled < count:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    handler.stop()
+    handler.join()
+
+
+def test_batch_task_worker(subtests):
+    with subtests.test("Tasks are run by batches"):
+        client = Client("", transport=InProcessTransport())
+        task_ids = client.launch_task_list(
+            [("owner", "queue", payload) for payload in ["a", "bad", *"bcdefg"]]
+        )
+        worker = UpperWorker()
+        tracer = TaskTracer()
+
+        handler = MaestroTaskHandler(
+            client, "queue", worker, logger, tracer, batch_size=4, batch_wait=1
+        )
+        run_until_handled(handler, 8)
+
+        assert worker.batches == [4, 4]
+        tasks = client.task_states(task_ids).tasks
+        assert tasks[task_ids[0]].result == "A"
+        assert tasks[task_ids[1]].state == "failed"
+        assert tasks[task_ids[7]].result == "G"
+        assert tracer.summaries("queue")["work"].count == 8
+
+    with subtests.test("Partial batch after batch wait"):
+        client = Client("", transport=InProcessTransport())
+        client.launch_task_list([("owner", "queue", "a")] * 3)
+        worker = UpperWorker()
+
+        handler = MaestroTaskHandler(
+            client, "queue", worker, logger, batch_size=64, batch_wait=0.05
+        )
+        run_until_handled(handler, 3)
+
+        assert worker.batches == [3]
+
+    with subtests.test("Queue is polled with backoff while the batch fills"):
+        client = CountingClient()
+        client.launch_task("owner", "queue", "a")
+        worker = UpperWorker()
+
+        handler = MaestroTaskHandler(
+            client,
+            "queue",
+            worker,
+            logger,
+            batch_size=64,
+            batch_wait=0.5,
+            backoff=lambda: Backoff(min_delay=0.1, max_delay=0.1, jitter=0),
+        )
+        run_until_handled(handler, 1)
+
+        assert worker.batches == [1]
+        assert client.calls < 10
+
+    with subtests.test("Wrong number of results fails the batch"):
+        client = Client("", transport=InProcessTransport())
+        client.launch_task_list([("owner", "queue", "a")] * 2)
+
+        handler = MaestroTaskHandler(
+            client, "queue", BrokenWorker(), logger, batch_wait=0.01
+        )
+        run_until_handled(handler, 2)
+
+        assert len(client.get_queue_stats("queue").failed) == 2
+
+    with subtests.test("A missing payload fails only its task"):
+        client = CachedClient(
+            "", LossyCache(), ["queue"], transport=InProcessTransport()
+        )
+        task_ids = client.launch_task_list(
+            [("owner", "queue", payload) for payload in ["a", "lost", "b"]],
+            start_timeout=60,
+        )
+        worker = UpperWorker()
+
+        handler = MaestroTaskHandler(
+            client, "queue", worker, logger, batch_size=4, batch_wait=0.05
+        )
+        run_until_handled(handler, 3)
+
+        assert worker.batches == [2]
+        tasks = client.task_states([task_ids[0], task_ids[2]]).tasks
+        assert [task.result for task in tasks.values()] == ["A", "B"]
+        assert client.get_queue_stats("queue").failed == [task_ids[1]]
+
+    with subtests.test("A failed fetch runs the tasks fetched already"):
+        client = FlakyClient()
+        task_ids = client.launch_task_list([("owner", "queue", "a")] * 2)
+        worker = UpperWorker()
+
+        handler = MaestroTaskHandler(
+            client, "queue", worker, logger, batch_size=4, batch_wait=1
+        )
+        run_until_handled(handler, 2)
+
+        assert worker.batches == [1, 1]
+        tasks = client.task_states(task_ids).tasks
+        assert [task.result for task in tasks.values()] == ["A", "A"]
+
+
+def test_backoff():
+    client = Client("", transport=InProcessTransport())
+    handler = MaestroTaskHandler(
+        client,
+        "queue",
+        UpperWorker(),
+        logger,
+        backoff=lambda: Backoff(min_delay=0.01, max_delay=0.02),
+    )
+    threading.Timer(0.1, lambda: client.launch_task("owner", "queue", "a")).start()
+    started_at = time.monotonic()
+    run_until_handled(handler, 1)
+
+    # Polled again within the backoff delay, not after a second
+    assert time.monotonic() - started_at < 0.5
+
+
+class WaitingWorker(TaskWorker):
+    """Runs until its deadline is cancelled, or for delay seconds."""
+
+    def __init__(self, delay: float = 10) -> None:
+        self.__delay = delay
+        self.started = threading.Event()
+
+    def on_task(self, task_payload: str) -> str:
+        self.started.set()
+        deadline = current_deadline()
+        assert deadline
+        ends_at = time.monotonic() + self.__delay
+        while time.monotonic() < ends_at:
+            deadline.check()
+            time.sleep(0.01)
+        return task_payload
+
+
+def start_task(worker: WaitingWorker) -> tuple[Client, str, MaestroTaskHandler]:
+    client = Client("", transport=InProcessTransport())
+    task_id = client.launch_task("owner", "queue", "a")
+    handler = MaestroTaskHandler(client, "queue", worker, logger)
+    handler.start()
+    assert worker.started.wait(5)
+    return client, task_id, handler
+
+
+def test_stop(subtests):
+    with subtests.test("Drain waits for the running task"):
+        client, task_id, handler = start_task(WaitingWorker(0.2))
+
+        assert handler.stop(timeout=5)
+        assert not handler.is_alive()
+        assert client.task_state(task_id).state == "completed"
+
+    with subtests.test("Running task is failed after timeout"):
+        client, task_id, handler = start_task(WaitingWorker())
+
+        started_at = time.monotonic()
+        assert not handler.stop(timeout=0.1)
+        assert time.monotonic() - started_at < 1
+        assert client.task_state(task_id).state == "failed"
+        handler.join(5)
+        assert not handler.is_alive()
+        assert client.task_state(task_id).state == "failed"
+
+    with subtests.test("Running task is failed at once without drain"):
+        client, task_id, handler = start_task(WaitingWorker())
+
+        assert not handler.stop(drain=False)
+        assert client.task_state(task_id).state == "failed"
+        handler.join(5)
+        assert not handler.is_alive()
+
+    with subtests.test("SIGTERM drains handlers"):
+        client, task_id, handler = start_task(WaitingWorker(0.2))
+        previous = signal.getsignal(signal.SIGTERM)
+        try:
+            stop_on_signal([handler], timeout=5)
+            os.kill(os.getpid(), signal.SIGTERM)
+            handler.join(5)
+        finally:
+            signal.signal(signal.SIGTERM, previous)
+
+        assert not handler.is_alive()
+        assert client.task_state(task_id).state == "completed"
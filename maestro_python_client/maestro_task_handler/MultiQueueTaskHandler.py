@@ -0,0 +1,207 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from logging import Logger
+from typing import Callable
+
+from maestro_python_client.Client import Client
+from maestro_python_client.maestro_task_handler.Backoff import Backoff
+from maestro_python_client.maestro_task_handler.MaestroTaskHandler import TaskWorker
+from maestro_python_client.maestro_task_handler.TaskProfiler import TaskProfiler
+from maestro_python_client.maestro_task_handler.TaskRunner import TaskRunner
+from maestro_python_client.maestro_task_handler.TaskTracer import TaskTracer
+
+
+@dataclass
+class _QueueState:
+    name: str
+    worker: TaskWorker
+    weight: int
+    max_concurrency: int
+    backoff: Backoff
+    running: int = 0
+    current_weight: int = 0
+    idle_until: float = 0.0
+    handled: int = 0
+
+
+class MultiQueueTaskHandler(threading.Thread):
+    """Handles the tasks of many queues with one pool of threads.
+
+    Each of the max_workers threads of the pool fetches a task from the queue
+    picked by the scheduler, and runs it. Queues are picked by smooth weighted
+    round-robin: over time, a queue with weight 3 gets three times as many
+    turns as a queue with weight 1, and turns are interleaved. A queue found
+    empty is skipped until its backoff delay expires, a queue running
+    max_concurrency tasks is skipped until one of them finishes.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        workers: dict[str, TaskWorker],
+        logger: Logger,
+        max_workers: int = 8,
+        weights: dict[str, int] | None = None,
+        max_concurrency: dict[str, int] | None = None,
+        tracer: TaskTracer | None = None,
+        profiler: TaskProfiler | None = None,
+        backoff: Callable[[], Backoff] = Backoff,
+        min_budget: float | None = None,
+        enforce_deadline: bool = False,
+    ):
+        """
+        Args:
+            client: the client used to fetch and report tasks.
+            workers: the worker of each queue.
+            logger: where errors are reported.
+            max_workers: number of tasks run at the same time, all queues
+                included.
+            weights: the share of turns of each queue, 1 by default.
+            max_concurrency: the maximum number of tasks of each queue run at
+                the same time, max_workers by default.
+            tracer: records the span of every task.
+            profiler: profiles the tasks.
+            backoff: builds the backoff of each queue.
+            min_budget: see MaestroTaskHandler.
+            enforce_deadline: see MaestroTaskHandler.
+        """
+        weights = weights or {}
+        max_concurrency = max_concurrency or {}
+        unknown = (set(weights) | set(max_concurrency)) - set(workers)
+        if unknown:
+            raise ValueError(f"Queues {sorted(unknown)} have no worker")
+        if not workers or max_workers <= 0:
+            raise ValueError("At least one queue and one worker are needed")
+        for queue, worker in workers.items():
+            assert isinstance(worker, TaskWorker)
+            if weights.get(queue, 1) <= 0 or max_concurrency.get(queue, 1) <= 0:
+                raise ValueError(f"Weight and max concurrency of {queue} must be > 0")
+
+        super().__init__()
+        self.__client = client
+        self.__logger = logger
+        self.__max_workers = max_workers
+        self.__runner = TaskRunner(
+            client, logger, tracer, profiler, min_budget, enforce_deadline
+        )
+        self.__queues = [
+            _QueueState(
+                queue,
+                worker,
+                weights.get(queue, 1),
+                max_concurrency.get(queue, max_workers),
+                backoff(),
+            )
+            for queue, worker in workers.items()
+        ]
+
+        self.__lock = threading.Condition()
+        self.__free_workers = max_workers
+        self.__stopped = threading.Event()
+
+    @property
+    def handled(self) -> dict[str, int]:
+        """Number of tasks run from each queue, successfully or not."""
+        with self.__lock:
+            return {queue.name: queue.handled for queue in self.__queues}
+
+    def stop(self, drain: bool = True, timeout: float | None = None) -> bool:
+        """Stops fetching tasks, the thread ends once running tasks are done.
+
+        Args:
+            drain: let the running tasks finish. Otherwise they are failed at
+                once, see MaestroTaskHandler.stop.
+            timeout: with drain, time given to the running tasks to finish,
+                in seconds, before they are failed. None to return at once,
+                join waits for the thread to end.
+
+        Returns:
+            True if no running task was failed.
+        """
+        self.__stopped.set()
+        with self.__lock:
+            self.__lock.notify()
+
+        if (
+            drain
+            and timeout is not None
+            and self.is_alive()
+            and threading.current_thread() is not self
+        ):
+            self.join(timeout)
+            drain = not self.is_alive()
+
+        return drain or not self.__runner.abandon()
+
+    def run(self) -> None:
+        with ThreadPoolExecutor(self.__max_workers) as executor:
+            while not self.__stopped.is_set():
+                queue = self.__next_queue()
+                if queue:
+                    executor.submit(self.__handle, queue)
+
+    def __next_queue(self) -> _QueueState | None:
+        with self.__lock:
+            while not self.__stopped.is_set():
+                queue = self.__pick(time.monotonic()) if self.__free_workers else None
+                if queue:
+                    self.__free_workers -= 1
+                    queue.running += 1
+                    return queue
+
+                self.__lock.wait(self.__wake_up_in())
+
+        return None
+
+    def __pick(self, now: float) -> _QueueState | None:
+        eligible = [
+            queue
+            for queue in self.__queues
+            if queue.idle_until <= now and queue.running < queue.max_concurrency
+        ]
+        if not eligible:
+            return None
+
+        for queue in eligible:
+            queue.current_weight += queue.weight
+        picked = max(eligible, key=lambda queue: queue.current_weight)
+        picked.current_weight -= sum(queue.weight for queue in eligible)
+        return picked
+
+    def __wake_up_in(self) -> float | None:
+        if not self.__free_workers:
+            return None
+
+        now = time.monotonic()
+        idle = [queue.idle_until for queue in self.__queues if queue.idle_until > now]
+        return max(0.0, min(idle) - now) if idle else None
+
+    def __handle(self, queue: _QueueState) -> None:
+        found = False
+        try:
+            fetch_started_at = time.time_ns()
+            task = self.__client.fetch_unresolved(queue.name)
+            found = task is not None and task.task_id != ""
+            if task and found:
+                self.__runner.run(task, queue.worker, fetch_started_at)
+        except Exception as e:
+            self.__logger.exception(
+                {
+                    "infrastructure": "task_handler",
+                    "msg": f"Could not manage task for queue {queue.name}",
+                    "err": str(e),
+                },
+            )
+        finally:
+            with self.__lock:
+                queue.running -= 1
+                self.__free_workers += 1
+                if found:
+                    queue.handled += 1
+                    queue.backoff.reset()
+                    queue.idle_until = 0.0
+                else:
+                    queue.idle_until = time.monotonic() + queue.backoff.next_delay()
+                self.__lock.notify()
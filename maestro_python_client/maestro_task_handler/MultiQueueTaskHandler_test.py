@@ -0,0 +1,190 @@
+import logging
+import threading
+import time
+
+from pytest import raises
+
+from maestro_python_client.Client import Client
+from maestro_python_client.maestro_task_handler.Backoff import Backoff
+from maestro_python_client.maestro_task_handler.MaestroTaskHandler import TaskWorker
+from maestro_python_client.maestro_task_handler.MultiQueueTaskHandler import (
+    MultiQueueTaskHandler,
+)
+from maestro_python_client.Transport.InProcessTransport import InProcessTransport
+
+logger = logging.getLogger("test")
+
+
+class RecordingWorker(TaskWorker):
+    def __init__(self, name: str, calls: list[str], delay: float = 0) -> None:
+        self.__name = name
+        self.__calls = calls
+        self.__delay = delay
+        self.__running = 0
+        self.max_running = 0
+        self.__lock = threading.Lock()
+
+    def on_task(self, task_payload: str) -> str:
+        with self.__lock:
+            self.__running += 1
+            self.max_running = max(self.max_running, self.__running)
+            self.__calls.append(self.__name)
+        time.sleep(self.__delay)
+        with self.__lock:
+            self.__running -= 1
+        return task_payload
+
+
+class RecordingTransport(InProcessTransport):
+    def __init__(self) -> None:
+        super().__init__()
+        self.polled: list[str] = []
+
+    def request(self, method, path, payload=None):
+        if path == "/api/queue/next":
+            self.polled.append((payload or {})["queue"])
+        return super().request(method, path, payload)
+
+
+def launch(client: Client, queue: str, count: int) -> None:
+    client.launch_task_list([("owner", queue, str(i)) for i in range(count)])
+
+
+def wait_until(condition, timeout: float = 5) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_multi_queue_task_handler(subtests):
+    with subtests.test("Weights"):
+        client = Client("", transport=InProcessTransport())
+        launch(client, "a", 12)
+        launch(client, "b", 12)
+        calls: list[str] = []
+
+        handler = MultiQueueTaskHandler(
+            client,
+            {"a": RecordingWorker("a", calls), "b": RecordingWorker("b", calls)},
+            logger,
+            max_workers=1,
+            weights={"a": 3},
+        )
+        handler.start()
+        wait_until(lambda: len(calls) == 24)
+        handler.stop()
+        handler.join()
+
+        assert calls[:8].count("a") == 6
+        assert calls[:4].count("b") == 1
+        assert handler.handled == {"a": 12, "b": 12}
+        assert client.get_queue_stats("a").completed
+
+    with subtests.test("Empty queues are polled less"):
+        transport = RecordingTransport()
+        client = Client("", transport=transport)
+        launch(client, "busy", 50)
+        calls = []
+
+        handler = MultiQueueTaskHandler(
+            client,
+            {
+                "busy": RecordingWorker("busy", calls),
+                "empty": RecordingWorker("empty", calls),
+            },
+            logger,
+            max_workers=1,
+            backoff=lambda: Backoff(60, 60),
+        )
+        handler.start()
+        wait_until(lambda: len(calls) == 50)
+        handler.stop()
+        handler.join()
+
+        assert transport.polled.count("empty") == 1
+
+    with subtests.test("Max concurrency"):
+        client = Client("", transport=InProcessTransport())
+        launch(client, "capped", 6)
+        launch(client, "other", 6)
+        calls = []
+        capped = RecordingWorker("capped", calls, delay=0.02)
+        other = RecordingWorker("other", calls, delay=0.02)
+
+        handler = MultiQueueTaskHandler(
+            client,
+            {"capped": capped, "other": other},
+            logger,
+            max_workers=4,
+            max_concurrency={"capped": 1},
+        )
+        handler.start()
+        wait_until(lambda: len(calls) == 12)
+        handler.stop()
+        handler.join()
+
+        assert capped.max_running == 1
+        assert other.max_running > 1
+
+    with subtests.test("Invalid configuration"):
+        with raises(ValueError):
+            MultiQueueTaskHandler(
+                client, {"a": RecordingWorker("a", [])}, logger, weights={"b": 1}
+            )
+        with raises(ValueError):
+            MultiQueueTaskHandler(
+                client, {"a": RecordingWorker("a", [])}, logger, weights={"a": 0}
+            )
+
+
+class BlockingWorker(TaskWorker):
+    def __init__(self) -> None:
+        self.started = threading.Event()
+        self.released = threading.Event()
+
+    def on_task(self, task_payload: str) -> str:
+        self.started.set()
+        self.released.wait(5)
+        return task_payload
+
+
+def start_task(worker: BlockingWorker) -> tuple[Client, str, MultiQueueTaskHandler]:
+    client = Client("", transport=InProcessTransport())
+    task_id = client.launch_task("owner", "queue", "a")
+    handler = MultiQueueTaskHandler(client, {"queue": worker}, logger)
+    handler.start()
+    assert worker.started.wait(5)
+    return client, task_id, handler
+
+
+def test_stop(subtests):
+    with subtests.test("Drain waits for the running task"):
+        worker = BlockingWorker()
+        client, task_id, handler = start_task(worker)
+        threading.Timer(0.1, worker.released.set).start()
+
+        assert handler.stop(timeout=5)
+        assert not handler.is_alive()
+        assert client.task_state(task_id).state == "completed"
+
+    with subtests.test("Running task is failed after timeout"):
+        worker = BlockingWorker()
+        client, task_id, handler = start_task(worker)
+
+        assert not handler.stop(timeout=0.1)
+        assert client.task_state(task_id).state == "failed"
+        worker.released.set()
+        handler.join(5)
+        assert not handler.is_alive()
+        assert client.task_state(task_id).state == "failed"
+
+    with subtests.test("Running task is failed at once without drain"):
+        worker = BlockingWorker()
+        client, task_id, handler = start_task(worker)
+
+        assert not handler.stop(drain=False)
+        assert client.task_state(task_id).state == "failed"
+        worker.released.set()
+        handler.join(5)
+        assert not handler.is_alive()
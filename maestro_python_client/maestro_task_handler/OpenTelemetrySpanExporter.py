@@ -0,0 +1,48 @@
+from typing import Any
+
+from maestro_python_client.maestro_task_handler.TaskTracer import SpanExporter, TaskSpan
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.trace import Status, StatusCode
+except ImportError:  # pragma: no cover
+    trace = None
+
+
+class OpenTelemetrySpanExporter(SpanExporter):
+    """Exports task spans through OpenTelemetry.
+
+    Each task becomes a "maestro.task" span with one child span per phase.
+    Requires the opentelemetry-api package; spans go wherever the configured
+    tracer provider sends them.
+    """
+
+    def __init__(self, tracer: Any = None) -> None:
+        if trace is None:
+            raise ImportError(
+                "OpenTelemetrySpanExporter requires the opentelemetry-api package"
+            )
+
+        self.__tracer = tracer or trace.get_tracer("maestro_python_client")
+
+    def export(self, span: TaskSpan) -> None:
+        root = self.__tracer.start_span(
+            "maestro.task",
+            start_time=span.start_ns,
+            attributes={
+                "maestro.task_id": span.task_id,
+                "maestro.queue": span.queue,
+                "maestro.queue_wait": span.queue_wait,
+            },
+        )
+        context = trace.set_span_in_context(root)
+
+        for phase, (start, end) in span.phases.items():
+            child = self.__tracer.start_span(
+                f"maestro.task.{phase}", context=context, start_time=start
+            )
+            child.end(end_time=end)
+
+        if not span.success:
+            root.set_status(Status(StatusCode.ERROR))
+        root.end(end_time=span.end_ns)
@@ -0,0 +1,168 @@
+import math
+import threading
+import time
+from logging import Logger
+
+from maestro_python_client.Client import Client
+from maestro_python_client.maestro_task_handler.HandlerPool import HandlerPool
+from maestro_python_client.maestro_task_handler.TaskTracer import TaskTracer
+
+
+class QueueAutoscaler:
+    """Resizes a HandlerPool to the backlog of its queue.
+
+    Every interval seconds, reads the pending and planned tasks of the queue
+    and the throughput of the pool since the last evaluation. The pool is
+    sized so that the backlog would be handled in drain_time seconds, between
+    min_size and max_size, by at most max_step handlers at a time.
+
+    The throughput of one handler is measured from the pool, or estimated from
+    the p50 duration of tasks when a tracer is given and the pool was idle.
+    Without either, the pool grows by max_step while there is a backlog.
+
+    To avoid flapping, the pool only shrinks when the wanted size is below
+    (1 - hysteresis) times its size, and a resize is only done scale_up_cooldown
+    (resp. scale_down_cooldown) seconds after the previous one.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        pool: HandlerPool,
+        logger: Logger,
+        min_size: int = 1,
+        max_size: int = 16,
+        interval: float = 30.0,
+        drain_time: float = 60.0,
+        max_step: int = 4,
+        hysteresis: float = 0.25,
+        scale_up_cooldown: float = 30.0,
+        scale_down_cooldown: float = 300.0,
+        tracer: TaskTracer | None = None,
+    ) -> None:
+        """
+        Args:
+            client: the client used to read the queue stats.
+            pool: the pool to resize.
+            logger: where resizes and errors are reported.
+            min_size: the minimum number of handlers.
+            max_size: the maximum number of handlers.
+            interval: time between two evaluations, in seconds.
+            drain_time: time in which the backlog should be handled, in
+                seconds.
+            max_step: maximum number of handlers added or removed at once.
+            hysteresis: fraction of the pool the wanted size must be below
+                for the pool to shrink.
+            scale_up_cooldown: minimum time between a resize and a growth, in
+                seconds.
+            scale_down_cooldown: minimum time between a resize and a
+                shrink, in seconds.
+            tracer: the tracer of the pool, to estimate task durations.
+        """
+        if not 0 <= min_size <= max_size or max_step <= 0:
+            raise ValueError("Sizes must satisfy 0 <= min_size <= max_size, 0 < step")
+        if drain_time <= 0 or not 0 <= hysteresis < 1:
+            raise ValueError("drain_time must be > 0, hysteresis in [0, 1)")
+
+        self.__client = client
+        self.__pool = pool
+        self.__logger = logger
+        self.__min_size = min_size
+        self.__max_size = max_size
+        self.__interval = interval
+        self.__drain_time = drain_time
+        self.__max_step = max_step
+        self.__hysteresis = hysteresis
+        self.__scale_up_cooldown = scale_up_cooldown
+        self.__scale_down_cooldown = scale_down_cooldown
+        self.__tracer = tracer
+
+        self.__last_resize = -math.inf
+        self.__last_evaluation: tuple[float, int] | None = None
+        self.__stopped = threading.Event()
+        self.__thread: threading.Thread | None = None
+
+    def start(self) -> "QueueAutoscaler":
+        self.__stopped.clear()
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.__stopped.set()
+        if self.__thread:
+            self.__thread.join()
+
+    def evaluate(self, now: float | None = None) -> int:
+        """Resizes the pool if needed.
+
+        Args:
+            now: the current time.monotonic(), for tests.
+
+        Returns:
+            The size of the pool.
+        """
+        now = time.monotonic() if now is None else now
+        size = self.__pool.size
+
+        stats = self.__client.get_queue_stats_counts(self.__pool.queue)
+        backlog = stats.pending + stats.planned
+        wanted = self.__clamp(self.__wanted(now, size, backlog), size)
+
+        if wanted > size:
+            cooldown = self.__scale_up_cooldown
+        elif wanted < size * (1 - self.__hysteresis):
+            cooldown = self.__scale_down_cooldown
+        else:
+            return size
+
+        if now - self.__last_resize < cooldown:
+            return size
+
+        self.__logger.info(
+            {
+                "infrastructure": "task_handler",
+                "queue": self.__pool.queue,
+                "msg": f"Resizing pool of queue {self.__pool.queue} "
+                f"from {size} to {wanted}, backlog is {backlog}",
+            }
+        )
+        self.__pool.resize(wanted)
+        self.__last_resize = now
+        return wanted
+
+    def __wanted(self, now: float, size: int, backlog: int) -> int:
+        handled = self.__pool.handled
+        throughput = None
+        if self.__last_evaluation:
+            last_time, last_handled = self.__last_evaluation
+            if size and handled > last_handled and now > last_time:
+                throughput = (handled - last_handled) / (now - last_time) / size
+        self.__last_evaluation = (now, handled)
+
+        if throughput is None and self.__tracer:
+            total = self.__tracer.summaries(self.__pool.queue).get("total")
+            if total and total.p50 > 0:
+                throughput = 1 / total.p50
+
+        if throughput is None:
+            return size + self.__max_step if backlog else self.__min_size
+
+        return math.ceil(backlog / (throughput * self.__drain_time))
+
+    def __clamp(self, wanted: int, size: int) -> int:
+        wanted = max(size - self.__max_step, min(size + self.__max_step, wanted))
+        return max(self.__min_size, min(self.__max_size, wanted))
+
+    def __run(self) -> None:
+        while not self.__stopped.wait(self.__interval):
+            try:
+                self.evaluate()
+            except Exception as e:
+                self.__logger.exception(
+                    {
+                        "infrastructure": "task_handler",
+                        "msg": f"Could not autoscale queue {self.__pool.queue}",
+                        "err": str(e),
+                    },
+                )
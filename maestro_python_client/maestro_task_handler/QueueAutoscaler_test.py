@@ -0,0 +1,110 @@
+import logging
+import time
+
+from pytest import raises
+
+from maestro_python_client.Client import Client
+from maestro_python_client.maestro_task_handler.HandlerPool import HandlerPool
+from maestro_python_client.maestro_task_handler.MaestroTaskHandler import TaskWorker
+from maestro_python_client.maestro_task_handler.QueueAutoscaler import (
+    QueueAutoscaler,
+)
+from maestro_python_client.maestro_task_handler.TaskTracer import TaskSpan, TaskTracer
+from maestro_python_client.Transport.InProcessTransport import InProcessTransport
+
+logger = logging.getLogger("test")
+
+
+class EchoWorker(TaskWorker):
+    def on_task(self, task_payload: str) -> str:
+        return task_payload
+
+
+def client_with_backlog(count: int) -> Client:
+    client = Client("", transport=InProcessTransport())
+    if count:
+        client.launch_task_list([("owner", "queue", "x")] * count)
+    return client
+
+
+def tracer_with_duration(seconds: float) -> TaskTracer:
+    tracer = TaskTracer()
+    tracer.record(TaskSpan("task", "queue", phases={"work": (0, int(seconds * 1e9))}))
+    return tracer
+
+
+def test_queue_autoscaler(subtests):
+    with subtests.test("Grows by steps, after cooldowns"):
+        client = client_with_backlog(100)
+        pool = HandlerPool(client, "queue", EchoWorker(), logger, size=1)
+        autoscaler = QueueAutoscaler(
+            client, pool, logger, max_size=10, max_step=4, scale_up_cooldown=30
+        )
+
+        assert autoscaler.evaluate(now=0) == 5
+        assert autoscaler.evaluate(now=10) == 5
+        assert autoscaler.evaluate(now=40) == 9
+        assert autoscaler.evaluate(now=80) == 10
+        assert pool.size == 10
+
+    with subtests.test("Sized from task durations"):
+        client = client_with_backlog(120)
+        pool = HandlerPool(client, "queue", EchoWorker(), logger, size=1)
+        autoscaler = QueueAutoscaler(
+            client, pool, logger, drain_time=60, tracer=tracer_with_duration(1)
+        )
+
+        assert autoscaler.evaluate(now=0) == 2
+
+    with subtests.test("Shrinks with hysteresis"):
+        client = client_with_backlog(180)
+        pool = HandlerPool(client, "queue", EchoWorker(), logger, size=4)
+        autoscaler = QueueAutoscaler(
+            client,
+            pool,
+            logger,
+            drain_time=60,
+            hysteresis=0.25,
+            scale_down_cooldown=300,
+            tracer=tracer_with_duration(1),
+        )
+
+        assert autoscaler.evaluate(now=0) == 4
+
+        for task_id in client.get_queue_stats("queue").pending[:101]:
+            client.delete_task(task_id)
+        assert autoscaler.evaluate(now=1) == 2
+        assert autoscaler.evaluate(now=2) == 2
+
+    with subtests.test("Shrinks to min size when idle"):
+        client = client_with_backlog(0)
+        pool = HandlerPool(client, "queue", EchoWorker(), logger, size=6)
+        autoscaler = QueueAutoscaler(client, pool, logger, min_size=1, max_step=2)
+
+        assert autoscaler.evaluate(now=0) == 4
+        assert autoscaler.evaluate(now=100) == 4
+        assert autoscaler.evaluate(now=400) == 2
+
+    with subtests.test("Invalid sizes"):
+        with raises(ValueError):
+            QueueAutoscaler(client, pool, logger, min_size=2, max_size=1)
+
+
+def test_handler_pool():
+    client = client_with_backlog(20)
+    pool = HandlerPool(client, "queue", EchoWorker(), logger, size=2).start()
+
+    deadline = time.monotonic() + 5
+    while pool.handled < 20:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    pool.resize(1)
+    client.launch_task_list([("owner", "queue", "x")] * 5)
+    while pool.handled < 25:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert pool.stop()
+    pool.join(5)
+
+    assert len(client.get_queue_stats("queue").completed) == 25
@@ -0,0 +1,45 @@
+import signal
+import threading
+from typing import Iterable
+
+from maestro_python_client.maestro_task_handler.HandlerPool import HandlerPool
+from maestro_python_client.maestro_task_handler.MaestroTaskHandler import (
+    MaestroTaskHandler,
+)
+
+
+def stop_on_signal(
+    handlers: Iterable[MaestroTaskHandler | HandlerPool],
+    timeout: float = 25.0,
+    signals: Iterable[signal.Signals] = (signal.SIGTERM,),
+) -> None:
+    """Stops handlers gracefully when the process receives one of signals.
+
+    Handlers stop fetching tasks at once, their running tasks are given
+    timeout seconds to finish, then failed so that maestro retries them
+    without waiting for their timeout. Keep timeout below the grace period of
+    the orchestrator, e.g. terminationGracePeriodSeconds on Kubernetes.
+
+    Must be called from the main thread.
+
+        handlers = [MaestroTaskHandler(client, "queue", worker, logger)]
+        for handler in handlers:
+            handler.start()
+        stop_on_signal(handlers)
+        for handler in handlers:
+            handler.join()
+    """
+    handlers = list(handlers)
+
+    def stop(signum, frame) -> None:
+        stopping = [
+            threading.Thread(target=handler.stop, kwargs={"timeout": timeout})
+            for handler in handlers
+        ]
+        for thread in stopping:
+            thread.start()
+        for thread in stopping:
+            thread.join()
+
+    for signum in signals:
+        signal.signal(signum, stop)
@@ -0,0 +1,198 @@
+import cProfile
+import heapq
+import io
+import itertools
+import pstats
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator
+
+from maestro_python_client.Client import Task
+
+
+@dataclass(frozen=True)
+class TaskProfile:
+    """Profile of one task.
+
+    trigger is "sampled" when the task was picked by the sample rate, its
+    profile is then a cProfile report. It is "slow" when the task ran past the
+    latency threshold, its profile then holds the stacks sampled from that
+    point on, in the folded format understood by flamegraph tools.
+    """
+
+    task_id: str
+    queue: str
+    payload_size: int
+    duration: float
+    trigger: str
+    profile: str
+
+
+class TaskProfiler:
+    """Profiles a fraction of the tasks, and every task running for too long.
+
+    Sampled tasks run under cProfile. Only one cProfile can be active at a
+    time, so a sampled task starting while another one is profiled is only
+    watched by the stack sampler. Tasks running past slow_threshold have
+    their stack sampled every sampling_interval seconds by a single
+    background thread, which costs nothing to tasks finishing in time.
+
+    The max_profiles slowest profiles of each queue are kept.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 0.0,
+        slow_threshold: float | None = None,
+        sampling_interval: float = 0.01,
+        max_profiles: int = 10,
+        cprofile_limit: int = 30,
+    ) -> None:
+        """
+        Args:
+            sample_rate: fraction of the tasks profiled with cProfile.
+            slow_threshold: tasks running for longer, in seconds, have their
+                stack sampled. None disables the stack sampler.
+            sampling_interval: time between two stack samples, in seconds.
+            max_profiles: number of profiles kept per queue.
+            cprofile_limit: number of functions listed in cProfile reports.
+        """
+        self.__sample_rate = sample_rate
+        self.__slow_threshold = slow_threshold
+        self.__sampling_interval = sampling_interval
+        self.__max_profiles = max_profiles
+        self.__cprofile_limit = cprofile_limit
+
+        self.__lock = threading.Lock()
+        self.__cprofile_lock = threading.Lock()
+        self.__profiles: dict[str, list[tuple[float, int, TaskProfile]]] = {}
+        self.__counter = itertools.count()
+        self.__watched: dict[int, tuple[float, dict[str, int]]] = {}
+        self.__watching = threading.Condition(self.__lock)
+        self.__sampler: threading.Thread | None = None
+
+    @contextmanager
+    def profile(self, task: Task) -> Iterator[None]:
+        """Profiles the code run in this context, on behalf of task."""
+        profiler = None
+        if random.random() < self.__sample_rate and self.__cprofile_lock.acquire(
+            blocking=False
+        ):
+            profiler = cProfile.Profile()
+
+        samples = self.__watch()
+        started_at = time.perf_counter()
+        try:
+            if profiler:
+                profiler.enable()
+            yield
+        finally:
+            if profiler:
+                profiler.disable()
+                self.__cprofile_lock.release()
+            duration = time.perf_counter() - started_at
+            self.__unwatch()
+
+            if profiler:
+                self.__keep(task, duration, "sampled", self.__format_cprofile(profiler))
+            elif samples:
+                self.__keep(task, duration, "slow", self.__format_samples(samples))
+
+    def dump(self, queue: str | None = None) -> list[TaskProfile]:
+        """Returns the kept profiles, slowest first.
+
+        Args:
+            queue: only return the profiles of this queue.
+        """
+        with self.__lock:
+            profiles = [
+                profile
+                for q, kept in self.__profiles.items()
+                if queue is None or q == queue
+                for _, _, profile in kept
+            ]
+
+        return sorted(profiles, key=lambda profile: profile.duration, reverse=True)
+
+    def __keep(self, task: Task, duration: float, trigger: str, profile: str):
+        kept = TaskProfile(
+            task.task_id,
+            task.task_queue,
+            len(task.payload),
+            duration,
+            trigger,
+            profile,
+        )
+        with self.__lock:
+            profiles = self.__profiles.setdefault(task.task_queue, [])
+            entry = (duration, next(self.__counter), kept)
+            if len(profiles) < self.__max_profiles:
+                heapq.heappush(profiles, entry)
+            else:
+                heapq.heappushpop(profiles, entry)
+
+    def __watch(self) -> dict[str, int]:
+        if self.__slow_threshold is None:
+            return {}
+
+        samples: dict[str, int] = {}
+        with self.__lock:
+            self.__watched[threading.get_ident()] = (time.perf_counter(), samples)
+            if self.__sampler is None:
+                self.__sampler = threading.Thread(target=self.__sample, daemon=True)
+                self.__sampler.start()
+            self.__watching.notify()
+
+        return samples
+
+    def __unwatch(self) -> None:
+        if self.__slow_threshold is None:
+            return
+
+        with self.__lock:
+            self.__watched.pop(threading.get_ident(), None)
+
+    def __sample(self) -> None:
+        assert self.__slow_threshold is not None
+        while True:
+            with self.__lock:
+                while not self.__watched:
+                    self.__watching.wait()
+
+                now = time.perf_counter()
+                frames = sys._current_frames()
+                for thread_id, (started_at, samples) in self.__watched.items():
+                    frame = frames.get(thread_id)
+                    if frame and now - started_at >= self.__slow_threshold:
+                        stack = self.__folded_stack(frame)
+                        samples[stack] = samples.get(stack, 0) + 1
+
+            time.sleep(self.__sampling_interval)
+
+    def __format_cprofile(self, profiler: cProfile.Profile) -> str:
+        output = io.StringIO()
+        stats = pstats.Stats(profiler, stream=output)
+        stats.sort_stats("cumulative").print_stats(self.__cprofile_limit)
+        return output.getvalue()
+
+    @staticmethod
+    def __format_samples(samples: dict[str, int]) -> str:
+        return "\n".join(
+            f"{stack} {count}"
+            for stack, count in sorted(
+                samples.items(), key=lambda sample: sample[1], reverse=True
+            )
+        )
+
+    @staticmethod
+    def __folded_stack(frame) -> str:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+            frame = frame.f_back
+        return ";".join(reversed(stack))
@@ -0,0 +1,55 @@
+import time
+
+from maestro_python_client.Client import Task
+from maestro_python_client.maestro_task_handler.TaskProfiler import TaskProfiler
+from test_utils.String import unique_str
+
+
+def new_task(queue: str = "queue") -> Task:
+    task = Task()
+    task.task_id = unique_str()
+    task.task_queue = queue
+    task.payload = "payload"
+    return task
+
+
+def slow_function(duration: float):
+    time.sleep(duration)
+
+
+def test_task_profiler(subtests):
+    with subtests.test("sampled"):
+        profiler = TaskProfiler(sample_rate=1)
+        task = new_task()
+        with profiler.profile(task):
+            slow_function(0.01)
+
+        (profile,) = profiler.dump()
+        assert profile.task_id == task.task_id
+        assert profile.payload_size == len("payload")
+        assert profile.trigger == "sampled"
+        assert "slow_function" in profile.profile
+
+    with subtests.test("slow"):
+        profiler = TaskProfiler(slow_threshold=0.01, sampling_interval=0.001)
+        with profiler.profile(new_task()):
+            slow_function(0.1)
+        with profiler.profile(new_task()):
+            pass
+
+        (profile,) = profiler.dump()
+        assert profile.trigger == "slow"
+        assert "slow_function" in profile.profile
+
+    with subtests.test("slowest are kept per queue"):
+        profiler = TaskProfiler(sample_rate=1, max_profiles=2)
+        for duration in [0.03, 0.01, 0.02]:
+            with profiler.profile(new_task()):
+                slow_function(duration)
+        with profiler.profile(new_task("other")):
+            pass
+
+        profiles = profiler.dump("queue")
+        assert len(profiles) == 2
+        assert profiles[0].duration > profiles[1].duration >= 0.02
+        assert len(profiler.dump()) == 3
@@ -0,0 +1,325 @@
+import contextvars
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import nullcontext
+from logging import Logger
+from typing import TYPE_CHECKING, Callable, TypeVar
+
+from maestro_python_client.Client import Client, Task
+from maestro_python_client.maestro_task_handler.Deadline import (
+    Deadline,
+    DeadlineExceeded,
+    deadline_scope,
+)
+from maestro_python_client.maestro_task_handler.TaskProfiler import TaskProfiler
+from maestro_python_client.maestro_task_handler.TaskTracer import TaskSpan, TaskTracer
+
+if TYPE_CHECKING:
+    from maestro_python_client.maestro_task_handler.MaestroTaskHandler import (
+        BatchTaskWorker,
+        TaskWorker,
+    )
+
+T = TypeVar("T")
+
+
+class TaskRunner:
+    """Runs a task fetched by a handler, and reports its outcome to maestro.
+
+    Shared by the task handlers: resolves the payload of the task, runs the
+    worker under the profiler, completes or fails the task and records its
+    span.
+
+    Workers get the Deadline of their task with current_deadline(). Tasks
+    left with less than min_budget seconds are failed without being run.
+    With enforce_deadline, the worker runs in its own thread and the task is
+    failed as soon as its deadline expires. Python threads cannot be killed:
+    the worker keeps running until it checks its deadline or returns, and
+    its result is dropped. At most one such leftover worker is kept per
+    runner: the next task waits for it to return, and fails without being
+    run if it does not before the deadline of that task. The profiler then
+    profiles the thread of the worker.
+
+    A handler stopping without waiting for its tasks calls abandon, failing
+    them at once so that maestro retries them without waiting their timeout.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        logger: Logger,
+        tracer: TaskTracer | None = None,
+        profiler: TaskProfiler | None = None,
+        min_budget: float | None = None,
+        enforce_deadline: bool = False,
+    ) -> None:
+        self.__client = client
+        self.__logger = logger
+        self.__tracer = tracer
+        self.__profiler = profiler
+        self.__min_budget = min_budget
+        self.__enforce_deadline = enforce_deadline
+
+        self.__lock = threading.Lock()
+        self.__running: dict[str, tuple[Task, Deadline]] = {}
+        self.__abandoned = False
+        self.__leftover: threading.Thread | None = None
+
+    def run(self, task: Task, worker: "TaskWorker", fetch_started_at: int) -> None:
+        """Runs a task fetched with Client.fetch_unresolved.
+
+        Args:
+            task: the task to run.
+            worker: the TaskWorker running the task.
+            fetch_started_at: when the fetch of the task started, as
+                time.time_ns().
+        """
+        span = self.span(task, fetch_started_at)
+        deadline = Deadline.for_task(task)
+        if self.__skip(task, span, deadline) or not self.__track([(task, deadline)]):
+            return
+
+        try:
+            with span.phase("cache"):
+                task = self.__client.resolve_task(task)
+
+            with span.phase("work"):
+                result, span.success = self.__execute_task(task, worker, deadline)
+        finally:
+            reported = self.__untrack(task)
+
+        if reported:
+            with span.phase("report"):
+                if span.success:
+                    self.__client.complete_task(task.task_id, result)
+                else:
+                    self.__client.fail_task(task.task_id)
+        else:
+            span.success = False
+
+        self.record(span)
+
+    def run_batch(
+        self, tasks: list[Task], spans: list[TaskSpan], worker: "BatchTaskWorker"
+    ) -> None:
+        """Runs tasks fetched unresolved with one call to the worker.
+
+        Each task is then completed or failed on its own, a task whose
+        payload cannot be resolved is failed without being run.
+
+        Args:
+            tasks: the tasks to run.
+            spans: the span of each task, see span.
+            worker: the BatchTaskWorker running the tasks.
+        """
+        deadlines = [Deadline.for_task(task) for task in tasks]
+        kept = [
+            (task, span, deadline)
+            for task, span, deadline in zip(tasks, spans, deadlines)
+            if not self.__skip(task, span, deadline)
+        ]
+        if not kept or not self.__track(
+            [(task, deadline) for task, _, deadline in kept]
+        ):
+            return
+        tasks = [task for task, _, _ in kept]
+        spans = [span for _, span, _ in kept]
+        deadline = min(
+            (deadline for _, _, deadline in kept),
+            key=lambda deadline: deadline.expires_at,
+        )
+
+        try:
+            cache_started_at = time.time_ns()
+            errors: dict[str, Exception] = {}
+            try:
+                resolved = self.__client.resolve_tasks(tasks, errors)
+            except Exception as e:
+                resolved, errors = [], {task.task_id: e for task in tasks}
+            cache = (cache_started_at, time.time_ns())
+            for task in tasks:
+                if task.task_id in errors:
+                    self.log_task_error(task, errors[task.task_id])
+
+            # A task whose payload cannot be resolved fails on its own, the
+            # others are still run
+            outcomes: dict[str, str | Exception] = dict(errors)
+            work_started_at = time.time_ns()
+            if resolved:
+                results = self.__execute_batch(resolved, worker, deadline)
+                outcomes.update(
+                    (task.task_id, result) for task, result in zip(resolved, results)
+                )
+            work = (work_started_at, time.time_ns())
+        finally:
+            reported = [self.__untrack(task) for task in tasks]
+
+        results = [outcomes[task.task_id] for task in tasks]
+
+        for task, span, result, report in zip(tasks, spans, results, reported):
+            span.phases["cache"] = cache
+            span.phases["work"] = work
+            span.success = report and not isinstance(result, Exception)
+            if not report:
+                self.record(span)
+                continue
+            try:
+                with span.phase("report"):
+                    if isinstance(result, Exception):
+                        self.__client.fail_task(task.task_id)
+                    else:
+                        self.__client.complete_task(task.task_id, result)
+            except Exception as e:
+                self.log_task_error(task, e)
+            self.record(span)
+
+    def abandon(self) -> list[str]:
+        """Fails the running tasks without waiting for them.
+
+        Their deadline is cancelled, and the outcome of their worker is
+        dropped. Tasks given to the runner afterwards are failed without
+        being run.
+
+        Returns:
+            The ids of the tasks failed.
+        """
+        with self.__lock:
+            self.__abandoned = True
+            running, self.__running = self.__running, {}
+
+        for _, deadline in running.values():
+            deadline.cancelled.set()
+        self.__fail([task for task, _ in running.values()])
+        return list(running)
+
+    def span(self, task: Task, fetch_started_at: int) -> TaskSpan:
+        return TaskSpan.for_task(task, fetch_started_at)
+
+    def record(self, span: TaskSpan) -> None:
+        if self.__tracer:
+            self.__tracer.record(span)
+
+    def log_task_error(self, task: Task, e: Exception) -> None:
+        self.__logger.exception(
+            {
+                "infrastructure": "task_handler",
+                "queue": task.task_queue,
+                "task_id": task.task_id,
+                "msg": f"Cannot run task {task.task_id} from queue {task.task_queue}",
+                "err": str(e),
+            },
+        )
+
+    def __track(self, tasks: list[tuple[Task, Deadline]]) -> bool:
+        with self.__lock:
+            if not self.__abandoned:
+                self.__running.update({task.task_id: (task, d) for task, d in tasks})
+                return True
+
+        self.__fail([task for task, _ in tasks])
+        return False
+
+    def __fail(self, tasks: list[Task]) -> None:
+        for task in tasks:
+            try:
+                self.__client.fail_task(task.task_id)
+            except Exception as e:
+                self.log_task_error(task, e)
+
+    def __untrack(self, task: Task) -> bool:
+        """Returns whether the outcome of the task is still to be reported."""
+        with self.__lock:
+            return self.__running.pop(task.task_id, None) is not None
+
+    def __skip(self, task: Task, span: TaskSpan, deadline: Deadline) -> bool:
+        if self.__min_budget is None or deadline.remaining() >= self.__min_budget:
+            return False
+
+        self.__logger.warning(
+            {
+                "infrastructure": "task_handler",
+                "queue": task.task_queue,
+                "task_id": task.task_id,
+                "msg": f"Skipping task {task.task_id} from queue {task.task_queue}, "
+                f"{deadline.remaining():.3f}s left to run it",
+            },
+        )
+        try:
+            with span.phase("report"):
+                self.__client.fail_task(task.task_id)
+        except Exception as e:
+            self.log_task_error(task, e)
+        self.record(span)
+        return True
+
+    def __within(self, task: Task, deadline: Deadline, call: Callable[[], T]) -> T:
+        def profiled() -> T:
+            with self.__profile(task):
+                return call()
+
+        with deadline_scope(deadline):
+            if not self.__enforce_deadline:
+                return profiled()
+
+            if self.__leftover is not None:
+                self.__leftover.join(max(0.0, deadline.remaining()))
+                if self.__leftover.is_alive():
+                    raise DeadlineExceeded(
+                        "Deadline expired while the previous worker was running"
+                    )
+                self.__leftover = None
+
+            future: Future[T] = Future()
+            context = contextvars.copy_context()
+
+            def run() -> None:
+                try:
+                    future.set_result(context.run(profiled))
+                except BaseException as e:
+                    future.set_exception(e)
+
+            thread = threading.Thread(target=run, daemon=True)
+            thread.start()
+            done = threading.Event()
+            future.add_done_callback(lambda _: done.set())
+            if not done.wait(max(0.0, deadline.remaining())):
+                deadline.cancelled.set()
+                self.__leftover = thread
+                raise DeadlineExceeded("Deadline expired while the task was running")
+            return future.result()
+
+    def __execute_task(
+        self, task: Task, worker: "TaskWorker", deadline: Deadline
+    ) -> tuple[str, bool]:
+        try:
+            result = self.__within(task, deadline, lambda: worker.on_task(task.payload))
+            return result, True
+
+        except Exception as e:
+            self.log_task_error(task, e)
+            return "", False
+
+    def __execute_batch(
+        self, tasks: list[Task], worker: "BatchTaskWorker", deadline: Deadline
+    ) -> list[str | Exception]:
+        payloads = [task.payload for task in tasks]
+        try:
+            # The profile of the batch is kept on behalf of its first task
+            results = self.__within(
+                tasks[0], deadline, lambda: worker.on_tasks(payloads)
+            )
+            if len(results) != len(tasks):
+                raise ValueError(
+                    f"{len(results)} results returned for {len(tasks)} tasks"
+                )
+        except Exception as e:
+            results = [e] * len(tasks)
+
+        for task, result in zip(tasks, results):
+            if isinstance(result, Exception):
+                self.log_task_error(task, result)
+        return results
+
+    def __profile(self, task: Task):
+        return self.__profiler.profile(task) if self.__profiler else nullcontext()
@@ -0,0 +1,114 @@
+import abc
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from maestro_python_client.Client import Task
+from maestro_python_client.Metrics.MetricsSink import MetricsSink
+from maestro_python_client.Metrics.RollingPercentiles import (
+    Percentiles,
+    RollingPercentiles,
+)
+
+
+@dataclass
+class TaskSpan:
+    """Timing breakdown of one task handled by a MaestroTaskHandler.
+
+    Phases are "next" (fetching the task), "cache" (resolving its payload),
+    "work" (TaskWorker.on_task) and "report" (complete_task or fail_task).
+    They are stored as (start, end) wall clock times in nanoseconds.
+    queue_wait is the time in seconds between the moment the task could run,
+    its creation or its not_before, and its fetch. maestro updates the task
+    when it is fetched, so updated_at cannot be used.
+    """
+
+    task_id: str
+    queue: str
+    queue_wait: float = 0.0
+    phases: dict[str, tuple[int, int]] = field(default_factory=dict)
+    success: bool = False
+
+    @classmethod
+    def for_task(cls, task: Task, fetch_started_at: int) -> "TaskSpan":
+        """Span of a task just fetched, its fetch started at fetch_started_at."""
+        runnable_at = max(task.created_at.timestamp(), task.not_before)
+        span = cls(
+            task.task_id,
+            task.task_queue,
+            queue_wait=max(0.0, time.time() - runnable_at),
+        )
+        span.phases["next"] = (fetch_started_at, time.time_ns())
+        return span
+
+    @property
+    def start_ns(self) -> int:
+        return min(start for start, _ in self.phases.values())
+
+    @property
+    def end_ns(self) -> int:
+        return max(end for _, end in self.phases.values())
+
+    def duration(self, phase: str) -> float:
+        start, end = self.phases[phase]
+        return (end - start) / 1e9
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.time_ns()
+        try:
+            yield
+        finally:
+            self.phases[name] = (start, time.time_ns())
+
+
+class SpanExporter(abc.ABC):
+    @abc.abstractmethod
+    def export(self, span: TaskSpan) -> None:
+        pass
+
+
+class TaskTracer:
+    """Collects the spans of task handlers.
+
+    Keeps rolling p50/p95/p99 of every phase per queue, reports the phase
+    durations to a MetricsSink as maestro_task_phase_seconds{queue, phase}
+    and hands each span to an optional SpanExporter. Besides the span phases,
+    "queue_wait" and "total" are summarized.
+    """
+
+    def __init__(
+        self,
+        exporter: SpanExporter | None = None,
+        metrics: MetricsSink | None = None,
+        window: int = 1000,
+    ) -> None:
+        self.__exporter = exporter
+        self.__metrics = metrics
+        self.__percentiles = RollingPercentiles(window)
+
+    def record(self, span: TaskSpan) -> None:
+        durations = {phase: span.duration(phase) for phase in span.phases}
+        durations["queue_wait"] = span.queue_wait
+        durations["total"] = (span.end_ns - span.start_ns) / 1e9
+
+        for phase, duration in durations.items():
+            self.__percentiles.observe((span.queue, phase), duration)
+            if self.__metrics:
+                self.__metrics.observe(
+                    "maestro_task_phase_seconds",
+                    duration,
+                    {"queue": span.queue, "phase": phase},
+                )
+
+        if self.__exporter:
+            self.__exporter.export(span)
+
+    def summaries(self, queue: str) -> dict[str, Percentiles]:
+        """Returns the rolling percentiles of each phase of a queue, in seconds."""
+        return {
+            phase: self.__percentiles.summary((q, phase))
+            for q, phase in self.__percentiles.keys()
+            if q == queue
+        }
@@ -0,0 +1,68 @@
+import datetime
+import time
+from unittest.mock import MagicMock
+
+from maestro_python_client.Client import Task
+from maestro_python_client.maestro_task_handler.TaskTracer import TaskSpan, TaskTracer
+from maestro_python_client.Metrics.InMemoryMetricsSink import InMemoryMetricsSink
+
+
+def span(queue: str, work_seconds: float) -> TaskSpan:
+    return TaskSpan(
+        "task",
+        queue,
+        queue_wait=2,
+        phases={
+            "next": (0, 1_000_000),
+            "work": (1_000_000, 1_000_000 + int(work_seconds * 1e9)),
+        },
+        success=True,
+    )
+
+
+def test_task_tracer(subtests):
+    with subtests.test("summaries"):
+        tracer = TaskTracer()
+        for i in range(1, 101):
+            tracer.record(span("queue", i / 100))
+        tracer.record(span("other", 5))
+
+        summaries = tracer.summaries("queue")
+
+        assert set(summaries) == {"next", "work", "queue_wait", "total"}
+        assert summaries["work"].count == 100
+        assert summaries["work"].p50 == 0.51
+        assert summaries["work"].p99 == 1
+        assert summaries["queue_wait"].p95 == 2
+        assert summaries["total"].p50 == 0.511
+
+    with subtests.test("metrics and exporter"):
+        metrics = InMemoryMetricsSink()
+        exporter = MagicMock()
+        tracer = TaskTracer(exporter, metrics)
+
+        recorded = span("queue", 1)
+        tracer.record(recorded)
+
+        exporter.export.assert_called_once_with(recorded)
+        work = metrics.histogram(
+            "maestro_task_phase_seconds", {"queue": "queue", "phase": "work"}
+        )
+        assert work and work.sum == 1
+
+
+def test_task_span_for_task(subtests):
+    task = Task()
+    task.created_at = datetime.datetime.now() - datetime.timedelta(seconds=10)
+    task.updated_at = datetime.datetime.now()
+
+    with subtests.test("Queue wait since the creation"):
+        span = TaskSpan.for_task(task, time.time_ns())
+
+        assert 9 < span.queue_wait < 11
+        assert "next" in span.phases
+
+    with subtests.test("Queue wait since not_before"):
+        task.not_before = int(time.time()) - 3
+
+        assert 2 < TaskSpan.for_task(task, time.time_ns()).queue_wait < 5
@@ -1,4 +1,33 @@
+from maestro_python_client.maestro_task_handler.AsyncMaestroTaskHandler import (
+    AsyncMaestroTaskHandler,
+    AsyncTaskWorker,
+)
+from maestro_python_client.maestro_task_handler.Backoff import Backoff
+from maestro_python_client.maestro_task_handler.Deadline import (
+    Deadline,
+    DeadlineExceeded,
+    current_deadline,
+)
+from maestro_python_client.maestro_task_handler.HandlerPool import HandlerPool
+from maestro_python_client.maestro_task_handler.MaestroResultConsumer import (
+    MaestroResultConsumer,
+)
 from maestro_python_client.maestro_task_handler.MaestroTaskHandler import (
+    BatchTaskWorker,
     MaestroTaskHandler,
     TaskWorker,
 )
+from maestro_python_client.maestro_task_handler.MultiQueueTaskHandler import (
+    MultiQueueTaskHandler,
+)
+from maestro_python_client.maestro_task_handler.QueueAutoscaler import QueueAutoscaler
+from maestro_python_client.maestro_task_handler.Shutdown import stop_on_signal
+from maestro_python_client.maestro_task_handler.TaskProfiler import (
+    TaskProfile,
+    TaskProfiler,
+)
+from maestro_python_client.maestro_task_handler.TaskTracer import (
+    SpanExporter,
+    TaskSpan,
+    TaskTracer,
+)
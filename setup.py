@@ -36,6 +36,10 @@ setup(
     # Dans notre cas on en a pas besoin, donc je le commente, mais je le
     # laisse pour que vous sachiez que ça existe car c'est très utile.
     install_requires=["requests", "redis", "click", "typing-extensions"],
+    extras_require={
+        "async": ["aiohttp"],
+        "opentelemetry": ["opentelemetry-api"],
+    },
     # Une url qui pointe vers la page officielle de votre lib
     url="https://github.com/owlint/maestro_python_client",
     # Il est d'usage de mettre quelques metadata à propos de sa lib